@@ -0,0 +1,363 @@
+import os
+import json
+import tempfile
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Approximate nearest neighbor backends for the Knowledge Vault (used by vault_vectors.VaultIndex)
+#
+# - "ivf": pure-NumPy inverted file index. Spherical k-means splits the unit
+#   vectors into ~sqrt(N) lists; a query scores the centroids, then only the
+#   rows of the `nprobe` closest lists. Training writes the rows grouped by list,
+#   so a probed list is one contiguous slice of the memory-mapped vectors; later
+#   inserts are appended (vectors, ids, list assignments and tombstones are
+#   append-only files next to the database).
+# - "hnsw": hnswlib graph index (pip install hnswlib), used when installed.
+#
+# Both take unit-normalized float32 rows and return inner-product (= cosine) scores.
+# Deleted or re-embedded rows are tombstoned (remove) and never returned; the
+# owner rebuilds the index from its source rows once needs_rebuild() says the
+# lists are outgrown or too many tombstones have piled up.
+# Changes are durable once save() has written the meta file.
+
+DEFAULT_NPROBE = 16
+RETRAIN_GROWTH = 2
+MAX_DEAD_FRACTION = 0.25
+KMEANS_ITERATIONS = 10
+KMEANS_POINTS_PER_LIST = 64
+ASSIGN_BATCH = 65_536
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 128
+
+
+def hnswlib_available() -> bool:
+    try:
+        import hnswlib  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _write_json(path: str, data: dict):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _top(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best])]
+
+
+def _empty() -> Tuple[np.ndarray, np.ndarray]:
+    return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+
+def spherical_kmeans(vectors: np.ndarray, nlist: int, iterations: int = KMEANS_ITERATIONS,
+                     seed: int = 0) -> np.ndarray:
+    """Unit-norm centroids for unit-norm rows (cosine k-means on KMEANS_POINTS_PER_LIST rows per list)."""
+    rng = np.random.default_rng(seed)
+    sample = nlist * KMEANS_POINTS_PER_LIST
+    if len(vectors) > sample:
+        vectors = vectors[np.sort(rng.choice(len(vectors), sample, replace=False))]
+    vectors = np.asarray(vectors, dtype=np.float32)
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+        members, starts = np.unique(assign[order], return_index=True)
+        sums = np.zeros_like(centroids)
+        sums[members] = np.add.reduceat(vectors[order], starts)
+        norms = np.linalg.norm(sums, axis=1)
+        empty = norms == 0
+        # Re-seed empty lists with random rows
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=True)]
+        norms[empty] = 1.0
+        centroids = (sums / norms[:, None]).astype(np.float32)
+    return centroids
+
+
+class IVFIndex:
+    """Append-only inverted file index persisted as <base>.ivf.* files."""
+
+    kind = "ivf"
+
+    def __init__(self, base: str, nprobe: int = DEFAULT_NPROBE):
+        self.base = base
+        self.nprobe = nprobe
+        self.meta_path = base + ".ivf.json"
+        self.vectors_path = base + ".ivf.f32"
+        self.ids_path = base + ".ivf.ids"
+        self.assign_path = base + ".ivf.lists"
+        self.dead_path = base + ".ivf.dead"
+        self.centroids_path = base + ".ivf.centroids.npy"
+        self.dim = 0
+        self.count = 0
+        self.dead = 0
+        self.max_id = 0
+        self.change_seq = 0
+        self.trained_count = 0
+        self.centroids = None
+        self.vectors = None
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.assign = np.zeros(0, dtype=np.int32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._bounds = np.zeros(1, dtype=np.int64)
+        self._tail_lists = []
+
+    # ========================================
+    # PERSISTENCE
+    # ========================================
+
+    def load(self) -> bool:
+        meta = _read_json(self.meta_path)
+        if not meta:
+            return False
+        try:
+            self.centroids = np.load(self.centroids_path)
+            self.dim, self.count, self.dead = meta["dim"], meta["count"], meta["dead"]
+            # The meta file is written last, so data past its counts is an interrupted update: drop it
+            for path, size in ((self.vectors_path, self.count * 4 * self.dim), (self.ids_path, self.count * 8),
+                               (self.assign_path, self.count * 4), (self.dead_path, self.dead * 8)):
+                if os.path.getsize(path) > size:
+                    os.truncate(path, size)
+            self.ids = np.fromfile(self.ids_path, dtype=np.int64, count=self.count)
+            self.assign = np.fromfile(self.assign_path, dtype=np.int32, count=self.count)
+            self._alive = np.ones(self.count, dtype=bool)
+            self._alive[np.fromfile(self.dead_path, dtype=np.int64, count=self.dead)] = False
+            self._map_vectors()
+        except (OSError, ValueError, KeyError, IndexError):
+            return False
+        self.max_id, self.trained_count = meta["max_id"], meta["trained_count"]
+        self.change_seq = meta.get("change_seq", 0)
+        self._build_lists()
+        return len(self.ids) == self.count
+
+    def save(self, change_seq: Optional[int] = None):
+        """Commit appended rows and tombstones (and the change-feed position they reflect)."""
+        if change_seq is not None:
+            self.change_seq = change_seq
+        _write_json(self.meta_path, {"dim": self.dim, "count": self.count, "dead": self.dead,
+                                     "max_id": self.max_id, "change_seq": self.change_seq,
+                                     "trained_count": self.trained_count, "nlist": len(self.centroids)})
+
+    def _map_vectors(self):
+        self.vectors = (np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self.count, self.dim))
+                        if self.count else np.zeros((0, self.dim), dtype=np.float32))
+
+    def _build_lists(self):
+        """List slices of the trained (list-sorted) rows, and row numbers of rows appended since."""
+        lists = np.arange(len(self.centroids) + 1)
+        self._bounds = np.searchsorted(self.assign[:self.trained_count], lists)
+        tail = self.assign[self.trained_count:]
+        order = np.argsort(tail, kind="stable")
+        bounds = np.searchsorted(tail[order], lists)
+        self._tail_lists = [order[bounds[i]:bounds[i + 1]] + self.trained_count
+                            for i in range(len(self.centroids))]
+
+    # ========================================
+    # BUILD / UPDATE
+    # ========================================
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.concatenate([np.argmax(vectors[i:i + ASSIGN_BATCH] @ self.centroids.T, axis=1)
+                               for i in range(0, len(vectors), ASSIGN_BATCH)]).astype(np.int32)
+
+    def build(self, ids: np.ndarray, vectors: np.ndarray, change_seq: int = 0):
+        """Train on every row and rewrite the index files, rows grouped by list."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.dim = vectors.shape[1]
+        nlist = max(1, min(int(np.sqrt(len(vectors))), len(vectors)))
+        self.centroids = spherical_kmeans(vectors, nlist)
+        order = np.argsort(self._assign(vectors), kind="stable")
+        np.save(self.centroids_path, self.centroids)
+        self.vectors = None  # release the old mapping before truncating its file
+        for path in (self.vectors_path, self.ids_path, self.assign_path, self.dead_path):
+            open(path, "wb").close()
+        self.count = self.dead = self.trained_count = self.max_id = 0
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.assign = np.zeros(0, dtype=np.int32)
+        self._alive = np.zeros(0, dtype=bool)
+        self.add(np.asarray(ids)[order], vectors[order])
+        self.trained_count = self.count
+        self._build_lists()
+        self.save(change_seq)
+
+    def add(self, ids: np.ndarray, vectors: np.ndarray):
+        """Append rows to their closest lists."""
+        if not len(ids):
+            return
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        ids = np.asarray(ids, dtype=np.int64)
+        assign = self._assign(vectors)
+        with open(self.vectors_path, "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self.ids_path, "ab") as f:
+            f.write(ids.tobytes())
+        with open(self.assign_path, "ab") as f:
+            f.write(assign.tobytes())
+        self.ids = np.concatenate([self.ids, ids])
+        self.assign = np.concatenate([self.assign, assign])
+        self._alive = np.concatenate([self._alive, np.ones(len(ids), dtype=bool)])
+        self.count = len(self.ids)
+        self.max_id = int(max(self.max_id, ids.max()))
+        self._map_vectors()
+        self._build_lists()
+
+    def remove(self, ids: np.ndarray) -> int:
+        """Tombstone every live row with one of these ids; returns how many were removed."""
+        if not len(ids) or not self.count:
+            return 0
+        positions = np.flatnonzero(np.isin(self.ids, ids) & self._alive)
+        if len(positions):
+            with open(self.dead_path, "ab") as f:
+                f.write(positions.astype(np.int64).tobytes())
+            self._alive[positions] = False
+            self.dead += len(positions)
+        return len(positions)
+
+    def needs_rebuild(self) -> bool:
+        """True once the vault doubled since training or a quarter of the rows are tombstones."""
+        return (self.count >= RETRAIN_GROWTH * max(self.trained_count, 1)
+                or self.dead > MAX_DEAD_FRACTION * self.count)
+
+    # ========================================
+    # SEARCH
+    # ========================================
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(row ids, scores) of the approximate k best live rows for a unit query, best first."""
+        if not self.count:
+            return _empty()
+        probe = _top(self.centroids @ query, self.nprobe)
+        rows = [np.arange(self._bounds[i], self._bounds[i + 1]) for i in probe]
+        scores = [self.vectors[self._bounds[i]:self._bounds[i + 1]] @ query for i in probe]
+        tail = np.sort(np.concatenate([self._tail_lists[i] for i in probe]))
+        if len(tail):
+            rows.append(tail)
+            scores.append(self.vectors[tail] @ query)
+        rows, scores = np.concatenate(rows), np.concatenate(scores)
+        if self.dead:
+            live = self._alive[rows]
+            rows, scores = rows[live], scores[live]
+        best = _top(scores, k)
+        return self.ids[rows[best]], scores[best]
+
+
+class HNSWIndex:
+    """hnswlib graph index persisted as <base>.hnsw.bin + <base>.hnsw.json."""
+
+    kind = "hnsw"
+
+    def __init__(self, base: str, ef: int = HNSW_EF_SEARCH):
+        self.base = base
+        self.ef = ef
+        self.index_path = base + ".hnsw.bin"
+        self.meta_path = base + ".hnsw.json"
+        self.index = None
+        self.dim = 0
+        self.count = 0
+        self.max_id = 0
+        self.change_seq = 0
+        self.deleted = set()
+
+    @property
+    def dead(self) -> int:
+        return len(self.deleted)
+
+    def load(self) -> bool:
+        import hnswlib
+        meta = _read_json(self.meta_path)
+        if not meta or not os.path.exists(self.index_path):
+            return False
+        self.dim, self.count, self.max_id = meta["dim"], meta["count"], meta["max_id"]
+        self.change_seq = meta.get("change_seq", 0)
+        self.deleted = set(meta.get("deleted", []))
+        self.index = hnswlib.Index(space="ip", dim=self.dim)
+        # Deletion marks are saved with the graph
+        self.index.load_index(self.index_path, max_elements=max(self.count, 1))
+        self.index.set_ef(self.ef)
+        return True
+
+    def save(self, change_seq: Optional[int] = None):
+        if change_seq is not None:
+            self.change_seq = change_seq
+        tmp_path = self.index_path + ".tmp"
+        self.index.save_index(tmp_path)
+        os.replace(tmp_path, self.index_path)
+        _write_json(self.meta_path, {"dim": self.dim, "count": self.count, "max_id": self.max_id,
+                                     "change_seq": self.change_seq, "deleted": sorted(self.deleted)})
+
+    def build(self, ids: np.ndarray, vectors: np.ndarray, change_seq: int = 0):
+        import hnswlib
+        self.dim = vectors.shape[1]
+        self.index = hnswlib.Index(space="ip", dim=self.dim)
+        self.index.init_index(max_elements=max(len(ids), 1), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+        self.index.set_ef(self.ef)
+        self.count = self.max_id = 0
+        self.deleted = set()
+        self.add(ids, vectors)
+        self.save(change_seq)
+
+    def add(self, ids: np.ndarray, vectors: np.ndarray):
+        """Insert rows; an id already in the graph (even tombstoned) has its vector replaced and is live again."""
+        if not len(ids):
+            return
+        needed = self.count + len(ids)
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, 2 * self.index.get_max_elements()))
+        self.index.add_items(np.asarray(vectors, dtype=np.float32), np.asarray(ids, dtype=np.int64))
+        self.deleted.difference_update(int(i) for i in ids)
+        self.count = self.index.get_current_count()
+        self.max_id = int(max(self.max_id, np.max(ids)))
+
+    def remove(self, ids: np.ndarray) -> int:
+        removed = 0
+        for row_id in map(int, ids):
+            if row_id in self.deleted or row_id > self.max_id:
+                continue
+            try:
+                self.index.mark_deleted(row_id)
+            except RuntimeError:  # never inserted (e.g. another embedding dimension)
+                continue
+            self.deleted.add(row_id)
+            removed += 1
+        return removed
+
+    def needs_rebuild(self) -> bool:
+        return self.dead > MAX_DEAD_FRACTION * self.count
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, self.count - self.dead)
+        if k <= 0:
+            return _empty()
+        self.index.set_ef(max(self.ef, k))
+        labels, distances = self.index.knn_query(query, k=k)
+        # "ip" distance is 1 - inner product
+        return labels[0].astype(np.int64), (1.0 - distances[0]).astype(np.float32)
+
+
+def open_ann_index(base: str, kind: str = "auto", nprobe: int = DEFAULT_NPROBE):
+    """An (unloaded) ANN index: kind "hnsw", "ivf" or "auto" (hnsw when hnswlib is installed)."""
+    if kind == "auto":
+        kind = "hnsw" if hnswlib_available() else "ivf"
+    if kind == "hnsw":
+        return HNSWIndex(base)
+    if kind == "ivf":
+        return IVFIndex(base, nprobe=nprobe)
+    raise ValueError(f"Unknown ANN backend: {kind}")
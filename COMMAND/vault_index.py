@@ -7,6 +7,8 @@ import json
 import datetime
 from typing import List, Tuple
 
+from vault_vectors import encode_embedding, ensure_vector_columns, get_vault_index
+
 # Configuration
 # Updated to point to the centralized NovaHub database
 DB_PATH = "c:/AI Fusion Labs/NovaHub-Project/database/nova_memory.db"
@@ -30,6 +32,8 @@ def init_db():
     )
     """)
     conn.commit()
+    # float32 blob + norm columns used by the vector index
+    ensure_vector_columns(conn)
     return conn
 
 def get_embedding(text: str) -> List[float]:
@@ -96,24 +100,16 @@ def index_files(conn, files_to_index):
             embedding = get_embedding(chunk)
             
             if embedding:
+                blob, norm = encode_embedding(embedding)
                 cursor.execute(
-                    "INSERT INTO KnowledgeVault (source_file, content_chunk, embedding) VALUES (?, ?, ?)",
-                    (filename, chunk, json.dumps(embedding))
+                    "INSERT INTO KnowledgeVault (source_file, content_chunk, embedding, embedding_blob, norm) VALUES (?, ?, ?, ?, ?)",
+                    (filename, chunk, json.dumps(embedding), blob, norm)
                 )
                 total_chunks += 1
         
         conn.commit()
         print(f"[SUCCESS] Indexed {filename} ({total_chunks} chunks)")
 
-def cosine_similarity(v1: List[float], v2: List[float]) -> float:
-    """Calculate cosine similarity between two vectors."""
-    dot_product = sum(a * b for a, b in zip(v1, v2))
-    magnitude1 = sum(a * a for a in v1) ** 0.5
-    magnitude2 = sum(b * b for b in v2) ** 0.5
-    if magnitude1 == 0 or magnitude2 == 0:
-        return 0.0
-    return dot_product / (magnitude1 * magnitude2)
-
 def semantic_search(conn, query: str):
     """Search the KnowledgeVault."""
     print(f"[SEARCH] Query: '{query}'")
@@ -127,25 +123,12 @@ def semantic_search(conn, query: str):
         print(f"[ERROR] Embedding Gen Failed: {e}")
         return
 
-    cursor = conn.cursor()
-    cursor.execute("SELECT source_file, content_chunk, embedding FROM KnowledgeVault")
-    rows = cursor.fetchall()
-    
-    results = []
-    for filename, chunk, emb_json in rows:
-        try:
-            emb_vec = json.loads(emb_json)
-            score = cosine_similarity(query_vec, emb_vec)
-            results.append((score, filename, chunk))
-        except:
-            continue
-    
-    # Sort by score descending
-    results.sort(key=lambda x: x[0], reverse=True)
+    # Top 3 by cosine similarity (memory-mapped vector index)
+    results = get_vault_index(DB_PATH).search(conn, query_vec, k=3)
     
     print(f"\n[RESULTS] Top Matches for '{query}':")
     print("-" * 40)
-    for score, filename, chunk in results[:3]: # Top 3
+    for score, filename, chunk in results:
         print(f"[{score:.4f}] {os.path.basename(filename)}")
         print(f"Preview: {chunk[:100]}...")
         print("-" * 40)
@@ -3,8 +3,8 @@ import ollama
 import os
 import argparse
 import sys
-import json
-import math
+
+from vault_vectors import get_vault_index
 
 # Configuration
 # Updated to point to the centralized NovaHub database
@@ -23,20 +23,10 @@ def get_embedding(text):
         print(f"[ERROR] Embedding Gen Failed: {e}")
         return []
 
-def cosine_similarity(v1, v2):
-    """Calculate cosine similarity between two vectors."""
-    dot_product = sum(a * b for a, b in zip(v1, v2))
-    magnitude1 = math.sqrt(sum(a * a for a in v1))
-    magnitude2 = math.sqrt(sum(b * b for b in v2))
-    if magnitude1 == 0 or magnitude2 == 0:
-        return 0.0
-    return dot_product / (magnitude1 * magnitude2)
-
 def query_vault(query_text):
     print(f"[QUERY] Processing: '{query_text}'")
     
     conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
     
     # 1. Embed Query
     query_vec = get_embedding(query_text)
@@ -45,31 +35,15 @@ def query_vault(query_text):
         conn.close()
         return
 
-    # 2. Fetch Vectors
-    cursor.execute("SELECT source_file, content_chunk, embedding FROM KnowledgeVault")
-    rows = cursor.fetchall()
+    # 2. Search (one matrix-vector product over the memory-mapped vector index)
+    top_results = get_vault_index(DB_PATH).search(conn, query_vec, k=3)
     
-    if not rows:
+    if not top_results:
         print("[WARN] Knowledge Vault is empty.")
         conn.close()
         return
 
-    # 3. Calculate Similarity
-    results = []
-    for filename, chunk, emb_json in rows:
-        try:
-            emb_vec = json.loads(emb_json)
-            score = cosine_similarity(query_vec, emb_vec)
-            results.append((score, filename, chunk))
-        except Exception as e:
-            # print(f"[WARN] Failed to process row: {e}")
-            continue
-    
-    # 4. Sort and Select Top 3
-    results.sort(key=lambda x: x[0], reverse=True)
-    top_results = results[:3]
-
-    # 5. Write to File
+    # 3. Write to File
     write_advice(query_text, top_results)
     
     conn.close()
@@ -0,0 +1,314 @@
+import os
+import json
+import sqlite3
+import tempfile
+from collections import Counter
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from vault_ann import open_ann_index
+
+# Vector index for the Knowledge Vault (shared by vault_index.py and vault_query.py)
+#
+# - embeddings are stored as float32 blobs with their L2 norm (embedding_blob, norm);
+#   the JSON `embedding` column is still written for other NovaHub readers
+# - the searchable matrix (unit-normalized rows, float32) lives in a sidecar
+#   .npy next to the database and is memory-mapped, not rebuilt per query
+# - triggers bump KnowledgeVaultVersion on every write to KnowledgeVault, so a
+#   query checks freshness with one indexed lookup instead of scanning the table;
+#   the sidecar is rebuilt (and JSON-only rows backfilled) when it is stale
+# - top-k is one matrix-vector product plus argpartition
+# - large vaults (ANN_MIN_ROWS+ chunks, or VAULT_ANN=ivf|hnsw) switch to an
+#   approximate index (vault_ann.py) persisted next to the database; new rows are
+#   inserted into it incrementally instead of rebuilding the matrix. Deleted and
+#   re-embedded rows reach it through the KnowledgeVaultChanges feed (filled by
+#   triggers) and are tombstoned; once too many pile up the index is rebuilt from
+#   the table
+
+SIDECAR_SUFFIX = ".vectors"
+ANN_MIN_ROWS = 50_000
+ANN_BACKENDS = ("off", "auto", "ivf", "hnsw")
+
+
+def encode_embedding(vector: Sequence[float]) -> Tuple[bytes, float]:
+    """(float32 blob, L2 norm) for an embedding."""
+    array = np.asarray(vector, dtype=np.float32)
+    return array.tobytes(), float(np.linalg.norm(array))
+
+
+def decode_embedding(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def ensure_vector_columns(conn):
+    """
+    Add embedding_blob / norm, the change-counter and change-feed triggers to
+    KnowledgeVault, and backfill blobs for rows written with a JSON embedding only.
+    """
+    cursor = conn.cursor()
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(KnowledgeVault)")}
+    if "embedding_blob" not in columns:
+        cursor.execute("ALTER TABLE KnowledgeVault ADD COLUMN embedding_blob BLOB")
+    if "norm" not in columns:
+        cursor.execute("ALTER TABLE KnowledgeVault ADD COLUMN norm REAL")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS KnowledgeVaultVersion (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO KnowledgeVaultVersion (id, version) VALUES (1, 0)")
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS KnowledgeVault_{event.lower()}_version AFTER {event} ON KnowledgeVault
+        BEGIN
+            UPDATE KnowledgeVaultVersion SET version = version + 1 WHERE id = 1;
+        END
+        """)
+    # Ids whose vectors went away or changed, for the ANN index (ids are AUTOINCREMENT, never reused)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS KnowledgeVaultChanges (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        row_id INTEGER NOT NULL
+    )
+    """)
+    for event, row in (("DELETE", "OLD"), ("UPDATE OF embedding_blob", "NEW")):
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS KnowledgeVault_{event.split()[0].lower()}_changes AFTER {event} ON KnowledgeVault
+        BEGIN
+            INSERT INTO KnowledgeVaultChanges (row_id) VALUES ({row}.id);
+        END
+        """)
+    rows = cursor.execute(
+        "SELECT id, embedding FROM KnowledgeVault WHERE embedding_blob IS NULL AND embedding IS NOT NULL"
+    ).fetchall()
+    updates = []
+    for row_id, emb_json in rows:
+        try:
+            blob, norm = encode_embedding(json.loads(emb_json))
+        except (TypeError, ValueError):
+            continue
+        updates.append((blob, norm, row_id))
+    if updates:
+        cursor.executemany("UPDATE KnowledgeVault SET embedding_blob = ?, norm = ? WHERE id = ?", updates)
+        print(f"[INDEX] Converted {len(updates)} JSON embeddings to float32 blobs")
+    conn.commit()
+
+
+def _change_seq(conn) -> int:
+    return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM KnowledgeVaultChanges").fetchone()[0]
+
+
+def _prune_changes(conn, change_seq: int):
+    conn.execute("DELETE FROM KnowledgeVaultChanges WHERE seq <= ?", (change_seq,))
+    conn.commit()
+
+
+class VaultIndex:
+    """Memory-mapped cosine-similarity index over KnowledgeVault embeddings."""
+
+    def __init__(self, db_path: str, sidecar_base: Optional[str] = None, ann: Optional[str] = None,
+                 ann_min_rows: Optional[int] = None, nprobe: Optional[int] = None):
+        """
+        ann: "off" (exact search only), "auto" (ANN from ann_min_rows chunks; hnswlib
+        if installed, else the NumPy IVF), "ivf" or "hnsw". Defaults to $VAULT_ANN or "auto".
+        """
+        self.db_path = db_path
+        base = sidecar_base or os.path.splitext(db_path)[0] + SIDECAR_SUFFIX
+        self.matrix_path = base + ".npy"
+        self.meta_path = base + ".json"
+        self.ann_base = base
+        self.ann = ann or os.environ.get("VAULT_ANN", "auto")
+        if self.ann not in ANN_BACKENDS:
+            raise ValueError(f"Unknown ANN backend: {self.ann}")
+        if ann_min_rows is None:
+            ann_min_rows = ANN_MIN_ROWS if self.ann == "auto" else 0
+        self.ann_min_rows = ann_min_rows
+        self.nprobe = nprobe or int(os.environ.get("VAULT_ANN_NPROBE", 0)) or None
+        self.ann_index = None
+        self.matrix = None
+        self.ids = None
+        self.signature = None
+        self.change_seq = 0
+
+    def _table_signature(self, conn) -> List:
+        """[write counter, newest id]: both index lookups, so checking costs the same at any size."""
+        query = "SELECT (SELECT version FROM KnowledgeVaultVersion WHERE id = 1), (SELECT MAX(id) FROM KnowledgeVault)"
+        try:
+            return list(conn.execute(query).fetchone())
+        except sqlite3.OperationalError:
+            ensure_vector_columns(conn)
+            return list(conn.execute(query).fetchone())
+
+    def _load_sidecar(self, signature) -> bool:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("signature") != signature:
+                return False
+            self.matrix = np.load(self.matrix_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return False
+        self.ids = np.asarray(meta["ids"], dtype=np.int64)
+        self.signature = signature
+        self.change_seq = meta.get("change_seq", 0)
+        return len(self.ids) == self.matrix.shape[0]
+
+    def rebuild(self, conn, signature=None):
+        """Write the normalized float32 matrix and its row ids to the sidecar files."""
+        signature = signature or self._table_signature(conn)
+        change_seq = _change_seq(conn)
+        rows = conn.execute(
+            "SELECT id, embedding_blob, norm FROM KnowledgeVault WHERE embedding_blob IS NOT NULL ORDER BY id"
+        ).fetchall()
+        # Rows from a different embedding model (other dimension) cannot be compared; keep the majority
+        dims = Counter(len(blob) // 4 for _, blob, _ in rows)
+        dim = dims.most_common(1)[0][0] if dims else 0
+        rows = [row for row in rows if len(row[1]) // 4 == dim]
+
+        matrix = np.zeros((len(rows), dim), dtype=np.float32)
+        for i, (_, blob, norm) in enumerate(rows):
+            if norm:
+                matrix[i] = decode_embedding(blob) / norm
+        ids = [row_id for row_id, _, _ in rows]
+
+        directory = os.path.dirname(os.path.abspath(self.matrix_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npy")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, matrix)
+        os.replace(tmp_path, self.matrix_path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"signature": signature, "dim": dim, "ids": ids, "change_seq": change_seq}, f)
+        os.replace(tmp_path, self.meta_path)
+
+        self.matrix = np.load(self.matrix_path, mmap_mode="r")
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.signature = signature
+        self.change_seq = change_seq
+        if not self._ann_on_disk():
+            # Nothing reads the change feed without an ANN index; the matrix already reflects it
+            _prune_changes(conn, change_seq)
+        print(f"[INDEX] Vector index rebuilt ({len(ids)} chunks, dim {dim})")
+
+    def refresh(self, conn):
+        """Make sure the in-memory matrix (or ANN index) matches the table (sidecars reused when current)."""
+        signature = self._table_signature(conn)
+        if self.signature == signature and (self.matrix is not None or self.ann_index is not None):
+            return
+        if self._refresh_ann(conn, signature):
+            return
+        if not self._load_sidecar(signature):
+            ensure_vector_columns(conn)
+            self.rebuild(conn)
+        if self.ann != "off" and len(self.ids) and len(self.ids) >= self.ann_min_rows:
+            self._build_ann(conn)
+
+    # ========================================
+    # APPROXIMATE INDEX
+    # ========================================
+
+    def _open_ann(self):
+        if self.nprobe:
+            return open_ann_index(self.ann_base, self.ann, nprobe=self.nprobe)
+        return open_ann_index(self.ann_base, self.ann)
+
+    def _ann_on_disk(self) -> bool:
+        return any(os.path.exists(self.ann_base + suffix) for suffix in (".ivf.json", ".hnsw.json"))
+
+    def _build_ann(self, conn):
+        """Train the ANN index on the exact matrix; from then on it is updated incrementally."""
+        index = self._open_ann()
+        index.build(self.ids, np.asarray(self.matrix), change_seq=self.change_seq)
+        self.ann_index = index
+        _prune_changes(conn, self.change_seq)
+        print(f"[INDEX] {index.kind.upper()} index built ({index.count} chunks)")
+
+    def _refresh_ann(self, conn, signature) -> bool:
+        """
+        Bring the ANN index up to date: tombstone deleted / re-embedded rows, insert
+        new and re-embedded ones, and rebuild it from the table once it has drifted
+        too far (see needs_rebuild). False when there is no ANN index (yet).
+        """
+        if self.ann == "off":
+            return False
+        if self.ann_index is None:
+            index = self._open_ann()
+            if not index.load():
+                return False
+            self.ann_index = index
+        ensure_vector_columns(conn)
+        index = self.ann_index
+        change_seq = _change_seq(conn)
+        changed = [row_id for row_id, in conn.execute(
+            "SELECT DISTINCT row_id FROM KnowledgeVaultChanges WHERE seq > ? AND seq <= ?",
+            (index.change_seq, change_seq)
+        )]
+        index.remove(np.asarray(changed, dtype=np.int64))
+        # New rows, plus older rows whose embedding changed (deleted ones are gone from the table)
+        rows = conn.execute(
+            "SELECT id, embedding_blob, norm FROM KnowledgeVault WHERE id > ? AND embedding_blob IS NOT NULL "
+            "UNION ALL "
+            "SELECT id, embedding_blob, norm FROM KnowledgeVault WHERE id <= ? AND embedding_blob IS NOT NULL "
+            "AND id IN (SELECT row_id FROM KnowledgeVaultChanges WHERE seq > ? AND seq <= ?) "
+            "ORDER BY id",
+            (index.max_id, index.max_id, index.change_seq, change_seq)
+        ).fetchall()
+        rows = [row for row in rows if len(row[1]) // 4 == index.dim and row[2]]
+        if rows:
+            vectors = np.stack([decode_embedding(blob) / norm for _, blob, norm in rows])
+            index.add(np.asarray([row_id for row_id, _, _ in rows], dtype=np.int64), vectors)
+        index.save(change_seq)
+        _prune_changes(conn, change_seq)
+        if index.needs_rebuild():
+            # Retrain on the live rows; drops the tombstones
+            self.rebuild(conn, signature)
+            self._build_ann(conn)
+        self.signature = signature
+        return True
+
+    # ========================================
+    # SEARCH
+    # ========================================
+
+    def top_k(self, conn, query_vec: Sequence[float], k: int = 3) -> List[Tuple[float, int]]:
+        """[(cosine score, row id)] of the k best rows, best first (approximate once an ANN index is active)."""
+        self.refresh(conn)
+        query = np.asarray(query_vec, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query))
+        if self.ann_index is not None:
+            if query_norm == 0 or query.shape[0] != self.ann_index.dim:
+                return []
+            ids, scores = self.ann_index.search(query / query_norm, k)
+            return [(float(score), int(row_id)) for row_id, score in zip(ids, scores)]
+        if not len(self.ids) or query_norm == 0 or query.shape[0] != self.matrix.shape[1]:
+            return []
+        scores = self.matrix @ (query / query_norm)
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(float(scores[i]), int(self.ids[i])) for i in best]
+
+    def search(self, conn, query_vec: Sequence[float], k: int = 3) -> List[Tuple[float, str, str]]:
+        """[(score, source_file, content_chunk)] of the k best chunks, best first."""
+        hits = self.top_k(conn, query_vec, k)
+        if not hits:
+            return []
+        placeholders = ",".join("?" for _ in hits)
+        rows = conn.execute(
+            f"SELECT id, source_file, content_chunk FROM KnowledgeVault WHERE id IN ({placeholders})",
+            [row_id for _, row_id in hits]
+        ).fetchall()
+        by_id = {row_id: (filename, chunk) for row_id, filename, chunk in rows}
+        return [(score,) + by_id[row_id] for score, row_id in hits if row_id in by_id]
+
+
+_indexes = {}
+
+
+def get_vault_index(db_path: str) -> VaultIndex:
+    """Process-wide index per database (the matrix stays mapped between queries)."""
+    if db_path not in _indexes:
+        _indexes[db_path] = VaultIndex(db_path)
+    return _indexes[db_path]
@@ -0,0 +1,55 @@
+"""
+Tests for Artifact Templates - compiled build-agent templates and hashed streaming writes
+"""
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+import factory_orchestrator
+from artifact_templates import CompiledTemplate, TemplateError, load_template, write_artifact
+
+EXAMPLE_DOSSIER = Path(__file__).parent.parent / "ingested_clients" / "example_domain" / "dossier.json"
+
+# sha256 of the artifacts the f-string generators produced for the example dossier
+GOLDEN = {
+    "system_prompt.txt": "42447bd786e3f38717221f6f77195ade68291f5007a665f68f517252b658a3e6",
+    "kb_seed.md": "5cf2a4014da5e478f6293aca64b19d5dab4e9439023b4279590e792959014e6a",
+    "tavus_pack/README.md": "2b7bd8b53b3aa6f0666e25175b31656957e02fcae78a86b304c0099a2cbcee4d",
+}
+
+
+class TestArtifactTemplates:
+
+    def test_compile_and_render(self):
+        template = CompiledTemplate("t", "Hi {{NAME}}, {{ NAME }} from {{CITY}}.\n")
+        assert template.fields == {"NAME", "CITY"}
+        assert template.render({"NAME": "Ada", "CITY": "{{NAME}}"}) == "Hi Ada, Ada from {{NAME}}.\n"
+        with pytest.raises(TemplateError, match="CITY"):
+            template.render({"NAME": "Ada"})
+
+    def test_templates_are_compiled_once(self):
+        assert load_template("kb_seed.md") is load_template("kb_seed.md")
+
+    def test_write_hashes_what_it_writes(self, tmp_path):
+        path = tmp_path / "a.md"
+        meta = write_artifact(path, ["café\n", "", "line 2\n"])
+        data = path.read_bytes()
+        assert meta == {"sha256": hashlib.sha256(data).hexdigest(), "bytes": len(data)}
+
+    def test_build_output_matches_previous_generators(self, tmp_path):
+        assert factory_orchestrator.build_agent_from_dossier(EXAMPLE_DOSSIER, enable_acip=True, agents_root=tmp_path)
+        output_dir = tmp_path / "nexgen_hvac"
+        manifest = json.loads((output_dir / "manifest.json").read_text(encoding="utf-8"))
+
+        assert {Path(a["path"]).as_posix(): a["sha256"] for a in manifest["artifacts"]} == GOLDEN
+        for artifact in manifest["artifacts"]:
+            assert (output_dir / artifact["path"]).stat().st_size == artifact["bytes"]
+        assert manifest["input_dossier_sha256"] == factory_orchestrator.compute_file_hash(EXAMPLE_DOSSIER)
+        acip = (output_dir / "system_prompt_with_acip.txt").read_text(encoding="utf-8")
+        assert acip.endswith("\n\n---\n\n" + (output_dir / "system_prompt.txt").read_text(encoding="utf-8"))
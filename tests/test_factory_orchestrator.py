@@ -0,0 +1,171 @@
+"""
+Tests for Factory Orchestrator hunt mode - concurrent lead processing and
+batched Nova ranking
+Enrichment and the Nova/Sparkle calls are replaced with slow local fakes.
+"""
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+import factory_orchestrator
+
+
+@pytest.fixture
+def hunt(tmp_path, monkeypatch):
+    """A 12-lead hunt file; fakes record how many leads were in flight at once."""
+    state = {"in_flight": 0, "peak": 0, "ranked": []}
+    lock = threading.Lock()
+
+    def slow(seconds):
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        time.sleep(seconds)
+        with lock:
+            state["in_flight"] -= 1
+
+    def rank(lead, vertical, cache=None):
+        slow(0.05)
+        state["ranked"].append(lead["title"])
+        return {"priority": "A" if lead["nova_score"] >= 8 else "C", "reason": f"score {lead['nova_score']}"}
+
+    def draft(lead, pain_point="", cache=None):
+        slow(0.02)
+        return {"subject": f"Hi {lead['title']}", "body": "b", "ps_line": ""}
+
+    monkeypatch.setattr(factory_orchestrator, "enrich_contact", lambda domain: {"best_contact": {"email": f"info@{domain}"}})
+    monkeypatch.setattr(factory_orchestrator, "rank_lead_priority", rank)
+    monkeypatch.setattr(factory_orchestrator, "generate_email_draft", draft)
+    monkeypatch.setattr(factory_orchestrator, "REPORTS_DIR", tmp_path / "reports")
+    monkeypatch.setattr(factory_orchestrator, "PROCESSED_LOG", tmp_path / ".processed")
+    monkeypatch.setattr(factory_orchestrator, "HUNT_QUEUE_DB", tmp_path / ".hunt_queue.db")
+    monkeypatch.setitem(sys.modules, "email_sender", SimpleNamespace(send_batch_report=lambda **kwargs: None))
+
+    leads = [{"title": f"Lead {i:02d}", "href": f"https://lead{i}.com", "nova_score": 9 if i % 3 == 0 else 5}
+             for i in range(12)]
+    path = tmp_path / "hvac_qualified.json"
+    path.write_text(json.dumps(leads), encoding="utf-8")
+    state["path"] = path
+    return state
+
+
+class TestHuntMode:
+
+    def test_leads_run_concurrently_and_report_keeps_input_order(self, hunt):
+        start = time.perf_counter()
+        report_path = factory_orchestrator.process_hunt_file(hunt["path"], workers=4, batch_size=1)
+        elapsed = time.perf_counter() - start
+
+        assert hunt["peak"] == 4
+        assert elapsed < 12 * 0.05
+        report = report_path.read_text(encoding="utf-8")
+        a_tier = [line for line in report.splitlines() if line.startswith("### ")]
+        assert a_tier == ["### 1. Lead 00", "### 2. Lead 03", "### 3. Lead 06", "### 4. Lead 09"]
+        assert "| A-Tier (Hot) | 4 |" in report and "| C-Tier (Cold) | 8 |" in report
+        assert "Hi Lead 03" in report
+
+    def test_single_worker_is_sequential(self, hunt):
+        factory_orchestrator.process_hunt_file(hunt["path"], workers=1, batch_size=1)
+        assert hunt["peak"] == 1
+        assert hunt["ranked"] == [f"Lead {i:02d}" for i in range(12)]
+
+    def test_default_workers_follow_ollama_limit(self, monkeypatch):
+        gateway = SimpleNamespace(concurrency={"ollama": 3})
+        monkeypatch.setattr(factory_orchestrator, "get_gateway", lambda: gateway)
+        assert factory_orchestrator.default_workers() == 6
+
+
+class TestBatchedRanking:
+
+    def test_batch_sends_persona_once_and_falls_back_for_missing(self, hunt, monkeypatch):
+        calls = []
+
+        def nova(persona, prompt, model="llama3", cache=None):
+            calls.append((persona, prompt))
+            # Lead 1 is missing, id 7 does not exist, lead 2 is duplicated and lead 3 malformed
+            return {"rankings": [{"id": 0, "priority": "A", "reason": "hot"},
+                                 {"id": "2", "priority": "C", "reason": "cold"},
+                                 {"id": 2, "priority": "A", "reason": "dupe"},
+                                 {"id": 3, "priority": "maybe"},
+                                 {"id": 7, "priority": "A"}]}
+
+        monkeypatch.setattr(factory_orchestrator, "generate_with_ollama", nova)
+        monkeypatch.setattr(factory_orchestrator, "load_specialist", lambda name: f"<{name} persona>")
+        leads = [{"title": f"Lead {i}", "nova_score": 5} for i in range(4)]
+
+        rankings = factory_orchestrator.rank_leads(leads, "HVAC")
+
+        assert len(calls) == 1
+        persona, prompt = calls[0]
+        assert persona == "<Nova persona>" and "<Nova persona>" not in prompt
+        assert all(f"Lead {i}" in prompt for i in range(4))
+        assert [r["priority"] for r in rankings] == ["A", "C", "C", "C"]
+        assert [r["reason"] for r in rankings] == ["hot", "score 5", "cold", "score 5"]
+        assert hunt["ranked"] == ["Lead 1", "Lead 3"]
+
+    def test_hunt_file_ranks_in_batches(self, hunt, monkeypatch):
+        batches = []
+
+        def rank_batch(leads, vertical, cache=None):
+            batches.append([lead["title"] for lead in leads])
+            return {i: {"priority": "B", "reason": "batched"} for i in range(len(leads))}
+
+        monkeypatch.setattr(factory_orchestrator, "rank_leads_batch", rank_batch)
+        factory_orchestrator.process_hunt_file(hunt["path"], workers=2, batch_size=5)
+
+        assert sorted(len(b) for b in batches) == [2, 5, 5]
+        assert hunt["ranked"] == []
+
+
+@pytest.fixture
+def dossiers(tmp_path):
+    """Three valid dossiers (one per client) and one that fails schema validation."""
+    example = json.loads((Path(__file__).parent.parent / "ingested_clients" / "example_domain" / "dossier.json")
+                         .read_text(encoding="utf-8"))
+    root = tmp_path / "clients"
+    for name in ("NexGen HVAC", "Desert Dental", "Sun Valley Vets"):
+        dossier = json.loads(json.dumps(example))
+        dossier["client_profile"]["name"] = name
+        folder = root / factory_orchestrator.compute_client_slug(name)
+        folder.mkdir(parents=True)
+        (folder / "dossier.json").write_text(json.dumps(dossier, indent=2), encoding="utf-8")
+    (root / "broken").mkdir()
+    (root / "broken" / "dossier.json").write_text(json.dumps({"client_profile": {"name": "Broken"}}), encoding="utf-8")
+    return root
+
+
+class TestBuildAgents:
+
+    def test_builds_in_parallel_then_skips_up_to_date_agents(self, dossiers, tmp_path):
+        agents = tmp_path / "agents"
+        summary = factory_orchestrator.build_agents(dossiers, jobs=2, agents_root=agents)
+
+        assert (summary["dossiers"], summary["built"], summary["skipped"], summary["failed"]) == (4, 3, 0, 1)
+        assert sorted(r["slug"] for r in summary["results"] if r["status"] == "built") == \
+            ["desert_dental", "nexgen_hvac", "sun_valley_vets"]
+        assert (agents / "desert_dental" / "manifest.json").exists()
+        assert json.loads((agents / "build_summary.json").read_text(encoding="utf-8"))["built"] == 3
+
+        dental = dossiers / "desert_dental" / "dossier.json"
+        dental.write_text(dental.read_text(encoding="utf-8").replace("Austin, TX", "Tucson, AZ"), encoding="utf-8")
+        summary = factory_orchestrator.build_agents(dossiers, jobs=2, agents_root=agents)
+        assert [r["slug"] for r in summary["results"] if r["status"] == "built"] == ["desert_dental"]
+        assert summary["skipped"] == 2
+
+    def test_missing_artifact_or_force_rebuilds(self, dossiers, tmp_path):
+        agents = tmp_path / "agents"
+        target = str(dossiers / "*" / "dossier.json")
+        factory_orchestrator.build_agents(target, jobs=1, agents_root=agents)
+
+        (agents / "nexgen_hvac" / "kb_seed.md").unlink()
+        assert factory_orchestrator.build_agents(target, jobs=1, agents_root=agents)["built"] == 1
+        assert factory_orchestrator.build_agents(target, jobs=1, agents_root=agents, enable_acip=True)["built"] == 3
+        assert factory_orchestrator.build_agents(target, jobs=1, agents_root=agents, force=True)["built"] == 3
@@ -0,0 +1,75 @@
+"""
+Tests for File Cache - shared scout cache
+Unit tests for sharding, atomic writes, TTL expiry, sweeping and stats.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from file_cache import FileCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FileCache(tmp_path, "x_search", ttl_hours=1)
+
+
+def age(path: Path, hours: float):
+    old = time.time() - hours * 3600
+    os.utime(path, (old, old))
+
+
+class TestFileCache:
+
+    def test_sharded_path(self, cache, tmp_path):
+        path = cache.path_for("query")
+        rel = path.relative_to(tmp_path)
+        assert len(rel.parts) == 3
+        assert rel.name.startswith("x_search_")
+        assert rel.parts[0] + rel.parts[1] == rel.name[len("x_search_"):][:4]
+
+    def test_roundtrip_compact_no_temp_left(self, cache):
+        cache.set("query", [{"a": 1}])
+        path = cache.path_for("query")
+        assert path.read_text(encoding="utf-8") == '[{"a":1}]'
+        assert list(path.parent.glob("*.tmp")) == []
+        assert cache.get("query") == [{"a": 1}]
+
+    def test_stats_hit_miss_expired(self, cache):
+        assert cache.get("missing") is None
+        cache.set("query", [])
+        assert cache.get("query") == []
+        age(cache.path_for("query"), 2)
+        assert cache.get("query") is None
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+        assert cache.stats["expired"] == 1
+        assert cache.hit_ratio() == pytest.approx(1 / 3)
+
+    def test_sweep_removes_expired_and_legacy(self, cache, tmp_path):
+        cache.set("fresh", [1])
+        cache.set("stale", [2])
+        age(cache.path_for("stale"), 2)
+        legacy = tmp_path / "x_search_legacy.json"
+        legacy.write_text("[]")
+        age(legacy, 2)
+        (tmp_path / "gbp").mkdir()
+
+        assert cache.sweep() == 2
+        assert cache.get("fresh") == [1]
+        assert not cache.path_for("stale").parent.exists()
+        assert (tmp_path / "gbp").exists()
+        assert cache.sweep_if_due() == 0
+
+    def test_hit_ratio(self, cache):
+        cache.set("k", [1])
+        cache.get("k")
+        cache.get("missing")
+        assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+        assert cache.hit_ratio() == 0.5
@@ -12,11 +12,17 @@ from unittest.mock import Mock, patch
 sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
 
 from gbp_scout import GBPScout
+from growth_db import GrowthDB
 
 
 @pytest.fixture
-def scout():
-    return GBPScout()
+def db(tmp_path):
+    return GrowthDB(tmp_path / "growth.db")
+
+
+@pytest.fixture
+def scout(db):
+    return GBPScout(db=db)
 
 
 class TestPhoneNormalization:
@@ -145,6 +151,66 @@ class TestBudgetTracking:
         has_budget, remaining = scout._check_budget()
         assert isinstance(has_budget, bool)
         assert isinstance(remaining, int)
+    
+    def test_consume_stops_at_limit(self, scout):
+        """Budget reservations never exceed the weekly limit."""
+        scout.weekly_budget = 2
+        assert scout._consume_budget()
+        assert scout._consume_budget()
+        assert not scout._consume_budget()
+        assert scout._check_budget() == (False, 0)
+        
+        scout._release_budget()
+        assert scout._check_budget() == (True, 1)
+    
+    def test_concurrent_consume_is_atomic(self, db, tmp_path):
+        """Scouts sharing one database cannot overspend the budget."""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        def reserve(_):
+            return GrowthDB(tmp_path / "growth.db").consume_budget("GBP", "2026-W01", 5)[0]
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            granted = list(pool.map(reserve, range(20)))
+        
+        assert sum(granted) == 5
+        assert db.get_budget_used("GBP", "2026-W01") == 5
+    
+    def test_empty_search_releases_budget(self, scout):
+        """Queries that return nothing do not count against the budget."""
+        scout.rate_limit = 0
+        response = Mock(status_code=429, text="")
+        with patch.object(scout.session, "get", return_value=response), \
+             patch("gbp_scout.time.sleep"), \
+             patch.object(scout, "_load_cache", return_value=None):
+            assert scout.search_google_maps("hvac phoenix") == []
+        
+        assert scout._check_budget() == (True, scout.weekly_budget)
+
+
+class TestScoutTelemetry:
+    """Tests for query log rollups."""
+    
+    def test_query_rollups(self, db):
+        db.log_scout_query("X", "q1", "success", 3, "business_pain")
+        db.log_scout_query("X", "q2", "cache_hit", 2, "business_pain")
+        db.log_scout_query("X", "q3", "rate_limited_429", 0, "business_pain")
+        db.log_scout_query("GBP", "q4", "error_Timeout", 0, "maps_search")
+        
+        x, = db.get_query_rollups(source="X")
+        assert (x["total"], x["succeeded"], x["cache_hits"], x["rate_limited"]) == (3, 2, 1, 1)
+        assert x["cache_hit_ratio"] == 0.333
+        
+        gbp, = db.get_query_rollups(source="GBP")
+        assert gbp["failed"] == 1 and gbp["success_rate"] == 0.0
+    
+    def test_cache_rollups(self, db):
+        db.log_cache_stats("gbp", {"hits": 3, "misses": 1, "expired": 0, "writes": 1, "errors": 0})
+        db.log_cache_stats("gbp", {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "errors": 0})
+        db.log_cache_stats("gbp", {"hits": 1, "misses": 0, "expired": 3, "writes": 3, "errors": 0})
+        
+        gbp, = db.get_cache_rollups()
+        assert (gbp["hits"], gbp["writes"], gbp["hit_ratio"]) == (4, 4, 0.5)
 
 
 class TestManualImport:
@@ -0,0 +1,114 @@
+"""
+Tests for Growth Config - shared config.yaml loader
+Parse-once caching, mtime reload, schema validation, and derived lookups.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+import growth_config
+from growth_config import ConfigError, DomainSuffixTrie, get_config
+
+CONFIG = """
+max_queries_per_run: 3
+persona_markers:
+  agency: ["Marketing Agency", "book a call", "marketing agency"]
+icp_lanes:
+  home_services:
+    positive_keywords: ["HVAC", "Plumbing"]
+    score_boost: 2
+filters:
+  hard_negatives: ["LLM"]
+  min_followers_no_website: 500
+domain_denylist: ["Blogspot.com", "t.co"]
+"""
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    growth_config.clear_cache()
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG, encoding="utf-8")
+    yield path
+    growth_config.clear_cache()
+
+
+def bump(path: Path, text: str):
+    """Rewrite the file with a strictly newer mtime."""
+    mtime = path.stat().st_mtime_ns
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+
+
+class TestGrowthConfig:
+
+    def test_parsed_once_while_unchanged(self, config_file, monkeypatch):
+        parses = []
+        parse = growth_config.parse_config
+        monkeypatch.setattr(growth_config, "parse_config", lambda *a: parses.append(1) or parse(*a))
+
+        config = get_config(config_file)
+
+        assert get_config(config_file) is config
+        assert parses == [1]
+        assert config.get("max_queries_per_run") == 3
+
+    def test_reloads_when_file_changes(self, config_file):
+        config = get_config(config_file)
+        bump(config_file, CONFIG.replace("max_queries_per_run: 3", "max_queries_per_run: 5"))
+
+        reloaded = get_config(config_file)
+
+        assert reloaded is not config
+        assert reloaded.get("max_queries_per_run") == 5
+
+    def test_schema_errors_raise_then_keep_last_good(self, config_file):
+        bad = CONFIG.replace("max_queries_per_run: 3", "max_queries_per_run: lots")
+        growth_config.clear_cache()
+        config_file.write_text(bad, encoding="utf-8")
+        with pytest.raises(ConfigError, match="max_queries_per_run"):
+            get_config(config_file)
+
+        bump(config_file, CONFIG)
+        good = get_config(config_file)
+        bump(config_file, bad)
+        assert get_config(config_file) is good
+
+    def test_missing_file_is_empty(self, tmp_path):
+        config = get_config(tmp_path / "absent.yaml")
+        assert config.data == {} and len(config.denylist) == 0
+
+    def test_keywords_lowercased_once(self, config_file):
+        config = get_config(config_file)
+        assert config.persona_markers["agency"] == ("marketing agency", "book a call")
+        assert config.icp_lanes["home_services"]["positive_keywords"] == ("hvac", "plumbing")
+        assert config.icp_lanes["home_services"]["score_boost"] == 2
+        assert config.filters == {"hard_negatives": ("llm",), "min_followers_no_website": 500}
+
+    def test_derived_structures_built_once_per_parse(self, config_file):
+        config = get_config(config_file)
+        builds = []
+        first = config.derive("engine", lambda c: builds.append(c) or object())
+        assert config.derive("engine", lambda c: builds.append(c) or object()) is first
+        assert builds == [config]
+
+    def test_repo_config_is_valid(self):
+        growth_config.clear_cache()
+        assert get_config().persona_markers
+
+
+class TestDomainSuffixTrie:
+
+    def test_matches_whole_labels_only(self):
+        trie = DomainSuffixTrie(["blogspot.com", "t.co", "Notion.SO."])
+        assert trie.match("shop.blogspot.com") == "blogspot.com"
+        assert trie.match("BLOGSPOT.COM") == "blogspot.com"
+        assert trie.match("notion.so") == "notion.so"
+        assert trie.match("notblogspot.com") is None
+        assert "microsoft.co" not in trie
+        assert trie.match("") is None and len(trie) == 3
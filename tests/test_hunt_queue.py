@@ -0,0 +1,127 @@
+"""
+Tests for Hunt Queue - persistent hunt-file job queue and watcher
+"""
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from hunt_queue import HuntQueue, HuntWatcher
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return HuntQueue(tmp_path / "queue.db", max_attempts=2)
+
+
+def hunt_file(directory, name, leads):
+    path = directory / f"{name}_qualified.json"
+    path.write_text(json.dumps(leads), encoding="utf-8")
+    return path
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestHuntQueue:
+
+    def test_jobs_are_keyed_by_content(self, queue, tmp_path):
+        path = hunt_file(tmp_path, "hvac", [{"title": "A"}])
+        assert queue.enqueue(path)
+        assert not queue.enqueue(path)
+
+        job_hash, job_path = queue.claim()
+        queue.complete(job_hash, "report.md")
+        renamed = path.rename(tmp_path / "hvac_copy_qualified.json")
+        assert queue.is_processed(renamed) and not queue.enqueue(renamed)
+
+        renamed.write_text(json.dumps([{"title": "B"}]), encoding="utf-8")
+        assert not queue.is_processed(renamed) and queue.enqueue(renamed)
+
+    def test_failed_job_is_retried_then_parked(self, queue, tmp_path):
+        queue.enqueue(hunt_file(tmp_path, "vet", []))
+        for _ in range(2):
+            job_hash, _ = queue.claim()
+            queue.fail(job_hash, "Ollama down")
+        assert queue.claim() is None
+        assert queue.summary()["counts"] == {"failed": 1}
+        assert queue.retry_failed() == 1 and queue.claim() is not None
+
+    def test_queue_survives_restart_and_recovers_running_jobs(self, queue, tmp_path):
+        first, second = hunt_file(tmp_path, "a", [1]), hunt_file(tmp_path, "b", [2])
+        queue.enqueue(first)
+        queue.enqueue(second)
+        queue.claim()
+
+        reopened = HuntQueue(queue.db_path)
+        assert reopened.recover() == 1
+        assert [reopened.claim()[1], reopened.claim()[1]] == [str(first), str(second)]
+
+    def test_legacy_processed_log_is_imported(self, queue, tmp_path):
+        done = hunt_file(tmp_path, "done", [1])
+        log = tmp_path / ".processed"
+        log.write_text(f"{done}\n{tmp_path / 'gone_qualified.json'}\n", encoding="utf-8")
+
+        assert queue.import_processed_log(log) == 1
+        assert queue.is_processed(done) and not log.exists()
+        assert queue.import_processed_log(log) == 0
+
+
+class TestHuntWatcher:
+
+    def test_new_files_are_processed_within_seconds(self, queue, tmp_path):
+        processed, lock = [], threading.Lock()
+
+        def handler(path):
+            with lock:
+                processed.append(Path(path).name)
+            return f"{path}.md"
+
+        hunt_file(tmp_path, "backlog", [1])
+        watcher = HuntWatcher(queue, handler, directory=tmp_path, workers=2, poll_interval=0.05,
+                              use_watchdog=False)
+        watcher.start()
+        try:
+            assert wait_for(lambda: processed == ["backlog_qualified.json"])
+
+            # A half-written file is not queued until it parses
+            partial = tmp_path / "hvac_qualified.json"
+            partial.write_text('[{"title": "A"', encoding="utf-8")
+            (tmp_path / "notes.json").write_text("[]", encoding="utf-8")
+            time.sleep(0.2)
+            assert len(processed) == 1
+
+            landed = time.monotonic()
+            partial.write_text('[{"title": "A"}]', encoding="utf-8")
+            assert wait_for(lambda: len(processed) == 2)
+            assert time.monotonic() - landed < 2
+        finally:
+            watcher.stop()
+
+        assert sorted(processed) == ["backlog_qualified.json", "hvac_qualified.json"]
+        assert queue.summary()["counts"] == {"done": 2}
+
+    def test_handler_errors_are_recorded(self, queue, tmp_path):
+        def handler(path):
+            raise RuntimeError("no leads")
+
+        hunt_file(tmp_path, "bad", [])
+        watcher = HuntWatcher(queue, handler, directory=tmp_path, poll_interval=0.05, use_watchdog=False)
+        watcher.start()
+        try:
+            assert wait_for(lambda: queue.summary()["counts"] == {"failed": 1})
+        finally:
+            watcher.stop()
+        assert queue.summary()["recent"][0]["error"] == "no leads"
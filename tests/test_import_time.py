@@ -0,0 +1,44 @@
+"""
+Tests for CLI startup cost - heavy dependencies stay out of module import
+Dashboard API routes spawn these tools per request, so module import time is
+on the request latency path. Each entry point is imported in a fresh
+interpreter and must not have loaded its heavy dependencies; they load on
+first use. (Checked by module presence rather than wall-clock time, which
+depends on the machine and its load.)
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).parent.parent / "tools"
+
+# Never needed just to import an entry point
+HEAVY = {"requests", "tiktoken", "numpy"}
+ENTRY_POINTS = {
+    # module: further modules it must not import
+    "kb_library_builder": {"trafilatura", "lxml", "dotenv"},
+    "x_scout": {"yaml"},
+    "gbp_scout": {"yaml"},
+    "prospect_enricher": {"yaml"},
+    "eval_runner": {"yaml", "ast"},
+    "llm_client": {"dotenv"},
+}
+
+
+def imported_modules(module: str) -> set:
+    """Top-level names in sys.modules after importing module in a fresh interpreter."""
+    code = f"import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=TOOLS_DIR,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr[-2000:]
+    return {name.split(".")[0] for name in json.loads(result.stdout.splitlines()[-1])}
+
+
+@pytest.mark.parametrize("module", sorted(ENTRY_POINTS))
+def test_heavy_dependencies_load_lazily(module):
+    forbidden = HEAVY | ENTRY_POINTS[module]
+    loaded = imported_modules(module) & forbidden
+    assert not loaded, f"{module} imports {sorted(loaded)} at module load"
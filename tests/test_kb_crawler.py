@@ -0,0 +1,303 @@
+"""
+Tests for KB Crawler - concurrent breadth-first crawler
+Crawls a local fixture site served by http.server.
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pytest
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from kb_crawler import MinHashLSH, SiteCrawler, TopicScorer, minhash, normalize_url
+
+SECTIONS = 10
+PAGES_PER_SECTION = 5
+LATENCY_SECONDS = 0.02
+
+
+def body(title: str, links: list) -> str:
+    paragraph = f"<p>{title} explains how our team handles service calls, scheduling and follow-up for local customers. </p>"
+    anchors = "".join(f'<a href="{href}">{href}</a>' for href in links)
+    return (f"<html><head><title>{title}</title></head><body><nav>{anchors}</nav>"
+            f"<article><h1>{title}</h1>{paragraph * 4}</article></body></html>")
+
+
+def build_site() -> dict:
+    """61 pages: home -> 10 sections -> 5 pages each, with duplicate link spellings."""
+    pages = {"": body("Home", [f"/section-{s}" for s in range(SECTIONS)] + ["/section-0/#team", "/logo.png"])}
+    for s in range(SECTIONS):
+        children = [f"/section-{s}/page-{p}" for p in range(PAGES_PER_SECTION)]
+        pages[f"/section-{s}"] = body(f"Section {s}", children + [
+            f"/section-{s}/page-0/?utm_source=nav",
+            f"/section-{s}/page-1#details",
+            "/",
+        ])
+        for p in range(PAGES_PER_SECTION):
+            pages[f"/section-{s}/page-{p}"] = body(f"Section {s} page {p}", ["/", f"/section-{s}"])
+    return pages
+
+
+def sitemap(locs: list, index: bool = False) -> str:
+    tag, item = ("sitemapindex", "sitemap") if index else ("urlset", "url")
+    entries = "".join(f"<{item}><loc>{loc}</loc></{item}>" for loc in locs)
+    return f'<?xml version="1.0"?><{tag} xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</{tag}>'
+
+
+CONTENT_TYPES = {".png": "image/png", ".txt": "text/plain", ".xml": "application/xml"}
+
+
+@pytest.fixture
+def serve():
+    """Start a local site from {path: body}; returns a dict with url and request stats."""
+    servers = []
+
+    def start(pages: dict) -> dict:
+        hits = Counter()
+        state = {"in_flight": 0, "max_in_flight": 0, "order": []}
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?")[0].split("#")[0].rstrip("/")
+                with lock:
+                    hits[path] += 1
+                    state["order"].append(path)
+                    state["in_flight"] += 1
+                    state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+                time.sleep(LATENCY_SECONDS)
+                with lock:
+                    state["in_flight"] -= 1
+
+                if path not in pages:
+                    self.send_error(404)
+                    return
+                payload = pages[path].encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPES.get(Path(path).suffix, "text/html; charset=utf-8"))
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return {"url": f"http://127.0.0.1:{server.server_port}/", "pages": pages, "hits": hits, "state": state}
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def site(serve):
+    return serve(build_site())
+
+
+class TestNormalizeUrl:
+    """Equivalent spellings of a URL collapse to one key."""
+
+    def test_fragment_tracking_and_trailing_slash(self):
+        assert normalize_url("https://Example.com:443/About/?utm_source=x&b=2&a=1#team") == \
+            "https://example.com/About?a=1&b=2"
+
+    def test_relative_and_non_http(self):
+        assert normalize_url("../faq/", "https://example.com/a/b") == "https://example.com/faq"
+        assert normalize_url("mailto:hi@example.com") is None
+
+
+class TestSiteCrawler:
+    """Breadth-first crawl of the fixture site."""
+
+    def test_crawls_every_page_once(self, site):
+        crawler = SiteCrawler(site["url"], workers=8, per_host=4, seed_paths=["pricing"])
+        pages = list(crawler.crawl())
+
+        assert len(pages) == len(site["pages"])
+        assert crawler.stats["pages_fetched"] == len(site["pages"])
+        assert max(site["hits"].values()) == 1
+        assert crawler.stats["crawl_depth"] == 2
+        assert any(url.endswith("/pricing") for url in crawler.stats["blocked_urls"])
+        assert any(url.endswith("/logo.png") for url in crawler.stats["assets"])
+
+    def test_single_parse_yields_text_and_links(self, site):
+        home = next(SiteCrawler(site["url"], seed_paths=[]).crawl())
+
+        assert home["depth"] == 0
+        assert "service calls" in home["text"]
+        assert len(home["links"]) == SECTIONS + 2
+
+    def test_breadth_first_order(self, site):
+        depths = [p["depth"] for p in SiteCrawler(site["url"], workers=1, seed_paths=[]).crawl()]
+        assert depths == sorted(depths)
+
+    def test_per_host_concurrency_cap(self, site):
+        list(SiteCrawler(site["url"], workers=8, per_host=3, seed_paths=[]).crawl())
+        assert 1 < site["state"]["max_in_flight"] <= 3
+
+    def test_closing_early_stops_fetching(self, site):
+        pages = SiteCrawler(site["url"], workers=2, seed_paths=[]).crawl()
+        for _ in range(3):
+            next(pages)
+        pages.close()
+
+        assert sum(site["hits"].values()) < len(site["pages"])
+
+
+class TestSeedingAndPriority:
+    """robots.txt, sitemaps and topic scoring."""
+
+    def test_sitemap_index_replaces_guessed_paths(self, serve):
+        site = serve({
+            "": body("Home", []),
+            "/robots.txt": "User-agent: *\nDisallow: /private\nSitemap: {root}sitemap_index.xml\n",
+            "/pricing-plans": body("Pricing plans", []),
+            "/team": body("Team", []),
+        })
+        root = site["url"]
+        site["pages"]["/robots.txt"] = site["pages"]["/robots.txt"].format(root=root)
+        site["pages"]["/sitemap_index.xml"] = sitemap([f"{root}pages.xml"], index=True)
+        site["pages"]["/pages.xml"] = sitemap([f"{root}pricing-plans", f"{root}team", f"{root}private/admin"])
+
+        crawler = SiteCrawler(root, workers=1)
+        urls = [p["url"] for p in crawler.crawl()]
+
+        assert urls == [root.rstrip("/"), f"{root}pricing-plans", f"{root}team"]
+        assert crawler.stats["sitemap_urls"] == 3
+        assert crawler.stats["robots_disallowed"] == [f"{root}private/admin"]
+        assert "/faq" not in site["hits"]  # no guessed paths when a sitemap exists
+
+    def test_crawl_delay_serializes_requests(self, serve):
+        site = serve({
+            "": body("Home", ["/a", "/b", "/c"]),
+            "/robots.txt": "User-agent: *\nCrawl-delay: 0.05\n",
+            "/a": body("A", []), "/b": body("B", []), "/c": body("C", []),
+        })
+        crawler = SiteCrawler(site["url"], workers=4, per_host=4, seed_paths=[])
+        list(crawler.crawl())
+
+        assert crawler.stats["crawl_delay"] == 0.05
+        assert site["state"]["max_in_flight"] == 1
+
+    def test_topic_pages_fetched_first(self, serve):
+        blog = [f"/blog/post-{i}" for i in range(6)]
+        topical = ["/pricing", "/pricing/enterprise", "/customer-case-studies"]
+        pages = {"": body("Home", blog + topical)}
+        for path in blog + topical:
+            pages[path] = body(path, [])
+        site = serve(pages)
+
+        scorer = TopicScorer({"pricing": ["Pricing", "Packages"], "proof": ["Case Studies", "Testimonials"]})
+        urls = [p["url"] for p in SiteCrawler(site["url"], workers=1, seed_paths=[], scorer=scorer).crawl()]
+        paths = [urlparse(u).path for u in urls]
+
+        # Once /pricing is fetched, the second pricing page drops behind the uncovered topic
+        assert paths[1:4] == ["/pricing", "/customer-case-studies", "/pricing/enterprise"]
+        assert set(paths[4:]) == set(blog)
+
+    def test_scorer_matches_stems_and_phrases(self):
+        scorer = TopicScorer({"services": ["Services"], "next_steps": ["next_steps"], "faq": ["FAQ", "Q&A"]})
+        assert scorer.topics_for("https://x.com/our-service/hvac") == {"services"}
+        assert scorer.topics_for("https://x.com/next-steps") == {"next_steps"}
+        assert scorer.topics_for("https://x.com/about") == set()
+
+
+class TestRecrawl:
+    """Pages known from a previous crawl are revalidated, not re-parsed."""
+
+    def test_unchanged_body_reuses_known_links(self, site):
+        first = {p["url"]: p for p in SiteCrawler(site["url"], seed_paths=[]).crawl()}
+        known = {url: {"content_sha256": p["content_sha256"], "links": p["links"]} for url, p in first.items()}
+
+        site["pages"]["/section-1/page-2"] = body("Rewritten page", [])
+        pages = list(SiteCrawler(site["url"], seed_paths=[], known_pages=known).crawl())
+
+        changed = [urlparse(p["url"]).path for p in pages if not p["unchanged"]]
+        assert changed == ["/section-1/page-2"]
+        assert len(pages) == len(first)
+        assert all(p["text"] is None for p in pages if p["unchanged"])
+
+    def test_not_modified_response(self, serve, monkeypatch):
+        site = serve({"": body("Home", [])})
+        known = {site["url"].rstrip("/"): {"etag": '"v1"', "content_sha256": "abc", "links": ["x"]}}
+        sent = {}
+
+        def fake_get(self, url, **kwargs):
+            sent.update(kwargs["headers"])
+            return type("Resp", (), {"status_code": 304, "url": url, "headers": {}})()
+
+        monkeypatch.setattr("requests.Session.get", fake_get)
+        home, = SiteCrawler(site["url"], seed_paths=[], known_pages=known, respect_robots=False).crawl()
+
+        assert sent["If-None-Match"] == '"v1"'
+        assert home["unchanged"] and home["links"] == ["x"] and home["content_sha256"] == "abc"
+
+
+def article(title: str, sentences: list) -> str:
+    return f"<html><head><title>{title}</title></head><body><article><h1>{title}</h1><p>{' '.join(sentences)}</p></article></body></html>"
+
+
+LISTING = [
+    "Spring tune-up checklist for residential furnaces and heat pumps.",
+    "How to read your thermostat error codes before calling a technician.",
+    "Why duct cleaning matters for allergy season in older homes.",
+    "Choosing between a tankless and a conventional water heater.",
+    "What our maintenance plan covers and how members book priority visits.",
+    "Signs your compressor is failing and what a replacement costs.",
+    "Heat pump rebates available to county residents this year.",
+    "A technician explains refrigerant leaks and why they get worse.",
+    "Zoned systems versus single thermostats for two-story houses.",
+    "Our team answers the most common questions about emergency service.",
+]
+
+
+class TestNearDuplicates:
+    """Near-identical pages are flagged instead of yielded as new evidence."""
+
+    def test_signature_estimates_jaccard(self):
+        text = " ".join(LISTING)
+        variant = minhash(text.replace("allergy season", "pollen season"))
+        unrelated = minhash("Our licensed electricians install panels, generators and EV chargers across the county, "
+                            "quote upgrades on site and pull every permit the inspection office requires.")
+
+        assert MinHashLSH.similarity(minhash(text), variant) >= 0.8
+        assert MinHashLSH.similarity(minhash(text), unrelated) < 0.2
+        assert minhash("Contact us today") is None
+
+    def test_lsh_returns_closest_match(self):
+        lsh = MinHashLSH(threshold=0.8)
+        base = list(range(64))
+        lsh.add(base[:54] + [-1] * 10, "far")
+        lsh.add(base[:60] + [-1] * 4, "near")
+
+        assert lsh.find(base) == "near"
+        assert lsh.find([-2] * 64) is None
+        assert len(lsh) == 2
+
+    def test_listing_variants_flagged(self, serve):
+        site = serve({
+            "": body("Home", ["/blog", "/blog/page-1", "/tag/hvac", "/es/blog", "/about"]),
+            "/blog": article("Blog", LISTING),
+            "/blog/page-1": article("Blog", LISTING),
+            "/tag/hvac": article("Tag: HVAC", LISTING[:-1] + ["Posted in HVAC."]),
+            "/es/blog": article("Blog (ES)", LISTING + ["Leer mas."]),
+            "/about": article("About", [s[::-1] for s in LISTING]),
+        })
+        crawler = SiteCrawler(site["url"], workers=1, seed_paths=[])
+        pages = {urlparse(p["url"]).path: p for p in crawler.crawl()}
+
+        duplicates = {path for path, p in pages.items() if p["duplicate_of"]}
+        assert duplicates == {"/blog/page-1", "/tag/hvac", "/es/blog"}
+        assert pages["/tag/hvac"]["duplicate_of"] == pages["/blog"]["url"]
+        assert crawler.stats["near_duplicates"] == 3
+        assert crawler.stats["duplicate_urls"][pages["/es/blog"]["url"]] == pages["/blog"]["url"]
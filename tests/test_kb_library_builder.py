@@ -98,3 +98,181 @@ def test_full_build(mock_env):
         assert "offerings" in services_file["tags"]
         assert services_file["provenance"] == "safe_summary"
         assert services_file["chunk_meta"]["chunk_strategy"] == "heading_semantic"
+
+def use_source_bundle(mock_env) -> tuple:
+    """Offline dossier (no crawl) plus a source bundle, so topics go through the LLM."""
+    ingest_path = Path(mock_env["ingested_dir"]) / mock_env["slug"]
+    (ingest_path / "extracted").mkdir()
+    (ingest_path / "extracted" / "source_bundle.md").write_text("Example Corp answers calls 24/7.")
+    dossier_path = ingest_path / "dossier.json"
+    dossier = json.loads(dossier_path.read_text())
+    dossier.pop("target_url")
+    dossier["client_profile"] = {"name": "Example Corp", "industry": "AI"}
+    dossier_path.write_text(json.dumps(dossier))
+    return dossier_path, dossier
+
+def test_incremental_rebuild_skips_unchanged_topics(mock_env):
+    """A second incremental build of an unchanged client makes no LLM calls."""
+    from unittest.mock import patch
+    
+    dossier_path, dossier = use_source_bundle(mock_env)
+    
+    def build():
+        builder = KBLibraryBuilder(
+            mock_env["slug"],
+            agents_dir=mock_env["agents_dir"],
+            ingested_dir=mock_env["ingested_dir"],
+            incremental=True
+        )
+        with patch.object(builder.llm, "generate", return_value="## Generated\nUnknown / Confirm on discovery call") as llm:
+            builder.run()
+        return builder, llm.call_count
+    
+    first, first_calls = build()
+    assert first_calls > 0
+    
+    second, second_calls = build()
+    assert second_calls == 0
+    assert second.build_stats["topics_reused"] == len(second.file_map)
+    assert [f["file_hash"] for f in second.generated_files] == [f["file_hash"] for f in first.generated_files]
+    
+    # Only the topic whose dossier evidence changed is regenerated
+    dossier["faq"] = "Do you work weekends?"
+    dossier_path.write_text(json.dumps(dossier))
+    third, third_calls = build()
+    assert third_calls == 1
+    assert third.build_stats["topics_reused"] == len(third.file_map) - 1
+
+def test_topics_synthesized_concurrently_in_order(mock_env):
+    """LLM topics run in parallel, retry failures, and are written in file_map order."""
+    import threading
+    import time
+    from unittest.mock import patch
+    
+    use_source_bundle(mock_env)
+    builder = KBLibraryBuilder(
+        mock_env["slug"],
+        agents_dir=mock_env["agents_dir"],
+        ingested_dir=mock_env["ingested_dir"],
+        llm_concurrency=12,
+        llm_backoff=0
+    )
+    attempts = {}
+    lock = threading.Lock()
+    
+    def slow_generate(system_prompt, user_prompt):
+        topic = user_prompt.split('Write the KB document: "')[1].split('"')[0]
+        with lock:
+            attempts[topic] = attempts.get(topic, 0) + 1
+            first_try = attempts[topic] == 1
+        time.sleep(0.2)
+        if topic == "FAQ" and first_try:
+            return "[Error generating content: 503]"
+        return f"## {topic}\nUnknown / Confirm on discovery call"
+    
+    with patch.object(builder.llm, "generate", side_effect=slow_generate):
+        start = time.perf_counter()
+        builder.run()
+        elapsed = time.perf_counter() - start
+    
+    assert elapsed < 0.2 * len(builder.file_map) / 2
+    assert attempts["FAQ"] == 2
+    assert builder.build_stats["llm_calls"] == len(builder.file_map) + 1
+    
+    core = [Path(f["path"]).stem for f in builder.generated_files]
+    assert core == list(builder.file_map)
+    faq = (Path(mock_env["agents_dir"]) / mock_env["slug"] / "kb" / "20_FAQ.md").read_text()
+    assert "## FAQ" in faq
+
+def test_failed_llm_topics_are_retried_next_build(mock_env):
+    """A topic whose LLM call failed is not marked unchanged, so the next incremental build regenerates it."""
+    from unittest.mock import patch
+    
+    use_source_bundle(mock_env)
+    
+    def build(reply):
+        builder = KBLibraryBuilder(
+            mock_env["slug"],
+            agents_dir=mock_env["agents_dir"],
+            ingested_dir=mock_env["ingested_dir"],
+            incremental=True,
+            llm_retries=0
+        )
+        with patch.object(builder.llm, "generate", return_value=reply) as llm:
+            builder.run()
+        return builder, llm.call_count
+    
+    first, first_calls = build("[Error generating content: 503]")
+    assert first_calls > 0
+    assert "## Generated" not in (first.kb_dir / "20_FAQ.md").read_text()
+    
+    second, second_calls = build("## Generated\nUnknown / Confirm on discovery call")
+    assert second_calls == first_calls
+    assert "## Generated" in (second.kb_dir / "20_FAQ.md").read_text()
+    
+    third, third_calls = build("## Generated\nUnknown / Confirm on discovery call")
+    assert third_calls == 0
+
+def test_edited_crawled_file_is_refetched(mock_env):
+    """An unchanged page whose KB file was edited is fetched again and rewritten in the same build."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from unittest.mock import patch
+    
+    page = ("<html><head><title>Services</title></head><body><article><h1>Services</h1>"
+            + "".join(f"<p>Example Corp crew {i} installs and repairs heat pumps for homes across the county.</p>"
+                      for i in range(5))
+            + "</article></body></html>").encode()
+    requests_seen = []
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append((self.path, self.headers.get("If-None-Match")))
+            if self.path.rstrip("/") != "":
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        ingest_path = Path(mock_env["ingested_dir"]) / mock_env["slug"]
+        dossier = json.loads((ingest_path / "dossier.json").read_text())
+        dossier["target_url"] = f"http://127.0.0.1:{server.server_port}/"
+        (ingest_path / "dossier.json").write_text(json.dumps(dossier))
+        
+        def build():
+            builder = KBLibraryBuilder(
+                mock_env["slug"],
+                agents_dir=mock_env["agents_dir"],
+                ingested_dir=mock_env["ingested_dir"],
+                incremental=True,
+                llm_retries=0
+            )
+            with patch.object(builder.llm, "generate", return_value="## Generated\nUnknown"):
+                builder.run()
+            return builder
+        
+        build()
+        crawled = Path(mock_env["agents_dir"]) / mock_env["slug"] / "kb" / "60_crawled_homepage.md"
+        original = crawled.read_text()
+        crawled.write_text("edited by hand")
+        
+        del requests_seen[:]
+        second = build()
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    home = [etag for path, etag in requests_seen if path.rstrip("/") == ""]
+    assert home == ['"v1"', None]
+    assert crawled.read_text() == original
+    assert second.build_stats["pages_reused"] == 0
@@ -0,0 +1,57 @@
+"""
+Tests for KB Retriever - BM25 topic evidence selection
+"""
+import sys
+from pathlib import Path
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from kb_retriever import BM25Index, format_context, tokenize
+
+
+def chunk(text: str, source: str, tokens: int = 100) -> dict:
+    return {"text": text, "token_count": tokens, "source": source, "title": source.rsplit("/", 1)[-1]}
+
+
+CHUNKS = [
+    chunk("Welcome to Acme Plumbing, family owned since 1982.", "https://acme.com/"),
+    chunk("Our pricing: drain cleaning costs $149, water heater packages start at $999.", "https://acme.com/pricing"),
+    chunk("Frequently asked questions about emergency visits and weekend hours.", "https://acme.com/faq"),
+    chunk("We integrate with ServiceTitan and QuickBooks for scheduling and invoicing.", "https://acme.com/integrations"),
+    chunk("Pricing for commercial contracts is quoted per site.", "https://acme.com/commercial", tokens=400),
+]
+
+
+class TestBM25Index:
+
+    def test_tokenize_stems_and_drops_stopwords(self):
+        assert tokenize("The Packages and Prices") == ["package", "price"]
+
+    def test_ranks_topic_chunks_first(self):
+        index = BM25Index(CHUNKS)
+        ranked = [CHUNKS[i]["source"] for _, i in index.search(["Pricing", "Costs", "Packages"])]
+        assert ranked[:2] == ["https://acme.com/pricing", "https://acme.com/commercial"]
+        assert "https://acme.com/" not in ranked
+
+    def test_select_respects_token_budget_and_top_k(self):
+        index = BM25Index(CHUNKS)
+        selected = index.select(["Pricing", "Costs"], token_budget=300)
+        assert [c["source"] for c in selected] == ["https://acme.com/pricing"]
+
+        assert len(index.select(["Pricing"], token_budget=10_000, top_k=1)) == 1
+
+    def test_no_match_falls_back_to_source_order(self):
+        index = BM25Index(CHUNKS)
+        selected = index.select(["Glossary"], token_budget=200)
+        assert [c["source"] for c in selected] == ["https://acme.com/", "https://acme.com/pricing"]
+
+    def test_context_cites_sources(self):
+        context = format_context(CHUNKS[1:2])
+        assert context.startswith("[Source: https://acme.com/pricing] pricing\n")
+        assert "$149" in context
+
+    def test_empty_index(self):
+        index = BM25Index([])
+        assert len(index) == 0
+        assert index.select(["Pricing"], token_budget=100) == []
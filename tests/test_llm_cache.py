@@ -0,0 +1,92 @@
+"""
+Tests for LLM Cache - content-addressed SQLite response cache
+"""
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from llm_cache import LLMCache, cache_key
+from llm_client import LLMClient
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.delenv("LLM_CACHE", raising=False)
+    return LLMCache(tmp_path / "llm_cache.db")
+
+
+def counter(reply="answer"):
+    calls = []
+
+    def generate():
+        calls.append(1)
+        return reply
+    return generate, calls
+
+
+class TestLLMCache:
+
+    def test_key_covers_every_input(self):
+        base = ("ollama", "llama3", "sys", "user", 0.7, "json")
+        keys = {cache_key(*base)}
+        for i, changed in enumerate(["gemini", "qwen2.5:32b", "sys2", "user2", 0.2, None]):
+            keys.add(cache_key(*base[:i], changed, *base[i + 1:]))
+        assert len(keys) == 7
+
+    def test_second_identical_call_is_free(self, cache):
+        generate, calls = counter()
+        for _ in range(3):
+            assert cache.cached("ollama", "llama3", "sys", "user", generate, temperature=0.7) == "answer"
+        assert len(calls) == 1
+        assert cache.stats["hits"] == 2 and cache.stats["misses"] == 1
+        assert cache.summary()["models"] == [{"provider": "ollama", "model": "llama3", "entries": 1,
+                                              "hits": 2, "bytes": len("answer")}]
+
+    def test_errors_are_not_stored(self, cache):
+        for reply in (None, "", "[Error generating content: HTTP 503]"):
+            generate, calls = counter(reply)
+            cache.cached("openai", "gpt-4o", "sys", "user", generate)
+            cache.cached("openai", "gpt-4o", "sys", "user", generate)
+            assert len(calls) == 2
+
+    def test_expired_entries_miss(self, tmp_path):
+        cache = LLMCache(tmp_path / "c.db", ttl_hours=0.1 / 3600)
+        cache.put("k", "v")
+        time.sleep(0.15)
+        assert cache.get("k") is None
+        assert cache.purge_expired() == 1
+
+    def test_size_cap_evicts_least_recently_used(self, tmp_path):
+        cache = LLMCache(tmp_path / "c.db", max_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        time.sleep(0.01)
+        cache.get("a")
+        cache.put("c", "3")
+        assert cache.get("b") is None and cache.get("a") == "1" and cache.get("c") == "3"
+        assert cache.stats["evicted"] == 1
+
+    def test_bypass_modes(self, cache, monkeypatch):
+        generate, calls = counter()
+        cache.cached("p", "m", "s", "u", generate)
+        assert cache.cached("p", "m", "s", "u", counter("fresh")[0], refresh=True) == "fresh"
+        assert cache.cached("p", "m", "s", "u", generate) == "fresh"
+
+        monkeypatch.setenv("LLM_CACHE", "off")
+        cache.cached("p", "m", "s", "u", generate)
+        assert len(calls) == 2 and cache.stats["bypassed"] == 2
+
+    def test_llm_client_opt_in(self, cache, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        client = LLMClient(cache=cache)
+        replies = []
+        monkeypatch.setattr(client, "_generate", lambda s, u, t, fmt=None: replies.append(u) or f"reply:{u}")
+
+        assert client.generate("sys", "a") == client.generate("sys", "a") == "reply:a"
+        client.generate("sys", "a", temperature=0.1)
+        assert replies == ["a", "a"]
@@ -0,0 +1,112 @@
+"""
+Tests for LLMClient - pooled, concurrent chat completions
+Runs against a local stub server speaking the OpenAI and Ollama chat APIs.
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from llm_client import LLMClient
+
+
+@pytest.fixture
+def stub():
+    """Local chat server; state["fail"] holds status codes to return before succeeding."""
+    state = {"fail": [], "delay": 0.0, "requests": [], "in_flight": 0, "peak": 0, "connections": set()}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections are reused
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with lock:
+                state["requests"].append((self.path, body))
+                state["connections"].add(self.client_address)
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+                status = state["fail"].pop(0) if state["fail"] else 200
+            time.sleep(state["delay"])
+            with lock:
+                state["in_flight"] -= 1
+            prompt = body["messages"][-1]["content"]
+            if self.path == "/api/chat":
+                reply = {"message": {"role": "assistant", "content": f"ollama:{prompt}"}}
+            else:
+                reply = {"choices": [{"message": {"content": f" openai:{prompt} "}}]}
+            data = json.dumps(reply if status == 200 else {"error": "busy"}).encode()
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "0")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}"
+    yield state
+    server.shutdown()
+
+
+def openai_client(stub, monkeypatch, **kw) -> LLMClient:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    return LLMClient(api_url=stub["url"] + "/v1/chat/completions", backoff=0.01, **kw)
+
+
+class TestLLMClient:
+
+    def test_openai_reuses_pooled_connection(self, stub, monkeypatch):
+        client = openai_client(stub, monkeypatch)
+        assert [client.generate("sys", f"p{i}") for i in range(3)] == ["openai:p0", "openai:p1", "openai:p2"]
+        assert len(stub["connections"]) == 1
+        assert stub["requests"][0][1]["model"] == "gpt-4o"
+
+    def test_ollama_backend(self, stub):
+        client = LLMClient(provider="ollama", api_url=stub["url"])
+        assert client.generate("sys", "hello", temperature=0.2) == "ollama:hello"
+        path, body = stub["requests"][0]
+        assert path == "/api/chat"
+        assert body["model"] == "llama3" and body["stream"] is False and body["options"] == {"temperature": 0.2}
+
+    def test_retries_429_and_5xx_then_succeeds(self, stub, monkeypatch):
+        stub["fail"] = [429, 503]
+        client = openai_client(stub, monkeypatch)
+        assert client.generate("sys", "p") == "openai:p"
+        assert client.stats == {"requests": 3, "retries": 2, "failures": 0}
+
+    def test_client_errors_are_not_retried(self, stub, monkeypatch):
+        stub["fail"] = [400]
+        client = openai_client(stub, monkeypatch)
+        assert client.generate("sys", "p").startswith("[Error generating content: HTTP 400")
+        assert len(stub["requests"]) == 1
+
+    def test_generate_many_bounded_and_ordered(self, stub, monkeypatch):
+        stub["delay"] = 0.05
+        client = openai_client(stub, monkeypatch, max_concurrency=3)
+        results = client.generate_many([("sys", f"p{i}") for i in range(9)])
+        assert results == [f"openai:p{i}" for i in range(9)]
+        assert stub["peak"] == 3
+
+    def test_agenerate_shares_limit(self, stub, monkeypatch):
+        stub["delay"] = 0.05
+        client = openai_client(stub, monkeypatch, max_concurrency=2)
+
+        async def run():
+            return await asyncio.gather(*(client.agenerate("sys", f"p{i}") for i in range(6)))
+
+        assert asyncio.run(run()) == [f"openai:p{i}" for i in range(6)]
+        assert stub["peak"] == 2
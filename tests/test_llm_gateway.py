@@ -0,0 +1,223 @@
+"""
+Tests for LLM Gateway - shared provider clients, usage logging, latency metrics,
+circuit breakers and failover
+Runs against a local stub server speaking the Ollama and Gemini APIs; its Ollama
+endpoint can be toggled between healthy, slow and failing.
+"""
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).parent.parent / "tools"
+
+# Add tools directory to path
+sys.path.insert(0, str(TOOLS_DIR))
+
+import usage_logger
+from llm_cache import LLMCache
+from llm_gateway import CircuitBreaker, LLMGateway, LatencyHistogram
+
+# Tools whose private Gemini/Ollama helpers were folded into the gateway
+ROUTED_TOOLS = ["factory_orchestrator", "lead_enricher", "prospect_scout", "client_ingest",
+                "market_scout", "persona_architect", "marketing_generator", "gemini_helper",
+                "expert_prompt_writer", "kb_generator"]
+
+
+@pytest.fixture
+def stub():
+    """Local Ollama + Gemini server; state["reply"] overrides the reply text, state["ollama"] sets its health."""
+    state = {"reply": None, "delay": 0.0, "ollama": "healthy", "requests": [], "in_flight": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with lock:
+                state["requests"].append((self.path, dict(self.headers), body))
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(state["delay"])
+            with lock:
+                state["in_flight"] -= 1
+            if self.path == "/api/chat" and state["ollama"] == "slow":
+                time.sleep(1.0)
+            if self.path == "/api/chat" and state["ollama"] == "failing":
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if self.path == "/api/chat":
+                text = state["reply"] or json.dumps({"model": body["model"]})
+                reply = {"message": {"content": text}, "prompt_eval_count": 11, "eval_count": 5}
+            else:
+                text = state["reply"] or "gemini says hi"
+                reply = {"candidates": [{"content": {"parts": [{"text": text}]}}],
+                         "usageMetadata": {"promptTokenCount": 7, "candidatesTokenCount": 3}}
+            data = json.dumps(reply).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}"
+    yield state
+    server.shutdown()
+
+
+@pytest.fixture
+def gateway(stub, tmp_path, monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "g-key")
+    monkeypatch.delenv("LLM_CACHE", raising=False)
+    monkeypatch.setattr(usage_logger, "USAGE_DIR", tmp_path / "usage")
+    return LLMGateway(concurrency={"ollama": 2}, failover={},
+                      api_urls={"ollama": stub["url"], "gemini": stub["url"] + "/v1beta/models"})
+
+
+@pytest.fixture
+def failover_gateway(stub, tmp_path, monkeypatch):
+    """Ollama -> Gemini chain; Ollama gets no retries and a short timeout."""
+    monkeypatch.setenv("GOOGLE_API_KEY", "g-key")
+    monkeypatch.delenv("LLM_CACHE", raising=False)
+    monkeypatch.setattr(usage_logger, "USAGE_DIR", tmp_path / "usage")
+    return LLMGateway(timeouts={"ollama": 0.2}, retries={"ollama": 0}, failover={"ollama": ("gemini",)},
+                      breaker_threshold=3, breaker_cooldown=1.0,
+                      api_urls={"ollama": stub["url"], "gemini": stub["url"] + "/v1beta/models"})
+
+
+def ollama_calls(stub):
+    return sum(1 for path, _, _ in stub["requests"] if path == "/api/chat")
+
+
+class TestLLMGateway:
+
+    def test_gemini_call_is_logged_for_dashboard(self, gateway, stub, tmp_path):
+        assert gateway.generate("gemini", "You are Troy.", "Design it.") == "gemini says hi"
+
+        path, headers, body = stub["requests"][0]
+        assert path == "/v1beta/models/gemini-2.0-flash-exp:generateContent"
+        assert headers["x-goog-api-key"] == "g-key"
+        assert body["contents"][0]["parts"][0]["text"] == "You are Troy.\n\nDesign it."
+        log = json.loads((tmp_path / "usage" / "gemini_log.json").read_text())
+        assert [(e["input_tokens"], e["output_tokens"], e["success"]) for e in log] == [(7, 3, True)]
+
+    def test_ollama_json_mode(self, gateway, stub):
+        assert gateway.generate_json("ollama", "", "rank", model="qwen2.5:32b") == {"model": "qwen2.5:32b"}
+        _, _, body = stub["requests"][0]
+        assert body["format"] == "json" and body["messages"] == [{"role": "user", "content": "rank"}]
+
+    def test_invalid_json_is_none_and_not_cached(self, gateway, stub, tmp_path):
+        cache = LLMCache(tmp_path / "c.db")
+        stub["reply"] = "Sure! Here is the JSON you asked for"
+        assert gateway.generate_json("ollama", "p", "q", cache=cache) is None
+        stub["reply"] = '{"priority": "A"}'
+        assert gateway.generate_json("ollama", "p", "q", cache=cache) == {"priority": "A"}
+        assert gateway.generate_json("ollama", "p", "q", cache=cache) == {"priority": "A"}
+        assert len(stub["requests"]) == 2 and cache.stats["hits"] == 1
+
+    def test_models_share_provider_session_and_limit(self, gateway, stub):
+        stub["delay"] = 0.05
+        small, large = gateway.client("ollama", "llama3"), gateway.client("ollama", "qwen2.5:32b")
+        assert small.session is large.session and gateway.client("ollama", "llama3") is small
+
+        threads = [threading.Thread(target=gateway.generate_json, args=("ollama", "", f"q{i}"),
+                                    kwargs={"model": ["llama3", "qwen2.5:32b"][i % 2]}) for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert stub["peak"] == 2
+
+    def test_report_has_usage_and_latency_per_model(self, gateway):
+        gateway.generate_json("ollama", "", "a")
+        gateway.generate_json("ollama", "", "b")
+        report = gateway.report()["ollama/llama3"]
+        assert (report["calls"], report["errors"], report["input_tokens"], report["output_tokens"]) == (2, 0, 22, 10)
+        assert report["latency"]["count"] == 2 and report["latency"]["p50_s"] is not None
+
+    def test_histogram_quantiles(self):
+        histogram = LatencyHistogram((0.1, 1, 10))
+        for seconds in (0.05, 0.05, 0.5, 5, 50):
+            histogram.observe(seconds)
+        assert histogram.quantile(0.4) == 0.1
+        assert histogram.quantile(0.6) == 1
+        assert histogram.quantile(1.0) is None
+        assert histogram.snapshot()["buckets"] == {"<=0.1s": 2, "<=1s": 1, "<=10s": 1, ">10s": 1}
+
+
+class TestFailover:
+
+    def test_failing_backend_opens_circuit_and_fails_over(self, failover_gateway, stub):
+        stub["ollama"] = "failing"
+        stub["reply"] = '{"priority": "A"}'
+        for _ in range(10):
+            assert failover_gateway.generate_json("ollama", "", "rank") == {"priority": "A"}
+        assert ollama_calls(stub) == 3
+        circuit = failover_gateway.circuits()["ollama"]
+        assert circuit["state"] == "open" and circuit["rejected"] == 7
+
+    def test_slow_backend_costs_milliseconds_once_open(self, failover_gateway, stub):
+        stub["ollama"] = "slow"
+        for _ in range(3):
+            failover_gateway.generate_json("ollama", "", "rank")
+        start = time.perf_counter()
+        for _ in range(20):
+            failover_gateway.generate_json("ollama", "", "rank", failover=())
+        assert time.perf_counter() - start < 0.15
+        assert failover_gateway.circuits()["ollama"]["state"] == "open"
+
+    def test_half_open_probe_closes_circuit_on_recovery(self, failover_gateway, stub):
+        stub["ollama"] = "failing"
+        for _ in range(3):
+            failover_gateway.generate_json("ollama", "", "rank", failover=())
+        stub["ollama"] = "healthy"
+        assert failover_gateway.generate_json("ollama", "", "rank", failover=()) is None
+        time.sleep(1.05)
+        assert failover_gateway.generate_json("ollama", "", "rank") == {"model": "llama3"}
+        assert failover_gateway.circuits()["ollama"]["state"] == "closed"
+
+    def test_exhausted_chain_returns_none_for_caller_fallback(self, failover_gateway, stub, monkeypatch):
+        monkeypatch.delenv("GOOGLE_API_KEY")
+        failover_gateway.client("gemini").api_key = None
+        stub["ollama"] = "failing"
+        assert failover_gateway.generate_json("ollama", "", "rank") is None
+        # A missing key never reaches the provider, so it does not count against its circuit
+        assert "gemini" not in failover_gateway.circuits()
+
+    def test_breaker_lets_one_probe_through(self):
+        now = [0.0]
+        breaker = CircuitBreaker("ollama", threshold=2, cooldown=10, clock=lambda: now[0])
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert not breaker.allow()
+
+        now[0] = 10
+        assert breaker.allow() and not breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open" and not breaker.allow()
+
+        now[0] = 20
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed" and breaker.allow()
+
+
+@pytest.mark.parametrize("tool", ROUTED_TOOLS)
+def test_tool_has_no_private_llm_transport(tool):
+    source = (TOOLS_DIR / f"{tool}.py").read_text(encoding="utf-8")
+    assert not re.search(r"localhost:11434|generativelanguage\.googleapis\.com", source)
+    assert not re.search(r"^def generate_with_(ollama|gemini)", source, re.M)
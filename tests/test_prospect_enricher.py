@@ -89,6 +89,12 @@ class TestDenylistExpansion:
         """Real business domains should NOT be in denylist."""
         assert enricher.is_denylist_domain("johnsplumbing.com") is False
         assert enricher.is_denylist_domain("acmehvac.com") is False
+    
+    def test_partial_label_not_denylist(self, enricher):
+        """Suffix matching is per label: pal.com and quick.co are not cal.com / t.co."""
+        assert enricher.is_denylist_domain("pal.com") is False
+        assert enricher.is_denylist_domain("quick.co") is False
+        assert enricher.is_denylist_domain("www.Calendly.com/team") is True
 
 
 class TestDomainCanonicalization:
@@ -0,0 +1,99 @@
+"""
+Tests for Tokenizer - shared token counting and offset-based chunking
+Uses a small byte-level BPE encoding so no encoding files are downloaded.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+import tiktoken
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from tokenizer import Tokenizer, get_tokenizer
+
+PAT_STR = r"""'s|'t|'re|'ve|'m|'ll|'d| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+"""
+WORDS = [" the", " heat", " pump", " service", " café", "Our"]
+
+
+def small_encoding() -> tiktoken.Encoding:
+    """Byte tokens plus prefix merges for a few words (multi-byte chars stay split)."""
+    ranks = {bytes([b]): b for b in range(256)}
+    for word in WORDS:
+        data = word.encode()
+        for end in range(2, len(data) + 1):
+            ranks.setdefault(data[:end], len(ranks))
+    return tiktoken.Encoding("test_bpe", pat_str=PAT_STR, mergeable_ranks=ranks,
+                             special_tokens={"<|endoftext|>": len(ranks)})
+
+
+TEXT = "Our café services the heat pump — déjà vu for every heat pump owner. " * 20
+
+
+@pytest.fixture
+def tok():
+    return Tokenizer(small_encoding())
+
+
+class TestTokenizer:
+
+    def test_windows_match_decoded_tokens(self, tok):
+        tokens = tok.encode(TEXT)
+        expected = [(tok.enc.decode(tokens[s:e]), e - s) for s, e in tok.windows(len(tokens), 37, 5)]
+
+        assert tok.split(TEXT, 37, 5) == expected
+        assert any("�" in text for text, _ in expected)  # some windows cut a multi-byte char
+
+    def test_windows_cover_text_without_redundant_tail(self):
+        assert Tokenizer.windows(10, 4, 1) == [(0, 4), (3, 7), (6, 10)]
+        assert Tokenizer.windows(3, 4, 1) == [(0, 3)]
+        # Overlap larger than the window still advances
+        assert Tokenizer.windows(5, 2, 80) == [(0, 2), (1, 3), (2, 4), (3, 5)]
+
+    def test_counted_text_is_not_reencoded(self, tok, monkeypatch):
+        count = tok.count(TEXT)
+        assert tok.count(TEXT) == count
+        encodes = []
+        encode = tok.enc.encode_ordinary
+        monkeypatch.setattr(tok.enc, "encode_ordinary", lambda text, **kw: encodes.append(text) or encode(text, **kw))
+
+        windows = tok.split(TEXT, 37, 5)
+
+        assert encodes == []
+        assert windows[-1][1] <= 37 and sum(n for _, n in windows) > count
+        assert tok.stats == {"count_hits": 2, "count_misses": 1, "encodes_reused": 1}
+
+    def test_special_token_text_is_plain_text(self, tok):
+        text = "Prompts end with <|endoftext|> in our docs."
+        assert tok.count(text) == len(tok.enc.encode(text, disallowed_special=()))
+
+    def test_lone_surrogates_fall_back_to_decoding(self, tok):
+        text = "Our heat pump \ud800 service " * 10
+        tokens = tok.encode(text)
+        assert tok.split(text, 16, 4) == [(tok.enc.decode(tokens[s:e]), e - s)
+                                          for s, e in tok.windows(len(tokens), 16, 4)]
+
+    def test_split_batch_encodes_only_unknown_or_long_docs(self, tok, monkeypatch):
+        short = "Our heat pump service."
+        tok.count(short)
+        batches = []
+        encode_batch = tok.enc.encode_ordinary_batch
+        monkeypatch.setattr(tok.enc, "encode_ordinary_batch", lambda texts, **kw: batches.append(texts) or encode_batch(texts, **kw))
+
+        result = tok.split_batch([short, TEXT, "déjà vu"], max_tokens=40, overlap=8)
+
+        assert batches == [[TEXT, "déjà vu"]]
+        assert result[0] == [(short, tok.count(short))]
+        assert result[1] == tok.split(TEXT, 40, 8)
+        assert result[2] == [("déjà vu", len(tok.encode("déjà vu")))]
+
+    def test_get_tokenizer_loads_encoding_once(self, monkeypatch):
+        loads = []
+        monkeypatch.setattr(tiktoken, "get_encoding", lambda name: loads.append(name) or small_encoding())
+        get_tokenizer.cache_clear()
+        try:
+            assert get_tokenizer() is get_tokenizer()
+            assert loads == ["cl100k_base"]
+        finally:
+            get_tokenizer.cache_clear()
@@ -0,0 +1,245 @@
+"""
+Tests for the Knowledge Vault ANN backends (COMMAND/vault_ann.py) and their use by VaultIndex
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add COMMAND directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "COMMAND"))
+
+from vault_ann import HNSWIndex, IVFIndex
+from vault_vectors import VaultIndex, encode_embedding, ensure_vector_columns
+
+
+def clustered(n, dim=32, topics=40, seed=3):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dim))
+    vectors = centers[rng.integers(0, topics, n)] + 0.5 * rng.normal(size=(n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def exact(vectors, query, k):
+    return set(np.argsort(-(vectors @ query))[:k])
+
+
+def recall(index, vectors, queries, k=10):
+    found = sum(len(exact(vectors, q, k) & set(index.search(q, k)[0])) for q in queries)
+    return found / (k * len(queries))
+
+
+def vault(db_path, vectors):
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+    CREATE TABLE KnowledgeVault (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_file TEXT,
+        content_chunk TEXT,
+        embedding TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    ensure_vector_columns(conn)
+    insert(conn, vectors)
+    return conn
+
+
+def insert(conn, vectors, start=0):
+    rows = []
+    for i, vector in enumerate(vectors, start):
+        blob, norm = encode_embedding(vector)
+        rows.append((f"doc{i}.md", f"chunk {i}", blob, norm))
+    conn.executemany("INSERT INTO KnowledgeVault (source_file, content_chunk, embedding_blob, norm) "
+                     "VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+
+
+class TestIVFIndex:
+
+    def test_recall_against_exact_search(self, tmp_path):
+        vectors = clustered(4000)
+        index = IVFIndex(str(tmp_path / "v"))
+        index.build(np.arange(len(vectors)), vectors)
+        assert recall(index, vectors, vectors[:50]) >= 0.9
+
+        index.nprobe = len(index.centroids)
+        assert recall(index, vectors, vectors[:50]) == 1.0
+
+    def test_persisted_next_to_the_database(self, tmp_path):
+        vectors = clustered(1000)
+        index = IVFIndex(str(tmp_path / "v"))
+        index.build(np.arange(len(vectors)) + 100, vectors)
+
+        reloaded = IVFIndex(str(tmp_path / "v"))
+        assert reloaded.load() and reloaded.count == 1000 and reloaded.max_id == 1099
+        for query in vectors[:5]:
+            assert list(reloaded.search(query, 5)[0]) == list(index.search(query, 5)[0])
+
+    def test_incremental_inserts_are_appended(self, tmp_path):
+        vectors = clustered(2000)
+        index = IVFIndex(str(tmp_path / "v"))
+        index.build(np.arange(1000), vectors[:1000])
+        index.add(np.arange(1000, 1500), vectors[1000:1500])
+        index.save()
+
+        assert (index.count, index.trained_count) == (1500, 1000)
+        ids, scores = index.search(vectors[1234], 1)
+        assert ids[0] == 1234 and scores[0] == pytest.approx(1.0)
+
+        # Bytes of an append that never reached the meta file are ignored on load
+        with open(index.ids_path, "ab") as f:
+            f.write(np.arange(3, dtype=np.int64).tobytes())
+        reloaded = IVFIndex(str(tmp_path / "v"))
+        assert reloaded.load() and reloaded.count == 1500
+        assert reloaded.search(vectors[1234], 1)[0][0] == 1234
+        reloaded.add(np.array([1500]), vectors[1500:1501])
+        reloaded.save()
+        again = IVFIndex(str(tmp_path / "v"))
+        assert again.load() and again.count == 1501 and again.search(vectors[1500], 1)[0][0] == 1500
+
+        # Doubling the trained size asks for a retrain
+        assert not reloaded.needs_rebuild()
+        reloaded.add(np.arange(1501, 2000), vectors[1501:])
+        assert reloaded.needs_rebuild()
+        assert recall(reloaded, vectors, vectors[:50]) >= 0.9
+
+    def test_removed_rows_are_never_returned(self, tmp_path):
+        vectors = clustered(1000)
+        index = IVFIndex(str(tmp_path / "v"))
+        index.build(np.arange(1000), vectors)
+        assert index.remove(np.array([7, 8, 5000])) == 2
+        # Re-adding an id (a re-embedded row) makes only the new copy live
+        index.add(np.array([8]), vectors[9:10])
+        index.save()
+
+        reloaded = IVFIndex(str(tmp_path / "v"))
+        assert reloaded.load() and reloaded.dead == 2
+        index.nprobe = reloaded.nprobe = len(index.centroids)
+        for search in (index.search, reloaded.search):
+            assert 7 not in search(vectors[7], 10)[0]
+            ids, scores = search(vectors[8], 1000)
+            assert len(ids) == 999 and list(ids).count(8) == 1
+            assert scores[list(ids).index(8)] == pytest.approx(float(vectors[9] @ vectors[8]))
+        assert not reloaded.needs_rebuild()
+        reloaded.remove(np.arange(300))
+        assert reloaded.needs_rebuild()
+
+
+class TestVaultIndexANN:
+
+    def test_search_and_incremental_refresh(self, tmp_path):
+        vectors = clustered(600)
+        conn = vault(tmp_path / "vault.db", vectors[:500])
+        index = VaultIndex(str(tmp_path / "vault.db"), ann="ivf")
+
+        results = index.search(conn, vectors[42], k=3)
+        assert results[0][2] == "chunk 42" and len(results) == 3
+        assert index.ann_index.count == 500
+
+        insert(conn, vectors[500:], start=500)
+        assert index.search(conn, vectors[550], k=3)[0][2] == "chunk 550"
+        assert (index.ann_index.count, index.ann_index.trained_count) == (600, 500)
+
+        # Deleted rows are tombstoned in the ANN index
+        conn.execute("DELETE FROM KnowledgeVault WHERE content_chunk = 'chunk 550'")
+        conn.commit()
+        results = index.search(conn, vectors[550], k=3)
+        assert len(results) == 3 and "chunk 550" not in [chunk for _, _, chunk in results]
+        assert index.ann_index.dead == 1
+
+        # A new process reuses the persisted index instead of rebuilding the matrix
+        reopened = VaultIndex(str(tmp_path / "vault.db"), ann="ivf")
+        assert reopened.search(conn, vectors[42], k=1)[0][2] == "chunk 42"
+        assert reopened.matrix is None and (reopened.ann_index.count, reopened.ann_index.dead) == (600, 1)
+
+    def test_reindexing_the_same_file_keeps_k_results(self, tmp_path):
+        vectors = clustered(300)
+        conn = vault(tmp_path / "vault.db", vectors[:200])
+        index = VaultIndex(str(tmp_path / "vault.db"), ann="ivf")
+        assert len(index.search(conn, vectors[0], k=3)) == 3
+
+        # vault_index.py replaces a file's chunks by deleting and re-inserting them
+        for run in range(8):
+            conn.execute("DELETE FROM KnowledgeVault WHERE source_file LIKE 'doc1_.md'")
+            insert(conn, vectors[10:20], start=10)
+            results = index.search(conn, vectors[15], k=3)
+            assert len(results) == 3 and results[0][2] == "chunk 15"
+            assert len({chunk for _, _, chunk in results}) == 3
+
+        # Tombstones piled up past the limit: the index was rebuilt from the table
+        ann = index.ann_index
+        assert ann.dead <= 0.25 * ann.count and ann.count < 200 + 8 * 10
+        live = conn.execute("SELECT COUNT(*) FROM KnowledgeVault").fetchone()[0]
+        assert ann.count - ann.dead == live
+        assert conn.execute("SELECT COUNT(*) FROM KnowledgeVaultChanges").fetchone()[0] == 0
+
+    def test_updated_embeddings_are_picked_up(self, tmp_path):
+        vectors = clustered(200)
+        conn = vault(tmp_path / "vault.db", vectors[:100])
+        index = VaultIndex(str(tmp_path / "vault.db"), ann="ivf")
+        assert index.search(conn, vectors[150], k=1)[0][2] != "chunk 5"
+
+        blob, norm = encode_embedding(vectors[150])
+        conn.execute("UPDATE KnowledgeVault SET embedding_blob = ?, norm = ? WHERE content_chunk = 'chunk 5'",
+                     (blob, norm))
+        conn.commit()
+        results = index.search(conn, vectors[150], k=3)
+        assert results[0][2] == "chunk 5" and results[0][0] == pytest.approx(1.0)
+        assert [chunk for _, _, chunk in results].count("chunk 5") == 1
+        assert index.search(conn, vectors[5], k=1)[0][2] != "chunk 5"
+
+    def test_rebuild_drops_deleted_rows(self, tmp_path):
+        vectors = clustered(400)
+        conn = vault(tmp_path / "vault.db", vectors[:200])
+        index = VaultIndex(str(tmp_path / "vault.db"), ann="ivf")
+        index.search(conn, vectors[0], k=3)
+
+        conn.execute("DELETE FROM KnowledgeVault WHERE id <= 20")
+        insert(conn, vectors[200:], start=200)
+        assert index.search(conn, vectors[300], k=1)[0][2] == "chunk 300"
+        # Doubling since training retrains on the live rows only
+        ann = index.ann_index
+        assert ann.trained_count == ann.count == 380 and ann.dead == 0
+        assert not set(range(1, 21)) & set(ann.ids)
+
+    def test_auto_switches_to_ann_for_large_vaults(self, tmp_path):
+        vectors = clustered(300)
+        conn = vault(tmp_path / "vault.db", vectors[:100])
+        index = VaultIndex(str(tmp_path / "vault.db"), ann="auto", ann_min_rows=200)
+
+        index.search(conn, vectors[0], k=3)
+        assert index.ann_index is None
+
+        insert(conn, vectors[100:], start=100)
+        assert index.search(conn, vectors[250], k=1)[0][2] == "chunk 250"
+        assert index.ann_index is not None and index.ann_index.count == 300
+
+    def test_off_keeps_exact_search(self, tmp_path):
+        conn = vault(tmp_path / "vault.db", clustered(50))
+        index = VaultIndex(str(tmp_path / "vault.db"), ann="off", ann_min_rows=0)
+        index.search(conn, clustered(1)[0], k=3)
+        assert index.ann_index is None
+        with pytest.raises(ValueError):
+            VaultIndex(str(tmp_path / "vault.db"), ann="annoy")
+
+
+class TestHNSWIndex:
+
+    def test_recall_persistence_and_inserts(self, tmp_path):
+        pytest.importorskip("hnswlib")
+        vectors = clustered(2000)
+        index = HNSWIndex(str(tmp_path / "v"))
+        index.build(np.arange(1000), vectors[:1000])
+        index.add(np.arange(1000, 2000), vectors[1000:])
+        assert recall(index, vectors, vectors[:50]) >= 0.9
+        assert index.remove(np.array([1500, 1501, 5000])) == 2
+        index.add(np.array([1501]), vectors[1501:1502])
+        index.save()
+
+        reloaded = HNSWIndex(str(tmp_path / "v"))
+        assert reloaded.load() and (reloaded.count, reloaded.dead) == (2000, 1)
+        assert 1500 not in reloaded.search(vectors[1500], 10)[0]
+        assert reloaded.search(vectors[1501], 1)[0][0] == 1501
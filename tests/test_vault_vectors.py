@@ -0,0 +1,105 @@
+"""
+Tests for the Knowledge Vault vector index (COMMAND/vault_vectors.py)
+"""
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add COMMAND directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "COMMAND"))
+
+from vault_vectors import VaultIndex, encode_embedding, ensure_vector_columns
+
+
+def legacy_vault(db_path, vectors):
+    """A KnowledgeVault table as vault_index.py used to write it (JSON embeddings only)."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+    CREATE TABLE KnowledgeVault (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_file TEXT,
+        content_chunk TEXT,
+        embedding TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    conn.executemany("INSERT INTO KnowledgeVault (source_file, content_chunk, embedding) VALUES (?, ?, ?)",
+                     [(f"doc{i}.md", f"chunk {i}", json.dumps(list(map(float, v)))) for i, v in enumerate(vectors)])
+    conn.commit()
+    return conn
+
+
+def brute_force(vectors, query, k):
+    """The cosine similarity loop vault_query.py used to run."""
+    scores = []
+    for i, v in enumerate(vectors):
+        dot = sum(a * b for a, b in zip(query, v))
+        norms = sum(a * a for a in query) ** 0.5 * sum(b * b for b in v) ** 0.5
+        scores.append((dot / norms if norms else 0.0, i))
+    return sorted(scores, reverse=True)[:k]
+
+
+class TestVaultIndex:
+
+    def test_matches_brute_force_cosine(self, tmp_path):
+        rng = np.random.default_rng(7)
+        vectors = rng.normal(size=(200, 16)).tolist()
+        conn = legacy_vault(tmp_path / "vault.db", vectors)
+        ensure_vector_columns(conn)
+        index = VaultIndex(str(tmp_path / "vault.db"))
+
+        for query in rng.normal(size=(5, 16)).tolist():
+            expected = brute_force(vectors, query, 3)
+            results = index.search(conn, query, k=3)
+            assert [chunk for _, _, chunk in results] == [f"chunk {i}" for _, i in expected]
+            assert [score for score, _, _ in results] == pytest.approx([s for s, _ in expected], abs=1e-5)
+
+    def test_sidecar_is_reused_and_rebuilt_on_change(self, tmp_path):
+        conn = legacy_vault(tmp_path / "vault.db", [[1, 0], [0, 1]])
+        ensure_vector_columns(conn)
+        VaultIndex(str(tmp_path / "vault.db")).refresh(conn)
+        matrix_file = tmp_path / "vault.vectors.npy"
+        built = matrix_file.stat().st_mtime_ns
+
+        index = VaultIndex(str(tmp_path / "vault.db"))
+        assert index.search(conn, [0.9, 0.1], k=1)[0][2] == "chunk 0"
+        assert isinstance(index.matrix, np.memmap) and matrix_file.stat().st_mtime_ns == built
+
+        # A writer that only knows the JSON column; its row is backfilled on the next query
+        conn.execute("INSERT INTO KnowledgeVault (source_file, content_chunk, embedding) VALUES (?, ?, ?)",
+                     ("doc2.md", "chunk 2", "[-1.0, 0.0]"))
+        conn.execute("DELETE FROM KnowledgeVault WHERE id = 1")
+        assert [chunk for _, _, chunk in index.search(conn, [-1, 0.1], k=5)] == ["chunk 2", "chunk 1"]
+
+    def test_mismatched_dimensions_and_empty_vault(self, tmp_path):
+        conn = legacy_vault(tmp_path / "vault.db", [[1, 0, 0], [0, 1, 0], [1, 1]])
+        ensure_vector_columns(conn)
+        index = VaultIndex(str(tmp_path / "vault.db"))
+        assert len(index.search(conn, [1, 0, 0], k=10)) == 2
+        assert index.search(conn, [1, 0], k=3) == []
+
+        conn.execute("DELETE FROM KnowledgeVault")
+        assert index.search(conn, [1, 0, 0], k=3) == []
+
+    def test_top_k_over_100k_chunks_is_fast(self, tmp_path):
+        rng = np.random.default_rng(1)
+        vectors = rng.normal(size=(100_000, 64)).astype(np.float32)
+        conn = sqlite3.connect(tmp_path / "vault.db")
+        conn.execute("CREATE TABLE KnowledgeVault (id INTEGER PRIMARY KEY AUTOINCREMENT, source_file TEXT, "
+                     "content_chunk TEXT, embedding TEXT, timestamp DATETIME)")
+        ensure_vector_columns(conn)
+        conn.executemany("INSERT INTO KnowledgeVault (source_file, content_chunk, embedding_blob, norm) VALUES (?, ?, ?, ?)",
+                         [("big.md", str(i), *encode_embedding(v)) for i, v in enumerate(vectors)])
+        conn.commit()
+        index = VaultIndex(str(tmp_path / "vault.db"))
+        index.refresh(conn)
+
+        start = time.perf_counter()
+        results = index.search(conn, vectors[42], k=3)
+        assert time.perf_counter() - start < 0.5
+        assert results[0][2] == "42" and results[0][0] == pytest.approx(1.0, abs=1e-5)
@@ -0,0 +1,169 @@
+"""
+Tests for X Scout - Phase G1.4
+Unit tests for compiled keyword gates and cross-run prospect dedupe.
+"""
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from file_cache import FileCache
+from growth_db import GrowthDB
+from x_gates import GateEngine
+from x_scout import XScout
+
+
+def make_tweet(tweet_id: str, username: str, text: str) -> dict:
+    return {
+        "tweet_id": tweet_id,
+        "text": text,
+        "created_at": "",
+        "author": {"username": username, "name": username.title(), "description": "Owner"},
+        "query": "q",
+        "query_type": "business_pain",
+    }
+
+
+PAIN_TEXT = "Our office keeps getting missed calls from customers"
+
+
+@pytest.fixture
+def db(tmp_path):
+    return GrowthDB(tmp_path / "growth.db")
+
+
+def make_scout(db, cache_dir) -> XScout:
+    s = XScout(db=db)
+    s.api_mode = True
+    s.cache = FileCache(cache_dir, "x_search")
+    return s
+
+
+@pytest.fixture
+def scout(db, tmp_path):
+    return make_scout(db, tmp_path / "cache")
+
+
+class TestGateEngine:
+    """GateEngine must match the per-keyword `kw in text` semantics exactly."""
+
+    @pytest.fixture
+    def engine(self):
+        return GateEngine({
+            "meme": (("text",), ["ex", "when he"]),
+            "missed": (("text",), ["missed calls", "missed call"]),
+            "negative": (("bio", "name"), ["LLM", "oss"]),
+        })
+
+    def test_substring_inside_token(self, engine):
+        features = engine.evaluate({"text": "what's next for the shop"})
+        assert features["meme"] == {"ex"}
+
+    def test_prefix_keywords_both_match(self, engine):
+        features = engine.evaluate({"text": "too many missed calls today"})
+        assert features["missed"] == {"missed calls", "missed call"}
+        assert engine.ordered("missed", features) == ["missed calls", "missed call"]
+
+    def test_phrase_requires_contiguous_words(self, engine):
+        assert "when he" not in engine.evaluate({"text": "he said so when it rained"})["meme"]
+        assert engine.evaluate({"text": "so when he called"})["meme"] == {"when he"}
+
+    def test_multi_field_gate_and_lowercased_keywords(self, engine):
+        features = engine.evaluate({"bio": "the boss", "name": "llm labs"})
+        assert features["negative"] == {"llm", "oss"}
+        assert engine.first("negative", features) == "llm"
+
+    def test_scout_stages_share_features(self, scout):
+        tweet = make_tweet("1", "acme", "Missed calls from customers at our HVAC shop")
+        tweet["author"]["description"] = "Owner at Acme Services LLC"
+        features = scout.features(tweet)
+
+        assert scout.candidate_filter(tweet, features) == (True, "passed")
+        assert scout.context_gate(tweet["text"], features) == ("PASS", "")
+        assert scout.generate_tags(tweet, None, features) == ["missed_calls", "customer_focused", "hvac"]
+        assert scout._has_pain_language(tweet["text"])
+
+
+class TestDenylist:
+
+    def test_matches_parent_domains_like_enricher(self, scout):
+        from prospect_enricher import ProspectEnricher
+        enricher = ProspectEnricher()
+        assert scout.denylist is enricher.denylist
+        for domain, expected in [("calendly.com", True), ("www.calendly.com", True),
+                                 ("shop.blogspot.com", True), ("pal.com", False), (None, False)]:
+            assert scout.is_denylist_domain(domain) is expected
+
+
+class TestCrossRunDedupe:
+    """Seen prospect keys persist across XScout instances."""
+
+    def test_second_run_skips_seen_handle_before_expansion(self, db, tmp_path):
+        tweets = [make_tweet("1", "acmehvac", PAIN_TEXT)]
+
+        first = make_scout(db, tmp_path / "cache")
+        with patch.object(first, "_select_queries", return_value=[("q", "business_pain")]), \
+             patch.object(first, "search", return_value=tweets), \
+             patch.object(first, "get_resolved_domain", return_value=(None, [])):
+            assert len(first.hunt()) == 1
+
+        second = make_scout(db, tmp_path / "cache")
+        with patch.object(second, "_select_queries", return_value=[("q", "business_pain")]), \
+             patch.object(second, "search", return_value=tweets), \
+             patch.object(second, "get_resolved_domain") as resolve:
+            assert second.hunt() == []
+            resolve.assert_not_called()
+
+    def test_places_domain_is_shared(self, scout, db):
+        db.upsert_place({
+            "id": "place_1",
+            "displayName": {"text": "Acme HVAC"},
+            "websiteUri": "https://www.acmehvac.com/contact",
+        })
+        tweets = [make_tweet("1", "acme_owner", PAIN_TEXT)]
+
+        with patch.object(scout, "_select_queries", return_value=[("q", "business_pain")]), \
+             patch.object(scout, "search", return_value=tweets), \
+             patch.object(scout, "get_resolved_domain", return_value=("acmehvac.com", [])):
+            assert scout.hunt() == []
+
+        # The handle is remembered too, so the next run skips expansion
+        assert "x:acme_owner" in db.get_seen_prospect_keys()
+
+    def test_authors_without_username_are_not_deduped_by_handle(self, scout, db):
+        tweets = [make_tweet("1", "", PAIN_TEXT), make_tweet("2", "", PAIN_TEXT)]
+        domains = iter([("first.com", []), ("second.com", [])])
+
+        with patch.object(scout, "_select_queries", return_value=[("q", "business_pain")]), \
+             patch.object(scout, "search", return_value=tweets), \
+             patch.object(scout, "get_resolved_domain", side_effect=lambda urls: next(domains)):
+            assert [p["prospect_key"] for p in scout.hunt()] == ["first.com", "second.com"]
+
+        assert "x:unknown" not in db.get_seen_prospect_keys()
+
+    def test_authors_without_username_or_domain_are_not_deduped(self, db, tmp_path):
+        anonymous = make_tweet("1", "", PAIN_TEXT)
+        with_id = make_tweet("2", "", PAIN_TEXT)
+        with_id["author"]["id"] = "42"
+
+        def run(tweets):
+            scout = make_scout(db, tmp_path / "cache")
+            with patch.object(scout, "_select_queries", return_value=[("q", "business_pain")]), \
+                 patch.object(scout, "search", return_value=tweets), \
+                 patch.object(scout, "get_resolved_domain", return_value=(None, [])):
+                return [p["prospect_key"] for p in scout.hunt()]
+
+        assert run([anonymous, with_id]) == ["x:tweet:1", "x:id:42"]
+        assert db.get_seen_prospect_keys() == {"x:id:42"}
+        # Another anonymous author next run is still reported; the same account is not
+        assert run([make_tweet("3", "", PAIN_TEXT), with_id]) == ["x:tweet:3"]
+
+    def test_expired_keys_are_not_loaded(self, db):
+        db.mark_prospects_seen(["old.com"], source="X", ttl_days=-1)
+        db.mark_prospects_seen(["new.com"], source="X")
+
+        assert db.get_seen_prospect_keys() == {"new.com"}
+        assert db.purge_expired_prospect_keys() == 1
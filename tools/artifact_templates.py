@@ -0,0 +1,90 @@
+"""
+Artifact Templates - compiled text templates for build-agent artifacts
+Templates live in templates/agent_build/ and use the {{PLACEHOLDER}} syntax of
+templates/system_prompt_template.txt.
+
+- each template is read and compiled (split into literal and placeholder parts)
+  once per process
+- the ACIP preamble is read once per process
+- write_artifact() streams rendered parts to disk and hashes them on the way,
+  so an artifact is produced in one pass and never re-read for its manifest hash
+
+Usage:
+    from artifact_templates import load_template, write_artifact
+    template = load_template("kb_seed.md")
+    meta = write_artifact(path, template.chunks(context))   # {"sha256": ..., "bytes": ...}
+"""
+import re
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates" / "agent_build"
+ACIP_PATH = Path(__file__).parent.parent / "security" / "acip" / "ACIP_v1_full.md"
+PLACEHOLDER = re.compile(r"\{\{\s*([A-Z0-9_]+)\s*\}\}")
+
+
+class TemplateError(ValueError):
+    """A template references a value the render context does not provide."""
+
+
+class CompiledTemplate:
+    """A template split into (is_placeholder, text) parts; rendering is a single join."""
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.parts: List[Tuple[bool, str]] = []
+        pos = 0
+        for match in PLACEHOLDER.finditer(text):
+            if match.start() > pos:
+                self.parts.append((False, text[pos:match.start()]))
+            self.parts.append((True, match.group(1)))
+            pos = match.end()
+        if pos < len(text):
+            self.parts.append((False, text[pos:]))
+        self.fields = frozenset(value for is_field, value in self.parts if is_field)
+
+    def chunks(self, context: Dict[str, str]) -> Iterator[str]:
+        """Rendered text, part by part. Values are inserted verbatim (never re-expanded)."""
+        missing = self.fields - context.keys()
+        if missing:
+            raise TemplateError(f"Template {self.name} needs {', '.join(sorted(missing))}")
+        for is_field, value in self.parts:
+            yield str(context[value]) if is_field else value
+
+    def render(self, context: Dict[str, str]) -> str:
+        return "".join(self.chunks(context))
+
+
+@lru_cache(maxsize=None)
+def load_template(name: str, directory: Path = TEMPLATES_DIR) -> CompiledTemplate:
+    """Compiled template templates/agent_build/<name> (read from disk once per process)."""
+    path = Path(directory) / name
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return CompiledTemplate(name, f.read())
+
+
+@lru_cache(maxsize=None)
+def acip_preamble() -> str:
+    """The vendored ACIP security preamble ("" if it is not present); read once per process."""
+    if ACIP_PATH.exists():
+        with open(ACIP_PATH, 'r', encoding='utf-8') as f:
+            return f.read()
+    return ""
+
+
+def write_artifact(path: Path, chunks: Iterable[str]) -> Dict:
+    """
+    Write UTF-8 text chunks to path, hashing them as they are written.
+    Returns {"sha256", "bytes"} of the file as written (newlines are not translated).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'wb') as f:
+        for chunk in chunks:
+            data = chunk.encode('utf-8')
+            digest.update(data)
+            f.write(data)
+            size += len(data)
+    return {"sha256": digest.hexdigest(), "bytes": size}
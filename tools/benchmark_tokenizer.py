@@ -0,0 +1,120 @@
+"""
+Benchmark - KB builder tokenization
+Replays the token work of one KB build over a ~5MB source bundle plus
+crawled pages: count every page as it is written, then chunk the bundle and
+every page for the chunk index. Runs the pre-Tokenizer path (encode, then
+decode every window; pages re-encoded when chunked) and the shared Tokenizer
+(count memo, one encode_batch, windows sliced by byte offsets). Both paths
+must produce the same chunks.
+
+Usage:
+    python tools/benchmark_tokenizer.py
+    python tools/benchmark_tokenizer.py --bundle ingested_clients/<slug>/source_bundle.md
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import tiktoken
+
+from tokenizer import DEFAULT_ENCODING, Tokenizer
+
+SENTENCES = [
+    "Our licensed technicians service furnaces, heat pumps and central air systems.",
+    "Maintenance plan members get priority scheduling and 15% off repairs.",
+    "Financing is available on new installations with approved credit.",
+    "We serve residential and light commercial customers across the metro area.",
+    "Café owners ask about ductless mini-splits for kitchens — déjà vu every summer.",
+    "Emergency calls are answered 24/7, including weekends and holidays.",
+    "Every estimate is free and itemized; there are no hidden trip charges.",
+]
+
+
+def synthetic_bundle(size_bytes: int, seed: int) -> str:
+    rng = random.Random(seed)
+    parts, size = [], 0
+    while size < size_bytes:
+        paragraph = " ".join(rng.choices(SENTENCES, k=rng.randint(3, 8)))
+        heading = f"## Section {len(parts)}\n\n" if rng.random() < 0.1 else ""
+        parts.append(heading + paragraph)
+        size += len(parts[-1]) + 2
+    return "\n\n".join(parts)
+
+
+def legacy_windows(enc: tiktoken.Encoding, text: str, chunk_tokens: int, overlap: int) -> List[Tuple[str, int]]:
+    """The pre-Tokenizer KBLibraryBuilder._chunk_text loop (without sanitization)."""
+    tokens = enc.encode(text)
+    if len(tokens) <= chunk_tokens:
+        return [(text, len(tokens))]
+    windows, start = [], 0
+    while start < len(tokens):
+        ids = tokens[start:start + chunk_tokens]
+        windows.append((enc.decode(ids), len(ids)))
+        start += chunk_tokens - overlap
+    return windows
+
+
+def legacy_build(encoding: str, bundle: str, pages: List[str], chunk_tokens: int, overlap: int):
+    enc = tiktoken.get_encoding(encoding)
+    enc = tiktoken.get_encoding(encoding)
+    counts = [len(enc.encode(page)) for page in pages]  # _write_kb_file
+    chunks = [legacy_windows(enc, doc, chunk_tokens, overlap) for doc in [bundle] + pages]
+    return counts, chunks
+
+
+def tokenizer_build(encoding: str, bundle: str, pages: List[str], chunk_tokens: int, overlap: int):
+    tok = Tokenizer(tiktoken.get_encoding(encoding))  # fresh memo, as in a new process
+    counts = [tok.count(page) for page in pages]
+    chunks = tok.split_batch([bundle] + pages, chunk_tokens, overlap)
+    return counts, chunks
+
+
+def timed(fn, *args) -> tuple:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark KB builder tokenization")
+    parser.add_argument("--bundle", help="Source bundle to chunk (default: synthetic)")
+    parser.add_argument("--size-mb", type=float, default=5.0, help="Synthetic bundle size")
+    parser.add_argument("--pages", type=int, default=60, help="Crawled pages (KB files) per build")
+    parser.add_argument("--chunk-tokens", type=int, default=650)
+    parser.add_argument("--overlap", type=int, default=80)
+    parser.add_argument("--encoding", default=DEFAULT_ENCODING)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.bundle:
+        bundle = Path(args.bundle).read_text(encoding="utf-8")
+    else:
+        bundle = synthetic_bundle(int(args.size_mb * 1024 * 1024), args.seed)
+    pages = [synthetic_bundle(6000, args.seed + i) for i in range(args.pages)]
+    tiktoken.get_encoding(args.encoding)  # load outside the timings
+
+    legacy_s, (legacy_counts, legacy) = timed(legacy_build, args.encoding, bundle, pages,
+                                              args.chunk_tokens, args.overlap)
+    new_s, (counts, chunks) = timed(tokenizer_build, args.encoding, bundle, pages,
+                                    args.chunk_tokens, args.overlap)
+
+    # The legacy loop also emitted tail windows already inside the previous window
+    mismatches = sum(1 for a, b in zip(legacy, chunks) if a[:len(b)] != b) + (legacy_counts != counts)
+    dropped = sum(len(a) - len(b) for a, b in zip(legacy, chunks))
+
+    print(f"Bundle:     {len(bundle.encode()) / 1024 / 1024:.1f} MB + {len(pages)} pages")
+    print(f"Chunks:     {sum(len(c) for c in chunks):,} ({dropped} redundant tail windows dropped)")
+    print(f"Legacy:     {legacy_s:.2f}s")
+    print(f"Tokenizer:  {new_s:.2f}s")
+    print(f"Speedup:    {legacy_s / new_s:.2f}x")
+    print(f"Mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
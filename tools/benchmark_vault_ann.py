@@ -0,0 +1,102 @@
+"""
+Benchmark - Knowledge Vault approximate search
+Builds the vault ANN indexes (COMMAND/vault_ann.py) over synthetic clustered
+embeddings and compares them with exact search (the VaultIndex matrix-vector
+product): recall@k against the exact top-k, and per-query latency, for a sweep
+of nprobe (IVF) / ef (HNSW, when hnswlib is installed) values.
+
+Usage:
+    python tools/benchmark_vault_ann.py
+    python tools/benchmark_vault_ann.py --rows 1000000 --dim 768 --k 10
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "COMMAND"))
+
+from vault_ann import HNSWIndex, IVFIndex, hnswlib_available
+
+
+def synthetic_vault(rows: int, dim: int, topics: int, seed: int) -> np.ndarray:
+    """Unit rows scattered around `topics` directions, like chunks of documents on a few subjects."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dim)).astype(np.float32)
+    matrix = centers[rng.integers(0, topics, rows)] + 2.0 * rng.normal(size=(rows, dim)).astype(np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def exact_top_k(matrix: np.ndarray, queries: np.ndarray, k: int) -> Tuple[List[np.ndarray], float]:
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        scores = matrix @ query
+        best = np.argpartition(-scores, k - 1)[:k]
+        results.append(best[np.argsort(-scores[best])])
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def measure(index, queries: np.ndarray, truth: List[np.ndarray], k: int) -> Tuple[float, float]:
+    """(recall@k, seconds per query)."""
+    found = 0
+    start = time.perf_counter()
+    for query, expected in zip(queries, truth):
+        ids, _ = index.search(query, k)
+        found += len(np.intersect1d(ids, expected))
+    return found / (k * len(queries)), (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Knowledge Vault ANN search")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--topics", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    matrix = synthetic_vault(args.rows, args.dim, args.topics, args.seed)
+    ids = np.arange(len(matrix), dtype=np.int64)
+    rng = np.random.default_rng(args.seed + 1)
+    queries = matrix[rng.choice(len(matrix), args.queries, replace=False)]
+    queries = queries + 0.05 * rng.normal(size=queries.shape).astype(np.float32)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+    truth, exact_s = exact_top_k(matrix, queries, args.k)
+    print(f"Vault:  {args.rows:,} x {args.dim} ({args.topics} topics), {args.queries} queries, k={args.k}")
+    print(f"Exact:  {exact_s * 1e3:.2f} ms/query")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ivf = IVFIndex(str(Path(tmp) / "bench"))
+        start = time.perf_counter()
+        ivf.build(ids, matrix)
+        print(f"IVF:    built in {time.perf_counter() - start:.1f}s ({len(ivf.centroids)} lists)")
+        for nprobe in (4, 8, 16, 32, 64):
+            ivf.nprobe = nprobe
+            recall, seconds = measure(ivf, queries, truth, args.k)
+            print(f"  nprobe={nprobe:<3} recall@{args.k}={recall:.3f}  {seconds * 1e3:.2f} ms/query"
+                  f"  ({exact_s / seconds:.1f}x)")
+
+        if not hnswlib_available():
+            print("HNSW:   skipped (pip install hnswlib)")
+            return 0
+        hnsw = HNSWIndex(str(Path(tmp) / "bench"))
+        start = time.perf_counter()
+        hnsw.build(ids, matrix)
+        print(f"HNSW:   built in {time.perf_counter() - start:.1f}s")
+        for ef in (32, 64, 128, 256):
+            hnsw.ef = ef
+            recall, seconds = measure(hnsw, queries, truth, args.k)
+            print(f"  ef={ef:<6} recall@{args.k}={recall:.3f}  {seconds * 1e3:.2f} ms/query"
+                  f"  ({exact_s / seconds:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
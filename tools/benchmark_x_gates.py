@@ -0,0 +1,219 @@
+"""
+Benchmark - X Scout keyword gates
+Runs the X Scout gate and scoring stages over a synthetic corpus twice: with
+the per-keyword substring loops used before the compiled GateEngine, and
+through XScout with one GateEngine feature vector per tweet. Both paths must
+produce identical decisions.
+
+Usage:
+    python tools/benchmark_x_gates.py
+    python tools/benchmark_x_gates.py --tweets 100000 --seed 7
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from x_gates import PAIN_PHRASES, ORG_MARKERS, OPERATOR_ROLES
+from growth_config import load_config
+from x_scout import XScout
+
+FILLER = ("today we had a busy week at the shop and the team kept working "
+          "through the weekend to finish every job on the list for our neighbors").split()
+
+
+def synthetic_corpus(n: int, seed: int) -> List[Dict]:
+    """Tweets mixing filler words with keywords from every configured gate."""
+    rng = random.Random(seed)
+    config = load_config()
+    gates = config.get("context_gates", {})
+    filters = config.get("filters", {})
+    text_vocab = (PAIN_PHRASES + gates.get("sports_keywords", []) + gates.get("meme_keywords", [])
+                  + gates.get("business_markers", []) + gates.get("vendor_pitch_markers", [])
+                  + filters.get("business_keywords", []))
+    bio_vocab = (filters.get("hard_negatives", []) + filters.get("vendor_patterns", [])
+                 + filters.get("operator_keywords", []) + ORG_MARKERS + OPERATOR_ROLES)
+
+    def sentence(vocab: List[str], words: int, hits: int) -> str:
+        parts = rng.choices(FILLER, k=words) + rng.sample(vocab, hits)
+        rng.shuffle(parts)
+        return " ".join(parts)
+
+    return [{
+        "text": sentence(text_vocab, 30, rng.randint(0, 4)),
+        "created_at": "",
+        "author": {
+            "name": sentence(ORG_MARKERS, 2, rng.randint(0, 1)).title(),
+            "description": sentence(bio_vocab, 15, rng.randint(0, 3)),
+        },
+    } for _ in range(n)]
+
+
+class LegacyGates:
+    """The pre-GateEngine XScout checks: per-keyword substring loops per stage."""
+
+    def __init__(self, scout: XScout):
+        self.filters = scout.filters
+        self.context_gates = scout.context_gates
+        self.scoring = scout.scoring
+
+    def context_gate(self, tweet_text: str) -> Tuple[str, str]:
+        text = tweet_text.lower()
+        for kw in self.context_gates.get("sports_keywords", []):
+            if kw.lower() in text:
+                return "FAIL", f"sports_context:{kw}"
+        for kw in self.context_gates.get("meme_keywords", []):
+            if kw.lower() in text:
+                return "FAIL", f"meme_context:{kw}"
+        business_markers = self.context_gates.get("business_markers", [])
+        if "missed calls" in text or "missed call" in text:
+            if not any(bm.lower() in text for bm in business_markers):
+                return "FAIL", "no_business_marker"
+        return "PASS", ""
+
+    def vendor_pitch_gate(self, tweet_text: str) -> Tuple[str, str]:
+        text = tweet_text.lower()
+        matches = [m for m in self.context_gates.get("vendor_pitch_markers", []) if m.lower() in text]
+        if len(matches) >= 2:
+            return "FAIL", f"vendor_pitch:{len(matches)}_matches"
+        return "PASS", ""
+
+    def candidate_filter(self, tweet: Dict) -> Tuple[bool, str]:
+        author = tweet.get("author", {})
+        bio = (author.get("description") or "").lower()
+        name = (author.get("name") or "").lower()
+        tweet_text = (tweet.get("text") or "").lower()
+        for neg in self.filters.get("hard_negatives", []):
+            if neg.lower() in bio or neg.lower() in name:
+                return False, f"hard_negative:{neg.lower()}"
+        has_pain = self._has_pain_language(tweet_text)
+        for vp in self.filters.get("vendor_patterns", []):
+            if vp.lower() in bio and not has_pain:
+                return False, f"vendor_no_pain:{vp.lower()}"
+        return True, "passed"
+
+    def _has_pain_language(self, text: str) -> bool:
+        text_lower = text.lower()
+        return any(phrase in text_lower for phrase in PAIN_PHRASES)
+
+    def calculate_moment_score(self, tweet: Dict) -> int:
+        score = 0
+        bio = (tweet.get("author", {}).get("description") or "").lower()
+        tweet_text = tweet.get("text", "")
+        if self._has_pain_language(tweet_text):
+            score += self.scoring.get("pain_phrase_weight", 4)
+        if any(kw.lower() in bio for kw in self.filters.get("operator_keywords", [])):
+            score += self.scoring.get("operator_keyword_weight", 1)
+        if any(vp.lower() in bio for vp in self.filters.get("vendor_patterns", [])):
+            score += self.scoring.get("vendor_penalty", -4)
+        if tweet_text.count("#") > 5:
+            score += self.scoring.get("spam_hashtag_penalty", -2)
+        return max(0, min(10, score))
+
+    def calculate_b2b_confidence(self, author: Dict) -> int:
+        score = 0
+        bio = (author.get("description") or "").lower()
+        name = (author.get("name") or "").lower()
+        if any(m in bio or m in name for m in ORG_MARKERS):
+            score += 2
+        if any(r in bio for r in OPERATOR_ROLES):
+            score += 2
+        if not any(m in bio or m in name for m in ORG_MARKERS):
+            words = name.split()
+            if 0 < len(words) <= 2 and words[0].isalpha():
+                score -= 4
+        return max(0, min(10, score))
+
+    def generate_why_this_lead(self, tweet: Dict, moment_score: int, b2b_confidence: int) -> str:
+        bio = (tweet.get("author", {}).get("description") or "").lower()
+        tweet_text = (tweet.get("text") or "").lower()
+        reasons = []
+        if self._has_pain_language(tweet_text):
+            reasons.append("Business pain signal detected")
+        if any(r in bio for r in OPERATOR_ROLES):
+            reasons.append("Business operator")
+        reasons.append(f"B2B: {b2b_confidence}/10, Moment: {moment_score}/10")
+        return ". ".join(reasons) + "."
+
+    def generate_tags(self, tweet: Dict) -> List[str]:
+        tags = []
+        tweet_text = (tweet.get("text") or "").lower()
+        bio = (tweet.get("author", {}).get("description") or "").lower()
+        if "missed call" in tweet_text:
+            tags.append("missed_calls")
+        if "after hours" in tweet_text:
+            tags.append("after_hours")
+        if "customer" in tweet_text or "client" in tweet_text:
+            tags.append("customer_focused")
+        if "appointment" in tweet_text or "booking" in tweet_text:
+            tags.append("scheduling")
+        for kw in self.filters.get("business_keywords", []):
+            if kw.lower() in bio or kw.lower() in tweet_text:
+                tags.append(kw.lower().replace(" ", "_"))
+                break
+        return tags[:5]
+
+    def pipeline(self, tweet: Dict) -> tuple:
+        keep = self.candidate_filter(tweet)
+        text = tweet.get("text", "")
+        ctx = self.context_gate(text)
+        vendor = self.vendor_pitch_gate(text)
+        moment = self.calculate_moment_score(tweet)
+        b2b = self.calculate_b2b_confidence(tweet["author"])
+        return (keep, ctx, vendor, moment, b2b,
+                self.generate_why_this_lead(tweet, moment, b2b), self.generate_tags(tweet))
+
+
+def engine_pipeline(scout: XScout, tweet: Dict) -> tuple:
+    """The same stages through XScout, sharing one feature vector per tweet."""
+    features = scout.features(tweet)
+    keep = scout.candidate_filter(tweet, features)
+    text = tweet.get("text", "")
+    ctx = scout.context_gate(text, features)
+    vendor = scout.vendor_pitch_gate(text, features)
+    moment = scout.calculate_moment_score(tweet, features)
+    b2b = scout.calculate_b2b_confidence(tweet["author"], None, features)
+    why = scout.generate_why_this_lead(tweet, moment, b2b, None, "", "", "", features)
+    return keep, ctx, vendor, moment, b2b, why, scout.generate_tags(tweet, None, features)
+
+
+def best_of(repeat: int, fn, corpus: List[Dict]) -> tuple:
+    """Run fn over the corpus repeat times; return (best seconds, last results)."""
+    best, results = float("inf"), []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [fn(t) for t in corpus]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark X Scout keyword gates")
+    parser.add_argument("--tweets", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.tweets, args.seed)
+    scout = XScout()
+    legacy_gates = LegacyGates(scout)
+
+    legacy_s, legacy = best_of(args.repeat, legacy_gates.pipeline, corpus)
+    compiled_s, compiled = best_of(args.repeat, lambda t: engine_pipeline(scout, t), corpus)
+
+    mismatches = sum(1 for a, b in zip(legacy, compiled) if a != b)
+
+    print(f"Tweets:       {len(corpus):,} (best of {args.repeat})")
+    print(f"Legacy loops: {legacy_s:.2f}s ({legacy_s / len(corpus) * 1e6:.1f} us/tweet)")
+    print(f"GateEngine:   {compiled_s:.2f}s ({compiled_s / len(corpus) * 1e6:.1f} us/tweet)")
+    print(f"Speedup:      {legacy_s / compiled_s:.2f}x")
+    print(f"Mismatches:   {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,10 +6,8 @@ import json
 import requests
 from bs4 import BeautifulSoup
 from utils import load_env
+from llm_gateway import generate_with_gemini, generate_with_ollama
 
-# Configuration
-OLLAMA_URL = "http://localhost:11434/api/generate"
-GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent"
 
 def load_specialist(name):
     path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'specialists', f'{name}.txt')
@@ -18,42 +16,6 @@ def load_specialist(name):
             return f.read()
     return ""
 
-def generate_with_gemini(persona_context, prompt):
-    api_key = os.environ.get("GOOGLE_API_KEY")
-    if not api_key:
-        print("❌ Error: GOOGLE_API_KEY not found.")
-        return None
-
-    full_prompt = f"{persona_context}\n\n{prompt}"
-    
-    payload = {
-        "contents": [{"parts": [{"text": full_prompt}]}]
-    }
-    
-    # Retry Loop (3 attempts)
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            response = requests.post(
-                f"{GEMINI_URL}?key={api_key}",
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            if response.status_code == 429:
-                print(f"   ⚠️ Gemini Rate Limit (429). Waiting {2 * (attempt + 1)}s...")
-                time.sleep(2 * (attempt + 1))
-                continue
-                
-            response.raise_for_status()
-            return response.json()['candidates'][0]['content']['parts'][0]['text']
-        except Exception as e:
-            print(f"   ⚠️ Gemini Attempt {attempt+1}/{max_retries} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2)
-            else:
-                return None
-
 def fetch_website_content(url):
     print(f"   > 🕸️  Spidering: {url}")
     try:
@@ -115,19 +77,10 @@ def analyze_site_with_webworker(content):
     [/TASK]
     """
     
-    try:
-        response = requests.post(OLLAMA_URL, json={
-            "model": "llama3",
-            "prompt": prompt,
-            "stream": False,
-            "format": "json"
-        })
-        response.raise_for_status()
-        data = response.json()
-        return json.loads(data['response'])
-    except Exception as e:
-        print(f"❌ WebWorker Error: {e}")
-        return None
+    data = generate_with_ollama("", prompt)
+    if data is None:
+        print("❌ WebWorker Error: no JSON reply from Ollama")
+    return data
 
 def format_kb_with_troy(client_data):
     print("   > 🏗️  Troy: Formatting Knowledge Base...")
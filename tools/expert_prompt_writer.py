@@ -10,10 +10,8 @@ Usage:
 """
 import sys
 sys.stdout.reconfigure(encoding='utf-8')
-import os
 import json
 import argparse
-import requests
 import re
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -30,14 +28,6 @@ def load_env_vars():
     from utils import load_env
     load_env()
 
-def get_api_key():
-    """Get Google API Key."""
-    key = os.environ.get("GOOGLE_API_KEY")
-    if not key:
-        print("❌ Error: GOOGLE_API_KEY not found.")
-        sys.exit(1)
-    return key
-
 def load_text(path: Path) -> str:
     """Load text file content."""
     if not path.exists():
@@ -72,35 +62,12 @@ def sanitize_text(text: str) -> str:
         
     return text
 
-def call_gemini(system_prompt: str, user_prompt: str) -> Optional[str]:
-    """Call Gemini API."""
-    api_key = get_api_key()
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent?key={api_key}"
-    
-    payload = {
-        "contents": [
-            {"role": "user", "parts": [{"text": system_prompt + "\n\n" + user_prompt}]} 
-        ],
-        "generationConfig": {
-            "temperature": 0.7,
-            "maxOutputTokens": 4000,
-        }
-    }
-    
-    try:
-        response = requests.post(url, json=payload, timeout=60)
-        
-        if response.status_code != 200:
-            print(f"⚠️ Gemini API Error: {response.status_code} - {response.text}")
-            return None
-            
-        data = response.json()
-        return data['candidates'][0]['content']['parts'][0]['text']
-    except Exception as e:
-        print(f"❌ Gemini Call Failed: {e}")
-        return None
+def call_gemini(system_prompt: str, user_prompt: str, cache=None) -> Optional[str]:
+    """Gemini reply via the LLM gateway, or None. With an LLMCache, an identical earlier call is answered from it."""
+    from llm_gateway import generate_with_gemini
+    return generate_with_gemini(system_prompt, user_prompt, model=GEMINI_MODEL, cache=cache, temperature=0.7)
 
-def generate_expert_system_prompt(dossier: Dict[str, Any], acip_enabled: bool) -> str:
+def generate_expert_system_prompt(dossier: Dict[str, Any], acip_enabled: bool, cache=None) -> str:
     """Generate the system prompt using Troy Skeleton."""
     print("   🧠 Troy: Architecting system prompt...")
     
@@ -154,7 +121,7 @@ def generate_expert_system_prompt(dossier: Dict[str, Any], acip_enabled: bool) -
     5. Output CLEAN TEXT only (the content of the system prompt).
     """
     
-    result = call_gemini("You are an expert AI Architect.", prompt)
+    result = call_gemini("You are an expert AI Architect.", prompt, cache=cache)
     if not result:
         raise Exception("Failed to generate system prompt")
         
@@ -172,7 +139,7 @@ def generate_expert_system_prompt(dossier: Dict[str, Any], acip_enabled: bool) -
             
     return clean_prompt
 
-def generate_persona_context(dossier: Dict[str, Any]) -> str:
+def generate_persona_context(dossier: Dict[str, Any], cache=None) -> str:
     """Generate persona context (The Soul)."""
     print("   👻 Troy: Synthesizing persona context...")
     
@@ -199,7 +166,7 @@ def generate_persona_context(dossier: Dict[str, Any]) -> str:
     - "If I don't know": (How to handle ignorance gracefully)
     """
     
-    result = call_gemini("You are an expert Character Designer.", prompt)
+    result = call_gemini("You are an expert Character Designer.", prompt, cache=cache)
     if not result:
         return "Persona generation failed. Using default context."
         
@@ -219,8 +186,8 @@ def generate_quality_report(system_prompt: str, persona_context: str) -> Dict[st
         }
     }
 
-def process_agent(slug: str, acip: bool):
-    """Main execution flow."""
+def process_agent(slug: str, acip: bool, cache=None):
+    """Main execution flow. cache: optional LLMCache shared by every Gemini call."""
     print(f"\n{'='*60}")
     print(f"🏭 EXPERT PROMPT WRITER (EPW)")
     print(f"   Agent: {slug}")
@@ -247,10 +214,10 @@ def process_agent(slug: str, acip: bool):
     # Generate Artifacts
     try:
         # 1. System Prompt
-        sys_prompt = generate_expert_system_prompt(dossier, acip)
+        sys_prompt = generate_expert_system_prompt(dossier, acip, cache=cache)
         
         # 2. Persona Context
-        persona = generate_persona_context(dossier)
+        persona = generate_persona_context(dossier, cache=cache)
         
         # 3. Save Files
         sp_filename = "system_prompt_with_acip.txt" if acip else "system_prompt.txt"
@@ -273,14 +240,14 @@ def process_agent(slug: str, acip: bool):
         # No, I passed `acip_enabled` to it.
         
         # Let's create two versions if ACIP is requested.
-        base_prompt = generate_expert_system_prompt(dossier, False) # Plain
+        base_prompt = generate_expert_system_prompt(dossier, False, cache=cache) # Plain
         
         with open(output_dir / "system_prompt.txt", 'w', encoding='utf-8') as f:
             f.write(base_prompt)
         print("   ✅ Upgraded system_prompt.txt")
         
         if acip:
-            acip_prompt = generate_expert_system_prompt(dossier, True) # With Preamble
+            acip_prompt = generate_expert_system_prompt(dossier, True, cache=cache) # With Preamble
             with open(output_dir / "system_prompt_with_acip.txt", 'w', encoding='utf-8') as f:
                 f.write(acip_prompt)
             print("   ✅ Upgraded system_prompt_with_acip.txt")
@@ -321,6 +288,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Expert Prompt Writer")
     parser.add_argument("--slug", required=True, help="Agent slug")
     parser.add_argument("--acip", action="store_true", help="Enable ACIP hardening")
+    parser.add_argument("--no-llm-cache", action="store_true", help="Always call Gemini (skip the response cache)")
     args = parser.parse_args()
     
-    process_agent(args.slug, args.acip)
+    from llm_cache import get_llm_cache
+    process_agent(args.slug, args.acip, cache=None if args.no_llm_cache else get_llm_cache())
@@ -17,7 +17,9 @@ Pipeline (Build-Agent Mode):
 Usage:
     python tools/factory_orchestrator.py                         # Process all unprocessed hunt files
     python tools/factory_orchestrator.py --file <path>           # Process specific hunt file
+    python tools/factory_orchestrator.py --watch                 # Process hunt files as they land
     python tools/factory_orchestrator.py --build-agent <dossier> # Build agent from dossier (Phase 12)
+    python tools/factory_orchestrator.py --build-agents "ingested_clients/*/dossier.json"  # Build many, one per core
 """
 import sys
 sys.stdout.reconfigure(encoding='utf-8')
@@ -28,7 +30,9 @@ import time
 import glob
 import hashlib
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
 from tqdm import tqdm
 
@@ -38,11 +42,19 @@ sys.path.insert(0, os.path.dirname(__file__))
 from utils import load_env
 from contact_enricher import enrich_contact
 from email_generator import generate_outreach_email, save_email_template
+from llm_gateway import generate_with_ollama, get_gateway
+from hunt_queue import HUNT_PATTERN, POLL_INTERVAL, HuntWatcher, get_hunt_queue
+from artifact_templates import acip_preamble, load_template, write_artifact
 
 # Configuration
 LEADS_DIR = Path(__file__).parent.parent / "intelligence" / "leads"
 REPORTS_DIR = Path(__file__).parent.parent / "intelligence" / "reports"
-PROCESSED_LOG = LEADS_DIR / ".processed"
+PROCESSED_LOG = LEADS_DIR / ".processed"  # legacy path-per-line log, imported into the queue
+HUNT_QUEUE_DB = LEADS_DIR / ".hunt_queue.db"
+AGENTS_DIR = Path(__file__).parent.parent / "agents"
+BUILD_SUMMARY = "build_summary.json"
+# Leads ranked per Nova call (the persona is sent once per batch)
+NOVA_BATCH_SIZE = 8
 
 def load_specialist(name):
     path = Path(__file__).parent.parent / 'specialists' / f'{name}.txt'
@@ -51,42 +63,23 @@ def load_specialist(name):
             return f.read()
     return ""
 
-def generate_with_ollama(persona, prompt, model="llama3"):
-    import requests
-    full_prompt = f"{persona}\n\n{prompt}"
-    try:
-        response = requests.post("http://localhost:11434/api/generate", json={
-            "model": model,
-            "prompt": full_prompt,
-            "stream": False,
-            "format": "json"
-        }, timeout=60)
-        response.raise_for_status()
-        data = response.json()
-        return json.loads(data['response'])
-    except Exception as e:
-        print(f"   ⚠️ Ollama Error: {e}")
-        return None
+def open_hunt_queue():
+    """The hunt job queue (processed state keyed by file hash); absorbs a legacy .processed log once."""
+    queue = get_hunt_queue(HUNT_QUEUE_DB)
+    queue.import_processed_log(PROCESSED_LOG)
+    return queue
 
-def get_processed_files():
-    """Get list of already processed files."""
-    if not PROCESSED_LOG.exists():
-        return set()
-    with open(PROCESSED_LOG, 'r', encoding='utf-8') as f:
-        return set(line.strip() for line in f.readlines())
-
-def mark_as_processed(filepath):
+def mark_as_processed(filepath, report_path=None):
     """Mark a file as processed."""
-    with open(PROCESSED_LOG, 'a', encoding='utf-8') as f:
-        f.write(f"{filepath}\n")
+    open_hunt_queue().mark_done(filepath, str(report_path) if report_path else None)
 
-def rank_lead_priority(lead, vertical_context=""):
+def rank_lead_priority(lead, vertical_context="", cache=None):
     """Use Nova to rank lead priority A/B/C."""
     persona = load_specialist("Nova")
     
+    # The persona goes once, as the system message (not repeated in the prompt body)
     prompt = f"""
     [[FACTORY_MODE]]
-    {persona}
     
     [LEAD DATA]
     Business: {lead.get('title', 'Unknown')}
@@ -111,9 +104,82 @@ def rank_lead_priority(lead, vertical_context=""):
     [/TASK]
     """
     
-    return generate_with_ollama(persona, prompt, model="qwen2.5:32b")
+    return generate_with_ollama(persona, prompt, model="qwen2.5:32b", cache=cache)
 
-def generate_email_draft(lead, pain_point=""):
+def rank_leads_batch(leads, vertical_context="", cache=None):
+    """
+    Use Nova to rank several leads in one call (persona sent once).
+    Returns {lead id: priority data} for the entries that came back valid; ids are
+    positions in `leads`. Missing, unknown, duplicate or malformed entries are left out.
+    """
+    persona = load_specialist("Nova")
+    lead_rows = [
+        {
+            "id": i,
+            "business": lead.get('title', 'Unknown'),
+            "url": lead.get('href', ''),
+            "nova_score": lead.get('nova_score', 0),
+            "reason": lead.get('nova_reason', ''),
+        }
+        for i, lead in enumerate(leads)
+    ]
+    
+    prompt = f"""
+    [[FACTORY_MODE]]
+    
+    [LEADS]
+    {json.dumps(lead_rows, ensure_ascii=False, indent=2)}
+    Vertical: {vertical_context}
+    
+    [TASK]
+    Assign each lead a final priority ranking:
+    - A = Hot lead, contact immediately
+    - B = Warm lead, follow up within 1 week
+    - C = Cold lead, nurture or skip
+    
+    Return JSON ONLY, exactly one entry per lead id:
+    {{
+        "rankings": [
+            {{
+                "id": <lead id>,
+                "priority": "A" or "B" or "C",
+                "reason": "1 sentence why",
+                "best_time_to_call": "Morning/Afternoon/Evening",
+                "urgency_score": <1-10>
+            }}
+        ]
+    }}
+    [/TASK]
+    """
+    
+    data = generate_with_ollama(persona, prompt, model="qwen2.5:32b", cache=cache)
+    entries = data.get('rankings') if isinstance(data, dict) else data
+    rankings = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or entry.get('priority') not in ('A', 'B', 'C'):
+            continue
+        try:
+            lead_id = int(entry.get('id'))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= lead_id < len(leads) and lead_id not in rankings:
+            rankings[lead_id] = entry
+    return rankings
+
+def rank_leads(leads, vertical_context="", cache=None):
+    """
+    Priority data for each lead, in order (None where Nova gave nothing).
+    One batched Nova call covers all leads; leads it missed are ranked one by one.
+    """
+    if len(leads) == 1:
+        return [rank_lead_priority(leads[0], vertical_context, cache=cache)]
+    rankings = rank_leads_batch(leads, vertical_context, cache=cache)
+    if len(rankings) < len(leads):
+        print(f"      > 💠 Nova: {len(leads) - len(rankings)} of {len(leads)} leads missing from batch, ranking singly...")
+    return [rankings[i] if i in rankings else rank_lead_priority(lead, vertical_context, cache=cache)
+            for i, lead in enumerate(leads)]
+
+def generate_email_draft(lead, pain_point="", cache=None):
     """Use Sparkle to generate email draft."""
     persona = load_specialist("Sparkle")
     
@@ -141,7 +207,7 @@ def generate_email_draft(lead, pain_point=""):
     [/TASK]
     """
     
-    return generate_with_ollama(persona, prompt)
+    return generate_with_ollama(persona, prompt, cache=cache)
 
 def extract_domain(url):
     """Extract domain from URL."""
@@ -152,8 +218,61 @@ def extract_domain(url):
     except:
         return url
 
-def process_hunt_file(filepath):
-    """Process a single qualified leads JSON file."""
+def process_leads(batch, vertical, llm_cache=None):
+    """
+    Enrich, rank (one Nova call for the whole batch) and, for A-tier, draft an
+    email for each lead, in place. Safe to run concurrently on separate batches.
+    """
+    # 1. Contact Enricher (stub)
+    for lead in batch:
+        domain = extract_domain(lead.get('href', ''))
+        if domain:
+            print(f"      > 📞 Contact Enricher: {domain}")
+            contact = enrich_contact(domain)
+            lead['contact'] = contact
+    
+    # 2. Nova Priority Ranking
+    print(f"      > 💠 Nova: Ranking priority ({len(batch)} leads)...")
+    for lead, priority_data in zip(batch, rank_leads(batch, vertical, cache=llm_cache)):
+        if priority_data:
+            lead['priority'] = priority_data.get('priority', 'B')
+            lead['priority_reason'] = priority_data.get('reason', '')
+            lead['urgency'] = priority_data.get('urgency_score', 5)
+        else:
+            lead['priority'] = 'B'
+            lead['priority_reason'] = 'Default ranking'
+            lead['urgency'] = 5
+    
+    # 3. Sparkle email draft for A-tier
+    for lead in batch:
+        if lead['priority'] == 'A':
+            print(f"      > ✨ Sparkle: Drafting email...")
+            email_data = generate_email_draft(lead, lead.get('nova_reason', ''), cache=llm_cache)
+            if email_data:
+                lead['email_draft'] = email_data
+
+    # 4. BOLT-ON ENGINEER ACTIVATION (DISABLED - Phase 12)
+    # Legacy stub disabled. Use --build-agent mode instead.
+    # if 'vertical' in lead or 'why_fit' in lead:
+    #     print(f"      > 🔩 Bolt-On Engineer: Assembling Agent...")
+    #     ... (code removed for deterministic baseline)
+    pass  # Placeholder for future bolt-on activation via explicit flag
+    return batch
+
+def default_workers():
+    """
+    Batches in flight at once: twice the Ollama slots, so contact enrichment for
+    the next batches overlaps the model calls. The gateway's per-provider limit
+    still caps what reaches the model server.
+    """
+    return 2 * get_gateway().concurrency.get("ollama", 1)
+
+def process_hunt_file(filepath, llm_cache=None, workers=None, batch_size=NOVA_BATCH_SIZE):
+    """
+    Process a single qualified leads JSON file. llm_cache: optional LLMCache for Nova/Sparkle calls.
+    workers: batches processed concurrently (default: default_workers(); 1 = one at a time).
+    batch_size: leads per Nova ranking call (1 = one call per lead).
+    """
     print(f"\n{'='*60}")
     print(f"🏭 FACTORY ORCHESTRATOR")
     print(f"   Processing: {Path(filepath).name}")
@@ -180,34 +299,23 @@ def process_hunt_file(filepath):
     c_tier = []
     total_mrr = 0
     
-    # Process each lead using tqdm HUD
-    # for i, lead in enumerate(leads):
-    #     print(f"\n   [{i+1}/{total_leads}] {lead.get('title', 'Unknown')[:40]}...")
-
-    pbar = tqdm(leads, desc="Processing Leads", unit="lead")
-    for lead in pbar:
-        current_target = lead.get('company_name', lead.get('title', 'Unknown'))
-        pbar.set_description(f"Processing: {current_target[:30]}")
-        
-        # 1. Contact Enricher (stub)
-        domain = extract_domain(lead.get('href', ''))
-        if domain:
-            print(f"      > 📞 Contact Enricher: {domain}")
-            contact = enrich_contact(domain)
-            lead['contact'] = contact
-        
-        # 2. Nova Priority Ranking
-        print(f"      > 💠 Nova: Ranking priority...")
-        priority_data = rank_lead_priority(lead, vertical)
-        if priority_data:
-            lead['priority'] = priority_data.get('priority', 'B')
-            lead['priority_reason'] = priority_data.get('reason', '')
-            lead['urgency'] = priority_data.get('urgency_score', 5)
-        else:
-            lead['priority'] = 'B'
-            lead['priority_reason'] = 'Default ranking'
-            lead['urgency'] = 5
-        
+    # Process batches of leads on a worker pool; the tqdm HUD advances as each batch
+    # finishes (leads are updated in place, so `leads` keeps its original order)
+    batch_size = max(1, batch_size)
+    batches = [leads[i:i + batch_size] for i in range(0, total_leads, batch_size)]
+    workers = max(1, min(workers or default_workers(), len(batches)))
+    pbar = tqdm(total=total_leads, desc="Processing Leads", unit="lead")
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hunt") as pool:
+        futures = {pool.submit(process_leads, batch, vertical, llm_cache): batch for batch in batches}
+        for future in as_completed(futures):
+            future.result()
+            last = futures[future][-1]
+            current_target = last.get('company_name', last.get('title', 'Unknown'))
+            pbar.set_description(f"Processed: {current_target[:30]}")
+            pbar.update(len(futures[future]))
+    pbar.close()
+    
+    for lead in leads:
         # Sort into tiers
         if lead['priority'] == 'A':
             a_tier.append(lead)
@@ -216,19 +324,6 @@ def process_hunt_file(filepath):
         else:
             c_tier.append(lead)
         
-        if lead['priority'] == 'A':
-            print(f"      > ✨ Sparkle: Drafting email...")
-            email_data = generate_email_draft(lead, lead.get('nova_reason', ''))
-            if email_data:
-                lead['email_draft'] = email_data
-
-        # 4. BOLT-ON ENGINEER ACTIVATION (DISABLED - Phase 12)
-        # Legacy stub disabled. Use --build-agent mode instead.
-        # if 'vertical' in lead or 'why_fit' in lead:
-        #     print(f"      > 🔩 Bolt-On Engineer: Assembling Agent...")
-        #     ... (code removed for deterministic baseline)
-        pass  # Placeholder for future bolt-on activation via explicit flag
-        
         # Estimate MRR
         score = lead.get('nova_score', 5)
         if score >= 8:
@@ -237,9 +332,6 @@ def process_hunt_file(filepath):
             total_mrr += 1000
         else:
             total_mrr += 500
-        
-        # Small delay to not overwhelm Ollama
-        time.sleep(0.5)
     
     # Generate Report
     print(f"\n   📝 Generating report...")
@@ -284,7 +376,7 @@ def process_hunt_file(filepath):
         print(f"   ⚠️ Email error: {e}")
     
     # Mark as processed
-    mark_as_processed(filepath)
+    mark_as_processed(filepath, report_path)
     
     return report_path
 
@@ -372,11 +464,22 @@ The complete lead data is available in:
     return report
 
 def find_unprocessed_files():
-    """Find all qualified JSON files that haven't been processed."""
-    processed = get_processed_files()
-    pattern = str(LEADS_DIR / "*_qualified.json")
-    all_files = glob.glob(pattern)
-    return [f for f in all_files if f not in processed]
+    """Find all qualified JSON files whose contents haven't been processed."""
+    queue = open_hunt_queue()
+    pattern = str(LEADS_DIR / HUNT_PATTERN)
+    return [f for f in sorted(glob.glob(pattern)) if not queue.is_processed(f)]
+
+def watch_hunt_files(llm_cache=None, workers=None, batch_size=NOVA_BATCH_SIZE, jobs=1, poll_interval=POLL_INTERVAL):
+    """
+    Process hunt files as they land in LEADS_DIR, `jobs` files at a time, until Ctrl+C.
+    Files are queued in the persistent hunt queue, so a restart resumes where it stopped.
+    """
+    watcher = HuntWatcher(
+        open_hunt_queue(),
+        lambda path: process_hunt_file(path, llm_cache=llm_cache, workers=workers, batch_size=batch_size),
+        directory=LEADS_DIR, workers=jobs, poll_interval=poll_interval)
+    print(f"👀 Watching {LEADS_DIR} for {HUNT_PATTERN} (Ctrl+C to stop)")
+    watcher.run_forever()
 
 # =============================================================================
 # PHASE 12: BUILD-AGENT MODE (Deterministic Agent Generation)
@@ -397,101 +500,45 @@ def compute_file_hash(filepath):
             sha256.update(chunk)
     return sha256.hexdigest()
 
-def generate_system_prompt_from_dossier(dossier):
-    """Generate a deterministic system prompt from dossier fields."""
+def dossier_context(dossier, client_slug=None):
+    """Template values for the build-agent artifacts (templates/agent_build/)."""
     cp = dossier['client_profile']
     ta = dossier['target_audience']
     vp = dossier['value_proposition']
     offer = dossier['offer']
-    
-    pain_points_str = "\n".join(f"  - {p}" for p in ta['pain_points'])
-    
-    prompt = f"""# {cp['name']} - AI Sales Development Representative
-
-## Identity
-You are a professional AI SDR for {cp['name']}, specializing in {cp['industry']}.
-Your region focus is: {cp['region']}.
-
-## Target Audience
-- **Role**: {ta['role']}
-- **Sector**: {ta['sector']}
-- **Key Pain Points**:
-{pain_points_str}
-
-## Value Proposition
-**Core Benefit**: {vp['core_benefit']}
-**Proof Point**: {vp['metric_proof']}
-**Integration**: {vp['software_integration']}
-
-## Offer
-**Type**: {offer['type']}
-**Details**: {offer['details']}
-
-## Behavioral Guidelines
-1. Be conversational, professional, and concise.
-2. Lead with pain points relevant to the prospect's role.
-3. Ask qualifying questions before pitching.
-4. Always end with a clear call-to-action related to the offer.
-5. Never make up information not provided in this prompt.
-
-## Guardrails
-- Do not discuss competitors negatively.
-- Do not make promises beyond the stated offer.
-- If asked about pricing, defer to the human team.
-- If the prospect is not a fit, politely disengage.
-"""
-    return prompt
+    return {
+        "CLIENT_NAME": cp['name'],
+        "CLIENT_SLUG": client_slug or compute_client_slug(cp['name']),
+        "INDUSTRY": cp['industry'],
+        "REGION": cp['region'],
+        "URL": cp['url'],
+        "ROLE": ta['role'],
+        "SECTOR": ta['sector'],
+        "PAIN_POINTS_BULLETS": "\n".join(f"  - {p}" for p in ta['pain_points']),
+        "PAIN_POINTS_NUMBERED": "".join(f"{i}. {p}\n" for i, p in enumerate(ta['pain_points'], 1)),
+        "CORE_BENEFIT": vp['core_benefit'],
+        "CORE_BENEFIT_LOWER": vp['core_benefit'].lower(),
+        "METRIC_PROOF": vp['metric_proof'],
+        "SOFTWARE_INTEGRATION": vp['software_integration'],
+        "OFFER_TYPE": offer['type'],
+        "OFFER_TYPE_LOWER": offer['type'].lower(),
+        "OFFER_DETAILS": offer['details'],
+    }
+
+def generate_system_prompt_from_dossier(dossier):
+    """Generate a deterministic system prompt from dossier fields."""
+    return load_template("system_prompt.txt").render(dossier_context(dossier))
 
 def generate_kb_seed_from_dossier(dossier):
     """Generate a deterministic knowledge base seed from dossier fields."""
-    cp = dossier['client_profile']
-    ta = dossier['target_audience']
-    vp = dossier['value_proposition']
-    
-    kb = f"""# Knowledge Base: {cp['name']}
-
-## Company Overview
-- **Name**: {cp['name']}
-- **Industry**: {cp['industry']}
-- **Region**: {cp['region']}
-- **Website**: {cp['url']}
-
-## Target Audience Profile
-- **Decision Maker Role**: {ta['role']}
-- **Target Sector**: {ta['sector']}
-
-## Common Pain Points
-"""
-    for i, pain in enumerate(ta['pain_points'], 1):
-        kb += f"{i}. {pain}\n"
-    
-    kb += f"""
-## Our Solution
-**Core Benefit**: {vp['core_benefit']}
-
-**Proof of Value**: {vp['metric_proof']}
-
-**Technology Integration**: Works with {vp['software_integration']}
-
-## Frequently Asked Questions
-Q: What makes {cp['name']} different?
-A: We focus on {vp['core_benefit'].lower()}, with proven results: {vp['metric_proof']}.
-
-Q: How do we get started?
-A: We offer a {dossier['offer']['type'].lower()} - {dossier['offer']['details']}.
-"""
-    return kb
+    return load_template("kb_seed.md").render(dossier_context(dossier))
 
 def load_acip_preamble():
-    """Load ACIP security preamble from vendored file."""
-    acip_path = Path(__file__).parent.parent / "security" / "acip" / "ACIP_v1_full.md"
-    if acip_path.exists():
-        with open(acip_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    return ""
+    """Load ACIP security preamble from vendored file (cached per process)."""
+    return acip_preamble()
 
 
-def build_agent_from_dossier(dossier_path, enable_acip=False):
+def build_agent_from_dossier(dossier_path, enable_acip=False, agents_root=None):
     """
     Phase 12: Build agent artifacts from a validated dossier.
     Returns True on success, False on failure.
@@ -499,6 +546,7 @@ def build_agent_from_dossier(dossier_path, enable_acip=False):
     Args:
         dossier_path: Path to the dossier JSON file
         enable_acip: If True, generate ACIP-hardened system prompt
+        agents_root: Output root (default: AGENTS_DIR)
     """
     from schema_validator import validate_dossier
     
@@ -517,9 +565,10 @@ def build_agent_from_dossier(dossier_path, enable_acip=False):
         return False
     print("   ✅ Dossier is valid.")
     
-    # 2. Load Dossier
-    with open(dossier_path, 'r', encoding='utf-8') as f:
-        dossier = json.load(f)
+    # 2. Load Dossier (one read: parse and hash the same bytes)
+    raw = Path(dossier_path).read_bytes()
+    dossier = json.loads(raw)
+    dossier_hash = hashlib.sha256(raw).hexdigest()
     
     # 3. Compute client slug
     client_name = dossier['client_profile']['name']
@@ -527,78 +576,44 @@ def build_agent_from_dossier(dossier_path, enable_acip=False):
     print(f"   📛 Client Slug: {client_slug}")
     
     # 4. Create output directory
-    agents_root = Path(__file__).parent.parent / "agents"
-    output_dir = agents_root / client_slug
+    output_dir = Path(agents_root or AGENTS_DIR) / client_slug
     output_dir.mkdir(parents=True, exist_ok=True)
     tavus_dir = output_dir / "tavus_pack"
     tavus_dir.mkdir(parents=True, exist_ok=True)
     print(f"   📁 Output: {output_dir}")
     
     # 5. Generate Artifacts (Deterministic, No LLM)
+    # Each is streamed from its compiled template and hashed while it is written
     print("\n🔧 Step 2: Generating artifacts...")
+    context = dossier_context(dossier, client_slug)
+    system_prompt = load_template("system_prompt.txt")
+    artifacts = []
+    
+    def write(path, chunks):
+        meta = write_artifact(path, chunks)
+        artifacts.append({"path": str(path.relative_to(output_dir)), **meta})
+        print(f"   ✅ {path.relative_to(output_dir).as_posix()} ({meta['bytes']} bytes)")
+        return meta
     
     # System Prompt
-    system_prompt = generate_system_prompt_from_dossier(dossier)
-    system_prompt_path = output_dir / "system_prompt.txt"
-    with open(system_prompt_path, 'w', encoding='utf-8') as f:
-        f.write(system_prompt)
-    print(f"   ✅ system_prompt.txt ({len(system_prompt)} bytes)")
+    write(output_dir / "system_prompt.txt", system_prompt.chunks(context))
     
-    # ACIP-hardened system prompt (Phase 17)
+    # ACIP-hardened system prompt (Phase 17; not listed in the manifest)
     if enable_acip:
-        acip_preamble = load_acip_preamble()
-        acip_prompt = acip_preamble + "\n\n---\n\n" + system_prompt
         acip_prompt_path = output_dir / "system_prompt_with_acip.txt"
-        with open(acip_prompt_path, 'w', encoding='utf-8') as f:
-            f.write(acip_prompt)
-        print(f"   ✅ system_prompt_with_acip.txt ({len(acip_prompt)} bytes)")
+        meta = write_artifact(acip_prompt_path, chain([load_acip_preamble(), "\n\n---\n\n"],
+                                                      system_prompt.chunks(context)))
+        print(f"   ✅ system_prompt_with_acip.txt ({meta['bytes']} bytes)")
     
     # KB Seed
-    kb_seed = generate_kb_seed_from_dossier(dossier)
-    kb_seed_path = output_dir / "kb_seed.md"
-    with open(kb_seed_path, 'w', encoding='utf-8') as f:
-        f.write(kb_seed)
-    print(f"   ✅ kb_seed.md ({len(kb_seed)} bytes)")
+    write(output_dir / "kb_seed.md", load_template("kb_seed.md").chunks(context))
     
     # Tavus Pack (Placeholder README)
-    tavus_readme = f"""# Tavus Deployment Pack: {client_name}
-
-## Contents
-This folder contains assets for deploying the agent to Tavus.
-
-## Required Files (To Be Added)
-- persona_video.mp4 (or link to Tavus replica)
-- voice_config.json (ElevenLabs voice ID)
-- branding_assets/ (logo, colors)
-
-## Deployment Command
-```
-python tools/deploy_agent.py --agent {client_slug}
-```
-
-Generated by X Agent Factory - Phase 12
-"""
-    tavus_readme_path = tavus_dir / "README.md"
-    with open(tavus_readme_path, 'w', encoding='utf-8') as f:
-        f.write(tavus_readme)
-    print(f"   ✅ tavus_pack/README.md")
+    write(tavus_dir / "README.md", load_template("tavus_readme.md").chunks(context))
     
     # 6. Build Manifest
     print("\n📜 Step 3: Generating manifest...")
     
-    # Compute input dossier hash
-    dossier_hash = compute_file_hash(dossier_path)
-    
-    # Collect artifact info
-    artifacts = []
-    for artifact_path in [system_prompt_path, kb_seed_path, tavus_readme_path]:
-        rel_path = artifact_path.relative_to(output_dir)
-        artifacts.append({
-            "path": str(rel_path),
-            "sha256": compute_file_hash(artifact_path),
-            "bytes": artifact_path.stat().st_size
-        })
-    
     manifest = {
         "schema_version": dossier.get("schema_version", "1.0"),
         "client_slug": client_slug,
@@ -624,16 +639,145 @@ Generated by X Agent Factory - Phase 12
     return True
 
 
+# =============================================================================
+# BATCH BUILD-AGENT MODE (many dossiers, one process per core)
+# =============================================================================
+
+def find_dossiers(target):
+    """Dossier paths for a glob, a single file, or a directory (*.json and */dossier.json)."""
+    path = Path(target)
+    if path.is_dir():
+        return sorted(set(path.glob("*.json")) | set(path.glob("*/dossier.json")))
+    if path.is_file():
+        return [path]
+    return sorted(Path(p) for p in glob.glob(str(target), recursive=True))
+
+def current_agent_slug(dossier_path, agents_root=None, enable_acip=False):
+    """
+    The agent slug if agents/<slug>/manifest.json was built from this exact
+    dossier (input_dossier_sha256 matches and every artifact is present), else None.
+    """
+    try:
+        with open(dossier_path, 'r', encoding='utf-8') as f:
+            client_slug = compute_client_slug(json.load(f)['client_profile']['name'])
+        output_dir = Path(agents_root or AGENTS_DIR) / client_slug
+        with open(output_dir / "manifest.json", 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+    if manifest.get("input_dossier_sha256") != compute_file_hash(dossier_path):
+        return None
+    expected = [a.get("path", "") for a in manifest.get("artifacts", [])]
+    if enable_acip:
+        expected.append("system_prompt_with_acip.txt")
+    if not all((output_dir / rel).is_file() for rel in expected):
+        return None
+    return client_slug
+
+def build_agent_job(dossier_path, enable_acip=False, agents_root=None, force=False):
+    """
+    One --build-agents job (runs in a worker process). Skips up-to-date agents;
+    the build's console output is kept only when it fails.
+    """
+    import io
+    from contextlib import redirect_stdout
+    
+    start = time.perf_counter()
+    result = {"dossier": str(dossier_path), "slug": None, "status": "skipped", "seconds": 0.0, "error": None}
+    if not force:
+        result["slug"] = current_agent_slug(dossier_path, agents_root, enable_acip)
+    if result["slug"] is None:
+        log = io.StringIO()
+        try:
+            with redirect_stdout(log):
+                ok = build_agent_from_dossier(dossier_path, enable_acip=enable_acip, agents_root=agents_root)
+        except Exception as e:
+            ok, log = False, io.StringIO(f"{log.getvalue()}{type(e).__name__}: {e}")
+        result["status"] = "built" if ok else "failed"
+        if ok:
+            result["slug"] = current_agent_slug(dossier_path, agents_root, enable_acip)
+        else:
+            result["error"] = log.getvalue().strip().splitlines()[-1] if log.getvalue().strip() else "build failed"
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+def build_agents(target, enable_acip=False, jobs=None, force=False, agents_root=None):
+    """
+    Build every dossier matched by `target` in a process pool (jobs: default
+    one per core), skipping agents whose manifest already matches the dossier.
+    Writes <agents_root>/build_summary.json and returns the summary.
+    """
+    dossiers = find_dossiers(target)
+    agents_root = Path(agents_root or AGENTS_DIR)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(dossiers) or 1))
+    
+    print(f"\n{'='*60}")
+    print(f"🏭 FACTORY ORCHESTRATOR - BATCH BUILD MODE")
+    print(f"   Dossiers: {len(dossiers)} ({target})")
+    print(f"   Workers: {jobs}")
+    print(f"{'='*60}\n")
+    
+    start = time.perf_counter()
+    if jobs == 1:
+        results = [build_agent_job(d, enable_acip, agents_root, force)
+                   for d in tqdm(dossiers, desc="Building Agents", unit="agent")]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(build_agent_job, d, enable_acip, agents_root, force) for d in dossiers]
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Building Agents", unit="agent"):
+                future.result()
+            results = [future.result() for future in futures]
+    
+    counts = {status: sum(1 for r in results if r["status"] == status) for status in ("built", "skipped", "failed")}
+    summary = {
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "target": str(target),
+        "acip_enabled": enable_acip,
+        "workers": jobs,
+        "seconds": round(time.perf_counter() - start, 3),
+        "dossiers": len(results),
+        **counts,
+        "results": results
+    }
+    agents_root.mkdir(parents=True, exist_ok=True)
+    with open(agents_root / BUILD_SUMMARY, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    
+    for r in results:
+        if r["status"] == "failed":
+            print(f"   ❌ {Path(r['dossier']).parent.name}/{Path(r['dossier']).name}: {r['error']}")
+    print(f"\n{'='*60}")
+    print(f"✅ BATCH BUILD COMPLETE")
+    print(f"   Built: {counts['built']} | Skipped (up to date): {counts['skipped']} | Failed: {counts['failed']}")
+    print(f"   Summary: {agents_root / BUILD_SUMMARY}")
+    print(f"{'='*60}\n")
+    return summary
+
+
 def main():
     load_env()
     
     parser = argparse.ArgumentParser(description="Factory Orchestrator")
     parser.add_argument("--file", help="Process a specific hunt file")
-    parser.add_argument("--watch", action="store_true", help="Watch mode (future)")
+    parser.add_argument("--watch", action="store_true", help="Watch for new hunt files and process them as they land")
+    parser.add_argument("--watch-jobs", dest="watch_jobs", type=int, default=1,
+                        help="Hunt files processed at once in watch mode (default: 1)")
+    parser.add_argument("--poll-interval", dest="poll_interval", type=float, default=POLL_INTERVAL,
+                        help=f"Seconds between directory scans when watchdog is not installed (default: {POLL_INTERVAL:g})")
     parser.add_argument("--reprocess", action="store_true", help="Reprocess all hunt files")
     parser.add_argument("--build-agent", dest="build_agent", metavar="DOSSIER", help="Build agent from dossier JSON (Phase 12)")
+    parser.add_argument("--build-agents", dest="build_agents", metavar="GLOB_OR_DIR",
+                        help="Build many dossiers in parallel, skipping agents already built from them")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes for --build-agents (default: one per core)")
+    parser.add_argument("--force", action="store_true", help="With --build-agents, rebuild up-to-date agents too")
     parser.add_argument("--acip", action="store_true", help="Enable ACIP prompt-injection hardening (Phase 17)")
     parser.add_argument("--no-log", action="store_true", help="Disable run logging")
+    parser.add_argument("--no-llm-cache", action="store_true", help="Always call the LLM (skip the response cache)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Lead batches processed concurrently (default: 2x the Ollama concurrency limit; 1 = sequential)")
+    parser.add_argument("--nova-batch", dest="nova_batch", type=int, default=NOVA_BATCH_SIZE,
+                        help=f"Leads ranked per Nova call (default: {NOVA_BATCH_SIZE}; 1 = one call per lead)")
     args = parser.parse_args()
     
     # --- BUILD-AGENT MODE (Phase 12) ---
@@ -649,21 +793,36 @@ def main():
                 run.set_output("acip_enabled", args.acip)
         sys.exit(0 if success else 1)
     
+    if args.build_agents:
+        if args.no_log:
+            summary = build_agents(args.build_agents, enable_acip=args.acip, jobs=args.jobs, force=args.force)
+        else:
+            from run_logger import RunLogger
+            with RunLogger("factory_orchestrator", {"mode": "build-agents", "target": args.build_agents, "acip": args.acip}) as run:
+                summary = build_agents(args.build_agents, enable_acip=args.acip, jobs=args.jobs, force=args.force)
+                for key in ("dossiers", "built", "skipped", "failed"):
+                    run.set_output(key, summary[key])
+        sys.exit(0 if summary["failed"] == 0 else 1)
+    
     if args.reprocess:
-        # Clear processed log
-        if PROCESSED_LOG.exists():
-            PROCESSED_LOG.unlink()
-        print("🔄 Cleared processed log. Will reprocess all files.")
+        # Forget processed state
+        open_hunt_queue().reset()
+        print("🔄 Cleared processed state. Will reprocess all files.")
+    
+    # Re-processed leads send Nova/Sparkle the same prompts; answer those from the cache
+    from llm_cache import get_llm_cache
+    llm_cache = None if args.no_llm_cache else get_llm_cache()
     
     if args.file:
         # Process specific file
         if os.path.exists(args.file):
-            process_hunt_file(args.file)
+            process_hunt_file(args.file, llm_cache=llm_cache, workers=args.workers,
+                              batch_size=args.nova_batch)
         else:
             print(f"❌ File not found: {args.file}")
     elif args.watch:
-        # Watch mode (future implementation)
-        print("👀 Watch mode not yet implemented. Use manual mode for now.")
+        watch_hunt_files(llm_cache=llm_cache, workers=args.workers, batch_size=args.nova_batch,
+                         jobs=args.watch_jobs, poll_interval=args.poll_interval)
     else:
         # Process all unprocessed files
         unprocessed = find_unprocessed_files()
@@ -678,7 +837,8 @@ def main():
             print(f"   - {Path(f).name}")
         
         for filepath in unprocessed:
-            process_hunt_file(filepath)
+            process_hunt_file(filepath, llm_cache=llm_cache, workers=args.workers,
+                              batch_size=args.nova_batch)
         
         print(f"\n{'='*60}")
         print(f"✅ FACTORY ORCHESTRATOR COMPLETE")
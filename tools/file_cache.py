@@ -0,0 +1,180 @@
+"""
+File Cache - Shared scout response cache (Growth Department)
+Sharded, TTL-managed JSON file cache used by X Scout and GBP Scout.
+
+- Hashed subdirectory sharding (ab/cd/<prefix>_<md5>.json) keeps directories small
+- Atomic writes (temp file + os.replace), so readers never see partial JSON
+- Compact JSON encoding
+- Expired-entry sweeper (opportunistic on startup, or via CLI)
+- Hit/miss counters (scouts append them to GrowthDB's scout telemetry)
+
+Usage:
+    python tools/file_cache.py --sweep                 # sweep growth/cache
+    python tools/file_cache.py --sweep --dir growth/cache/gbp --prefix gbp --ttl-hours 24
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_ROOT = Path(__file__).parent.parent / "growth" / "cache"
+SWEEP_MARKER = ".last_sweep"
+SWEEP_INTERVAL_HOURS = 6
+
+
+def _is_shard_name(name: str) -> bool:
+    return len(name) == 2 and all(c in "0123456789abcdef" for c in name)
+
+
+class FileCache:
+    """TTL-managed JSON cache with hashed shard directories."""
+
+    def __init__(self, root: Path, prefix: str, ttl_hours: float = 24, shard_depth: int = 2):
+        self.root = Path(root)
+        self.prefix = prefix
+        self.ttl_seconds = ttl_hours * 3600
+        self.shard_depth = shard_depth
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "errors": 0}
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ========================================
+    # PATHS
+    # ========================================
+
+    def path_for(self, key: str) -> Path:
+        digest = hashlib.md5(key.encode()).hexdigest()
+        shards = [digest[i * 2:i * 2 + 2] for i in range(self.shard_depth)]
+        return self.root.joinpath(*shards, f"{self.prefix}_{digest}.json")
+
+    def _is_fresh(self, path: Path, now: Optional[float] = None) -> Optional[bool]:
+        """True if fresh, False if expired, None if missing."""
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        return (now or time.time()) - mtime < self.ttl_seconds
+
+    # ========================================
+    # READ / WRITE
+    # ========================================
+
+    def load(self, path: Path) -> Optional[Any]:
+        fresh = self._is_fresh(path)
+        if not fresh:
+            self.stats["expired" if fresh is False else "misses"] += 1
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self.stats["errors"] += 1
+            return None
+        self.stats["hits"] += 1
+        return value
+
+    def save(self, path: Path, value: Any):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f, separators=(",", ":"), ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self.stats["writes"] += 1
+        except Exception:
+            self.stats["errors"] += 1
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.load(self.path_for(key))
+
+    def set(self, key: str, value: Any):
+        self.save(self.path_for(key), value)
+
+    # ========================================
+    # SWEEPER
+    # ========================================
+
+    def sweep(self) -> int:
+        """Delete expired entries (sharded and legacy flat files) and stale temp files."""
+        now = time.time()
+        removed = 0
+        patterns = [f"{self.prefix}_*.json", f".{self.prefix}_*.tmp"]
+        for pattern in patterns:
+            for path in self.root.rglob(pattern):
+                if self._is_fresh(path, now) is False:
+                    try:
+                        path.unlink()
+                        removed += 1
+                    except OSError:
+                        pass
+        # Drop empty shard directories (never the cache root or sibling caches)
+        for directory in sorted((p for p in self.root.rglob("*") if p.is_dir()), reverse=True):
+            parts = directory.relative_to(self.root).parts
+            if len(parts) <= self.shard_depth and all(_is_shard_name(p) for p in parts):
+                try:
+                    directory.rmdir()
+                except OSError:
+                    pass
+        (self.root / f"{SWEEP_MARKER}_{self.prefix}").touch()
+        if removed:
+            logger.info(f"Cache sweep ({self.prefix}): removed {removed} expired entries")
+        return removed
+
+    def sweep_if_due(self, interval_hours: float = SWEEP_INTERVAL_HOURS) -> int:
+        """Sweep at most once per interval (tracked by a marker file)."""
+        marker = self.root / f"{SWEEP_MARKER}_{self.prefix}"
+        fresh_for = interval_hours * 3600
+        try:
+            if time.time() - marker.stat().st_mtime < fresh_for:
+                return 0
+        except FileNotFoundError:
+            pass
+        return self.sweep()
+
+    # ========================================
+    # STATS
+    # ========================================
+
+    def hit_ratio(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["expired"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep expired scout cache entries")
+    parser.add_argument("--sweep", action="store_true", help="Delete expired entries")
+    parser.add_argument("--dir", type=Path, help="Cache directory (default: all scout caches)")
+    parser.add_argument("--prefix", default="x_search", help="Entry prefix (x_search, gbp)")
+    parser.add_argument("--ttl-hours", type=float, default=24)
+    args = parser.parse_args()
+
+    if not args.sweep:
+        parser.print_help()
+        return
+
+    if args.dir:
+        caches = [FileCache(args.dir, args.prefix, args.ttl_hours)]
+    else:
+        caches = [
+            FileCache(DEFAULT_CACHE_ROOT, "x_search", args.ttl_hours),
+            FileCache(DEFAULT_CACHE_ROOT / "gbp", "gbp", args.ttl_hours),
+        ]
+    for cache in caches:
+        removed = cache.sweep()
+        print(f"{cache.root} ({cache.prefix}): removed {removed} expired entries")
+
+
+if __name__ == "__main__":
+    main()
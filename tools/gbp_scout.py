@@ -17,32 +17,23 @@ import logging
 import time
 import random
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import quote_plus, urlparse
 import csv
 
-import requests
-import yaml
+from file_cache import FileCache
+from growth_config import get_config
+from growth_db import GrowthDB
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # Paths
-CONFIG_PATH = Path(__file__).parent.parent / "growth" / "config.yaml"
 CACHE_DIR = Path(__file__).parent.parent / "growth" / "cache" / "gbp"
 MANUAL_IMPORT_DIR = Path(__file__).parent.parent / "growth" / "manual_import"
-BUDGET_FILE = CACHE_DIR / "weekly_budget.json"
-
-
-def load_config() -> dict:
-    if CONFIG_PATH.exists():
-        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    return {}
-
-
-CONFIG = load_config()
+BUDGET_FILE = CACHE_DIR / "weekly_budget.json"  # Legacy tracker, seeded into GrowthDB once
+BUDGET_SOURCE = "GBP"
 
 
 class GBPScout:
@@ -51,17 +42,21 @@ class GBPScout:
     Searches Google Maps and extracts business data.
     """
     
-    def __init__(self):
+    def __init__(self, db: Optional[GrowthDB] = None):
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
         MANUAL_IMPORT_DIR.mkdir(parents=True, exist_ok=True)
         
-        self.config = CONFIG.get("sources", {}).get("google_business", {})
+        self.config = get_config().get("sources", {}).get("google_business", {})
         self.enabled = self.config.get("enabled", False)
         self.weekly_budget = self.config.get("weekly_budget", 5)
         self.max_per_query = self.config.get("max_per_query", 10)
         self.cache_ttl = self.config.get("cache_ttl_hours", 24)
         self.rate_limit = self.config.get("rate_limit_seconds", 3)
+        self.cache = FileCache(CACHE_DIR, "gbp", self.cache_ttl)
+        self._db = db
+        self._legacy_budget_seeded = False
         
+        import requests
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -78,75 +73,67 @@ class GBPScout:
         now = datetime.now()
         return f"{now.year}-W{now.isocalendar()[1]:02d}"
     
-    def _load_budget(self) -> Dict:
-        """Load weekly budget tracker."""
-        if BUDGET_FILE.exists():
-            try:
-                with open(BUDGET_FILE, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
-        return {"week": self._get_week_key(), "used": 0, "queries": []}
+    @property
+    def db(self) -> GrowthDB:
+        if self._db is None:
+            self._db = GrowthDB()
+        return self._db
     
-    def _save_budget(self, budget: Dict):
-        """Save weekly budget tracker."""
+    def _seed_legacy_budget(self, week_key: str):
+        """Carry this week's usage over from weekly_budget.json (pre-GrowthDB tracker)."""
+        if self._legacy_budget_seeded:
+            return
+        self._legacy_budget_seeded = True
+        if not BUDGET_FILE.exists():
+            return
         try:
-            with open(BUDGET_FILE, 'w') as f:
-                json.dump(budget, f, indent=2)
+            with open(BUDGET_FILE, 'r') as f:
+                legacy = json.load(f)
+            if legacy.get("week") == week_key:
+                self.db.seed_budget(BUDGET_SOURCE, week_key, int(legacy.get("used", 0)))
         except Exception as e:
-            logger.warning(f"Budget save failed: {e}")
+            logger.warning(f"Legacy budget import failed: {e}")
     
     def _check_budget(self) -> Tuple[bool, int]:
         """Check if we have budget remaining. Returns (has_budget, remaining)."""
-        budget = self._load_budget()
         week_key = self._get_week_key()
-        
-        # Reset if new week
-        if budget.get("week") != week_key:
-            budget = {"week": week_key, "used": 0, "queries": []}
-            self._save_budget(budget)
-        
-        remaining = self.weekly_budget - budget.get("used", 0)
+        self._seed_legacy_budget(week_key)
+        remaining = self.weekly_budget - self.db.get_budget_used(BUDGET_SOURCE, week_key)
         return remaining > 0, remaining
     
-    def _consume_budget(self, query: str):
-        """Consume one query from budget."""
-        budget = self._load_budget()
-        budget["used"] = budget.get("used", 0) + 1
-        budget["queries"].append({
-            "query": query,
-            "timestamp": datetime.now().isoformat()
-        })
-        self._save_budget(budget)
+    def _consume_budget(self) -> bool:
+        """Atomically reserve one query from this week's budget."""
+        week_key = self._get_week_key()
+        self._seed_legacy_budget(week_key)
+        granted, _ = self.db.consume_budget(BUDGET_SOURCE, week_key, self.weekly_budget)
+        return granted
+    
+    def _release_budget(self):
+        """Give back a reserved query that returned nothing."""
+        self.db.release_budget(BUDGET_SOURCE, self._get_week_key())
+    
+    def _log_query(self, query: str, result_count: int, status: str):
+        try:
+            self.db.log_scout_query(BUDGET_SOURCE, query, status, result_count, "maps_search")
+        except Exception as e:
+            logger.warning(f"GBP query log write failed: {e}")
     
     # ========================================
     # CACHING
     # ========================================
     
     def _get_cache_path(self, query: str) -> Path:
-        query_hash = hashlib.md5(query.encode()).hexdigest()
-        return CACHE_DIR / f"gbp_{query_hash}.json"
-    
-    def _is_cache_valid(self, cache_path: Path) -> bool:
-        if not cache_path.exists():
-            return False
-        mtime = datetime.fromtimestamp(cache_path.stat().st_mtime)
-        return datetime.now() - mtime < timedelta(hours=self.cache_ttl)
+        return self.cache.path_for(query)
     
     def _load_cache(self, cache_path: Path) -> Optional[List[Dict]]:
-        if self._is_cache_valid(cache_path):
-            try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    logger.debug(f"GBP cache hit: {cache_path.name}")
-                    return json.load(f)
-            except:
-                pass
-        return None
+        cached = self.cache.load(cache_path)
+        if cached is not None:
+            logger.debug(f"GBP cache hit: {cache_path.name}")
+        return cached
     
     def _save_cache(self, cache_path: Path, results: List[Dict]):
         try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2)
+            self.cache.save(cache_path, results)
         except Exception as e:
             logger.warning(f"GBP cache write failed: {e}")
     
@@ -163,14 +150,17 @@ class GBPScout:
         cached = self._load_cache(cache_path)
         if cached is not None:
             logger.info(f"GBP cache hit: {query}")
+            self._log_query(query, len(cached), "cache_hit")
             return cached
         
-        # Check budget
-        has_budget, remaining = self._check_budget()
-        if not has_budget:
+        # Reserve budget up front so concurrent scouts cannot overspend it
+        if not self._consume_budget():
             logger.warning(f"GBP weekly budget exhausted ({self.weekly_budget}/week)")
+            self._log_query(query, 0, "budget_exhausted")
             return []
         
+        results = []
+        
         # Rate limiting
         time.sleep(self.rate_limit + random.uniform(0.5, 1.5))
         
@@ -183,23 +173,32 @@ class GBPScout:
             
             if response.status_code != 200:
                 logger.warning(f"GBP search failed: HTTP {response.status_code}")
+                status = "rate_limited_429" if response.status_code == 429 else f"http_{response.status_code}"
+                self._log_query(query, 0, status)
                 return []
             
             # Parse results
             results = self._parse_maps_html(response.text, query)
             
             if results:
-                self._consume_budget(query)
                 self._save_cache(cache_path, results)
                 logger.info(f"GBP found {len(results)} businesses for: {query}")
+                self._log_query(query, len(results), "success")
             else:
                 logger.info(f"GBP no results for: {query}")
+                self._log_query(query, 0, "no_results")
             
             return results
             
         except Exception as e:
             logger.error(f"GBP search error: {e}")
+            self._log_query(query, 0, f"error_{type(e).__name__}")
             return []
+        
+        finally:
+            # Only queries that produced results count against the budget
+            if not results:
+                self._release_budget()
     
     def _parse_maps_html(self, html: str, query: str) -> List[Dict]:
         """
@@ -475,6 +474,7 @@ class GBPScout:
             return self._hunt_manual_only()
         
         logger.info(f"GBP Scout starting (budget: {remaining}/{self.weekly_budget} remaining)")
+        self.cache.sweep_if_due()
         
         all_results = []
         queries_to_run = []
@@ -505,6 +505,10 @@ class GBPScout:
             all_results.append(normalized)
         
         logger.info(f"GBP Scout found {len(all_results)} total prospects")
+        try:
+            self.db.log_cache_stats(self.cache.prefix, self.cache.stats)
+        except Exception as e:
+            logger.warning(f"GBP cache stats write failed: {e}")
         return all_results
     
     def _hunt_manual_only(self) -> List[Dict]:
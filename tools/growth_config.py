@@ -0,0 +1,266 @@
+"""
+Growth Config - shared loader for growth/config.yaml
+Parsed once per process and validated against CONFIG_SCHEMA; re-parsed only
+when the file's mtime (or size) changes, so long-running scouts pick up edits
+without restarting. Lookup structures the classifiers need are built once
+per parse instead of per instance / per check:
+
+- keyword lists lowercased into tuples (persona markers, ICP lanes, filters, gates)
+- domain_denylist compiled into a reversed-label suffix trie
+
+Usage:
+    from growth_config import get_config
+    config = get_config()
+    config.get("buyer_scoring", {})          # raw YAML mapping
+    config.persona_markers["agency"]         # ("agency", "book a call", ...)
+    config.denylist.match("shop.blogspot.com")  # "blogspot.com"
+"""
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = Path(__file__).parent.parent / "growth" / "config.yaml"
+
+_STRINGS = {"type": "array", "items": {"type": "string"}}
+_STRING_LISTS = {"type": "object", "additionalProperties": _STRINGS}
+_WEIGHTS = {"type": "object", "additionalProperties": {"type": "number"}}
+
+# Shape of the keys the tools read; unknown keys are allowed for forward compatibility
+CONFIG_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "version": {"type": ["string", "number"]},
+        "weekly_target": {"type": "integer", "minimum": 0},
+        "max_queries_per_run": {"type": "integer", "minimum": 0},
+        "industries": _STRINGS,
+        "icp_lanes": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "properties": {
+                    "description": {"type": "string"},
+                    "positive_keywords": _STRINGS,
+                    "negative_keywords": _STRINGS,
+                    "must_have": _STRINGS,
+                    "score_boost": {"type": "number"},
+                },
+            },
+        },
+        "persona_markers": _STRING_LISTS,
+        "domain_denylist": _STRINGS,
+        "context_gates": _STRING_LISTS,
+        "filters": {
+            "type": "object",
+            "properties": {
+                "hard_negatives": _STRINGS,
+                "vendor_patterns": _STRINGS,
+                "operator_keywords": _STRINGS,
+                "business_keywords": _STRINGS,
+                "min_followers_no_website": {"type": "integer", "minimum": 0},
+            },
+        },
+        "moment_scoring": _WEIGHTS,
+        "buyer_scoring": _WEIGHTS,
+        "action_thresholds": _WEIGHTS,
+        "x_scout": {"type": "object"},
+        "sources": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "properties": {"enabled": {"type": "boolean"}},
+            },
+        },
+    },
+}
+
+
+class ConfigError(ValueError):
+    """config.yaml could not be parsed or does not match CONFIG_SCHEMA."""
+
+
+# ========================================
+# DERIVED LOOKUPS
+# ========================================
+
+def keyword_tuple(keywords: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Lowercased, de-duplicated keywords in config order (empty entries dropped)."""
+    return tuple(dict.fromkeys(k.lower() for k in keywords or () if k))
+
+
+class DomainSuffixTrie:
+    """
+    Denylisted domains keyed by reversed labels ("blogspot.com" -> com, blogspot).
+    match() walks a domain's labels from the TLD inward, so a check costs
+    O(labels in the domain) however long the denylist is, and only whole labels
+    match: "shop.blogspot.com" is denylisted by "blogspot.com", "notblogspot.com" is not.
+    """
+
+    _END = ""  # terminal marker; labels are never empty
+
+    def __init__(self, domains: Iterable[str] = ()):
+        self._root: Dict[str, dict] = {}
+        self._size = 0
+        for domain in domains:
+            self.add(domain)
+
+    @staticmethod
+    def _labels(domain: str) -> list:
+        return [label for label in domain.strip().lower().rstrip(".").split(".") if label]
+
+    def add(self, domain: str):
+        labels = self._labels(domain)
+        if not labels:
+            return
+        node = self._root
+        for label in reversed(labels):
+            node = node.setdefault(label, {})
+        if self._END not in node:
+            node[self._END] = ".".join(labels)
+            self._size += 1
+
+    def match(self, domain: Optional[str]) -> Optional[str]:
+        """The shortest denylist entry that domain equals or is a subdomain of, else None."""
+        if not domain:
+            return None
+        node = self._root
+        for label in reversed(self._labels(domain)):
+            node = node.get(label)
+            if node is None:
+                return None
+            if self._END in node:
+                return node[self._END]
+        return None
+
+    def __contains__(self, domain: str) -> bool:
+        return self.match(domain) is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+
+# ========================================
+# CONFIG
+# ========================================
+
+class GrowthConfig:
+    """A parsed config.yaml plus the lookup structures derived from it."""
+
+    def __init__(self, data: Optional[dict] = None, path: Optional[Path] = None):
+        self.data = data or {}
+        self.path = path
+        self.persona_markers = {persona: keyword_tuple(markers)
+                                for persona, markers in self.get("persona_markers", {}).items()}
+        self.icp_lanes = {
+            lane: {
+                **lane_config,
+                "positive_keywords": keyword_tuple(lane_config.get("positive_keywords")),
+                "negative_keywords": keyword_tuple(lane_config.get("negative_keywords")),
+            }
+            for lane, lane_config in self.get("icp_lanes", {}).items()
+        }
+        self.filters = {key: keyword_tuple(value) if isinstance(value, list) else value
+                        for key, value in self.get("filters", {}).items()}
+        self.context_gates = {key: keyword_tuple(value) for key, value in self.get("context_gates", {}).items()}
+        self.denylist = DomainSuffixTrie(self.get("domain_denylist", []))
+        self._derived: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default=None):
+        value = self.data.get(key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str):
+        return self.data[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.data
+
+    def derive(self, name: str, build: Callable[["GrowthConfig"], object]):
+        """
+        Build a consumer-owned structure (e.g. a compiled GateEngine) once per
+        parse of the file; a reload starts with a fresh GrowthConfig.
+        """
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = build(self)
+            return self._derived[name]
+
+
+def parse_config(text: str, path: Optional[Path] = None) -> GrowthConfig:
+    """Parse and validate YAML text. Raises ConfigError."""
+    import yaml  # deferred: CLI entry points must not pay for yaml at import
+    from jsonschema import ValidationError, validate
+
+    where = path or "config"
+    try:
+        data = yaml.safe_load(text) or {}
+    except yaml.YAMLError as e:
+        raise ConfigError(f"{where}: invalid YAML: {e}") from e
+    try:
+        validate(instance=data, schema=CONFIG_SCHEMA)
+    except ValidationError as e:
+        location = ".".join(str(p) for p in e.absolute_path) or "<root>"
+        raise ConfigError(f"{where}: {location}: {e.message}") from e
+    return GrowthConfig(data, path)
+
+
+# path -> (stat signature, config); signature None means the file was missing
+_loaded: Dict[Path, Tuple[Optional[tuple], GrowthConfig]] = {}
+_load_lock = threading.Lock()
+
+
+def _signature(path: Path) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def get_config(path: Optional[Path] = None) -> GrowthConfig:
+    """
+    The current config for path (default growth/config.yaml). Costs one stat()
+    when the file is unchanged. A missing file yields an empty config. An edit
+    that fails to parse or validate raises ConfigError on first load; on reload
+    the previous config is kept and the error is logged once per bad version.
+    """
+    path = Path(path or CONFIG_PATH)
+    signature = _signature(path)
+    cached = _loaded.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _load_lock:
+        cached = _loaded.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        if signature is None:
+            config = GrowthConfig(path=path)
+        else:
+            try:
+                config = parse_config(path.read_text(encoding="utf-8"), path)
+            except ConfigError as e:
+                if cached is None:
+                    raise
+                logger.error(f"Keeping previous growth config: {e}")
+                config = cached[1]
+            else:
+                if cached is not None:
+                    logger.info(f"Reloaded growth config from {path}")
+        _loaded[path] = (signature, config)
+        return config
+
+
+def load_config(path: Optional[Path] = None) -> dict:
+    """The raw config mapping (see get_config)."""
+    return get_config(path).data
+
+
+def clear_cache():
+    """Forget every loaded config (tests)."""
+    with _load_lock:
+        _loaded.clear()
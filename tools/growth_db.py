@@ -8,19 +8,38 @@ Schema based on Nova SPEC:
 - search_runs: Audit log for monthly runs
 - search_queries: Query-level granularity
 - cache: Response caching (TTL)
+- seen_prospect_keys: Cross-run prospect dedupe shared by all scouts (TTL)
+- scout_query_log / scout_cache_stats: Append-only scout telemetry (rollups)
+- scout_budgets: Per-source, per-period query budgets (atomic decrement)
 """
 import sqlite3
 import json
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
 from contextlib import contextmanager
+from urllib.parse import urlparse
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 DB_PATH = Path(__file__).parent.parent / "growth" / "db" / "growth.db"
+SEEN_KEY_TTL_DAYS = 30
+
+
+def domain_from_url(url: Optional[str]) -> Optional[str]:
+    """Normalize a website URL to the bare domain used as a prospect key."""
+    if not url:
+        return None
+    try:
+        domain = urlparse(url if "://" in url else f"https://{url}").netloc.lower()
+    except ValueError:
+        return None
+    if domain.startswith("www."):
+        domain = domain[4:]
+    return domain or None
+
 
 class GrowthDB:
     def __init__(self, db_path: Path = DB_PATH):
@@ -174,6 +193,56 @@ class GrowthDB:
                 updated_at TEXT
             )
             """)
+
+            # 9. Seen Prospect Keys (Cross-run dedupe, shared by X + Places)
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS seen_prospect_keys (
+                prospect_key TEXT PRIMARY KEY,
+                source TEXT,
+                first_seen_at TEXT,
+                last_seen_at TEXT,
+                expires_at TEXT
+            )
+            """)
+            
+            # 10. Scout Query Log (Append-only telemetry, replaces query_log.jsonl)
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scout_query_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                logged_at TEXT,
+                source TEXT,
+                query TEXT,
+                query_type TEXT,
+                status TEXT,
+                result_count INTEGER
+            )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_scout_query_log_at ON scout_query_log(logged_at)")
+            
+            # 11. Scout Cache Stats (one row per hunt per cache)
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scout_cache_stats (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                logged_at TEXT,
+                cache TEXT,
+                hits INTEGER,
+                misses INTEGER,
+                expired INTEGER,
+                writes INTEGER,
+                errors INTEGER
+            )
+            """)
+            
+            # 12. Scout Budgets (e.g. GBP weekly query budget)
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scout_budgets (
+                source TEXT,
+                period TEXT,
+                used INTEGER DEFAULT 0,
+                updated_at TEXT,
+                PRIMARY KEY (source, period)
+            )
+            """)
             
             conn.commit()
 
@@ -240,6 +309,11 @@ class GrowthDB:
                     INSERT OR IGNORE INTO place_runs (place_id, run_id, created_at)
                     VALUES (?, ?, ?)
                     """, (place_id, run_id, now))
+                
+                # Share the domain with the other scouts' dedupe
+                domain = domain_from_url(place.get("websiteUri", place.get("website")))
+                if domain:
+                    self._mark_seen(cursor, [domain], source, SEEN_KEY_TTL_DAYS)
                     
                 return True
                 
@@ -456,6 +530,169 @@ class GrowthDB:
                 extras.get("endpoint"), extras.get("field_mask")
             ))
 
+    # ==========================
+    # Seen Prospect Keys (Cross-run dedupe)
+    # ==========================
+
+    def _mark_seen(self, cursor, keys: List[str], source: str, ttl_days: int):
+        now = datetime.now()
+        expires = (now + timedelta(days=ttl_days)).isoformat()
+        cursor.executemany("""
+        INSERT INTO seen_prospect_keys (prospect_key, source, first_seen_at, last_seen_at, expires_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(prospect_key) DO UPDATE SET
+            last_seen_at = excluded.last_seen_at,
+            expires_at = excluded.expires_at
+        """, [(k, source, now.isoformat(), now.isoformat(), expires) for k in keys])
+
+    def mark_prospects_seen(self, keys: List[str], source: str, ttl_days: int = SEEN_KEY_TTL_DAYS):
+        """Record prospect keys (domains, x:handles) as seen for ttl_days."""
+        keys = [k for k in dict.fromkeys(keys) if k]
+        if not keys:
+            return
+        with self._get_conn() as conn:
+            self._mark_seen(conn.cursor(), keys, source, ttl_days)
+
+    def get_seen_prospect_keys(self) -> Set[str]:
+        """Load all unexpired seen keys (one query per hunt, not per prospect)."""
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT prospect_key FROM seen_prospect_keys WHERE expires_at > ?",
+                (datetime.now().isoformat(),)
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    def purge_expired_prospect_keys(self) -> int:
+        """Delete expired seen keys. Returns number of rows removed."""
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM seen_prospect_keys WHERE expires_at <= ?",
+                (datetime.now().isoformat(),)
+            )
+            return cursor.rowcount
+
+    # ==========================
+    # Scout Telemetry (Query log, cache stats, budgets)
+    # ==========================
+
+    def log_scout_query(self, source: str, query: str, status: str,
+                        result_count: int = 0, query_type: str = "unknown"):
+        """Append one scout query outcome (cache_hit, success, rate_limited_429, error_*...)."""
+        with self._get_conn() as conn:
+            conn.execute("""
+            INSERT INTO scout_query_log (logged_at, source, query, query_type, status, result_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """, (datetime.now().isoformat(), source, query[:100], query_type, status, result_count))
+
+    def log_cache_stats(self, cache: str, stats: Dict[str, int]):
+        """Append a cache's hit/miss counters for one hunt."""
+        if not any(stats.values()):
+            return
+        with self._get_conn() as conn:
+            conn.execute("""
+            INSERT INTO scout_cache_stats (logged_at, cache, hits, misses, expired, writes, errors)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                datetime.now().isoformat(), cache, stats.get("hits", 0), stats.get("misses", 0),
+                stats.get("expired", 0), stats.get("writes", 0), stats.get("errors", 0)
+            ))
+
+    def get_query_rollups(self, since: Optional[str] = None, source: Optional[str] = None) -> List[Dict]:
+        """Per source/query_type counts with success, cache-hit and rate-limit ratios."""
+        where, params = ["1 = 1"], []
+        if since:
+            where.append("logged_at >= ?")
+            params.append(since)
+        if source:
+            where.append("source = ?")
+            params.append(source)
+        with self._get_conn() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute(f"""
+            SELECT source, query_type,
+                   COUNT(*) AS total,
+                   SUM(status IN ('success', 'cache_hit')) AS succeeded,
+                   SUM(status = 'cache_hit') AS cache_hits,
+                   SUM(status LIKE 'rate_limited%') AS rate_limited,
+                   SUM(status LIKE 'error%' OR status LIKE 'auth_failed%' OR status LIKE 'http_%') AS failed,
+                   SUM(result_count) AS results
+            FROM scout_query_log
+            WHERE {" AND ".join(where)}
+            GROUP BY source, query_type
+            ORDER BY source, query_type
+            """, params)
+            rollups = [dict(row) for row in cursor.fetchall()]
+        for r in rollups:
+            r["success_rate"] = round(r["succeeded"] / r["total"], 3)
+            r["cache_hit_ratio"] = round(r["cache_hits"] / r["total"], 3)
+            r["rate_limit_rate"] = round(r["rate_limited"] / r["total"], 3)
+        return rollups
+
+    def get_cache_rollups(self, since: Optional[str] = None) -> List[Dict]:
+        """Summed cache counters per cache with overall hit ratio."""
+        with self._get_conn() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT cache, SUM(hits) AS hits, SUM(misses) AS misses, SUM(expired) AS expired,
+                   SUM(writes) AS writes, SUM(errors) AS errors
+            FROM scout_cache_stats
+            WHERE logged_at >= ?
+            GROUP BY cache
+            ORDER BY cache
+            """, (since or "",))
+            rollups = [dict(row) for row in cursor.fetchall()]
+        for r in rollups:
+            lookups = r["hits"] + r["misses"] + r["expired"]
+            r["hit_ratio"] = round(r["hits"] / lookups, 3) if lookups else 0.0
+        return rollups
+
+    def get_budget_used(self, source: str, period: str) -> int:
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT used FROM scout_budgets WHERE source = ? AND period = ?", (source, period))
+            row = cursor.fetchone()
+            return row[0] if row else 0
+
+    def consume_budget(self, source: str, period: str, limit: int) -> Tuple[bool, int]:
+        """
+        Atomically take one unit of budget. Returns (granted, remaining).
+        The conditional UPDATE is a single statement, so concurrent scouts
+        can never push usage past the limit.
+        """
+        now = datetime.now().isoformat()
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            INSERT OR IGNORE INTO scout_budgets (source, period, used, updated_at) VALUES (?, ?, 0, ?)
+            """, (source, period, now))
+            cursor.execute("""
+            UPDATE scout_budgets SET used = used + 1, updated_at = ?
+            WHERE source = ? AND period = ? AND used < ?
+            """, (now, source, period, limit))
+            granted = cursor.rowcount == 1
+            cursor.execute("SELECT used FROM scout_budgets WHERE source = ? AND period = ?", (source, period))
+            used = cursor.fetchone()[0]
+        return granted, max(0, limit - used)
+
+    def release_budget(self, source: str, period: str):
+        """Return one unit taken by consume_budget (e.g. the query produced nothing)."""
+        with self._get_conn() as conn:
+            conn.execute("""
+            UPDATE scout_budgets SET used = used - 1, updated_at = ?
+            WHERE source = ? AND period = ? AND used > 0
+            """, (datetime.now().isoformat(), source, period))
+
+    def seed_budget(self, source: str, period: str, used: int):
+        """Carry over usage recorded elsewhere (legacy budget file) if the period is new."""
+        with self._get_conn() as conn:
+            conn.execute("""
+            INSERT OR IGNORE INTO scout_budgets (source, period, used, updated_at) VALUES (?, ?, ?, ?)
+            """, (source, period, used, datetime.now().isoformat()))
+
     # ==========================
     # G7.0 Tasks & Playbooks
     # ==========================
@@ -605,3 +842,12 @@ if __name__ == "__main__":
     # Test DB init
     db = GrowthDB()
     print(f"DB initialized at {db.db_path}")
+    
+    # Scout telemetry, last 7 days
+    since = (datetime.now() - timedelta(days=7)).isoformat()
+    for r in db.get_query_rollups(since=since):
+        print(f"{r['source']:<5} {r['query_type']:<20} n={r['total']:<5} success={r['success_rate']:.0%} "
+              f"cache_hit={r['cache_hit_ratio']:.0%} rate_limited={r['rate_limit_rate']:.0%}")
+    for r in db.get_cache_rollups(since=since):
+        print(f"cache {r['cache']:<20} hits={r['hits']} misses={r['misses']} "
+              f"expired={r['expired']} hit_ratio={r['hit_ratio']:.0%}")
@@ -0,0 +1,378 @@
+"""
+Hunt Queue - persistent job queue and watcher for hunt result files (SQLite)
+Factory Orchestrator's record of which *_qualified.json files have been turned
+into reports, replacing the path-per-line .processed log.
+
+- jobs are keyed by the SHA-256 of the file contents: a renamed or re-copied
+  hunt file is not processed twice, an edited one is processed again
+- states: queued -> running -> done | failed (retried up to MAX_ATTEMPTS)
+- the queue survives restarts; jobs left "running" by a crash are re-queued
+- HuntWatcher enqueues files as they land (watchdog/inotify when installed,
+  stat polling otherwise) and drains the queue with a bounded worker pool
+
+Usage:
+    python tools/hunt_queue.py                 # job counts and recent jobs
+    python tools/hunt_queue.py --retry-failed
+"""
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+LEADS_DIR = Path(__file__).parent.parent / "intelligence" / "leads"
+DB_PATH = LEADS_DIR / ".hunt_queue.db"
+HUNT_PATTERN = "*_qualified.json"
+MAX_ATTEMPTS = 3
+POLL_INTERVAL = 2.0
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_complete_json(path: Path) -> bool:
+    """True once a hunt file has been fully written (it parses)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            json.load(f)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+class HuntQueue:
+    """Persistent hunt-file job queue; safe to share between threads."""
+
+    def __init__(self, db_path: Path = DB_PATH, max_attempts: int = MAX_ATTEMPTS):
+        self.db_path = Path(db_path)
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_schema()
+
+    @contextmanager
+    def _get_conn(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._get_conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS hunt_jobs (
+                file_hash TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER DEFAULT 0,
+                enqueued_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                report_path TEXT,
+                error TEXT
+            )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_hunt_jobs_status ON hunt_jobs(status, enqueued_at)")
+
+    # ========================================
+    # JOBS
+    # ========================================
+
+    def enqueue(self, path: Path) -> bool:
+        """Queue a hunt file unless its contents were already queued or processed. True if queued."""
+        path = Path(path)
+        with self._get_conn() as conn:
+            cursor = conn.execute("""
+            INSERT OR IGNORE INTO hunt_jobs (file_hash, path, status, enqueued_at)
+            VALUES (?, ?, 'queued', ?)
+            """, (file_hash(path), str(path), time.time()))
+        return cursor.rowcount == 1
+
+    def claim(self) -> Optional[Tuple[str, str]]:
+        """Mark the oldest queued job running and return (file_hash, path), or None."""
+        with self._lock, self._get_conn() as conn:
+            row = conn.execute("""
+            SELECT file_hash, path FROM hunt_jobs WHERE status = 'queued'
+            ORDER BY enqueued_at LIMIT 1
+            """).fetchone()
+            if row:
+                conn.execute("""
+                UPDATE hunt_jobs SET status = 'running', attempts = attempts + 1, started_at = ?
+                WHERE file_hash = ?
+                """, (time.time(), row[0]))
+        return row
+
+    def complete(self, job_hash: str, report_path: Optional[str] = None):
+        with self._get_conn() as conn:
+            conn.execute("""
+            UPDATE hunt_jobs SET status = 'done', finished_at = ?, report_path = ?, error = NULL
+            WHERE file_hash = ?
+            """, (time.time(), report_path, job_hash))
+
+    def fail(self, job_hash: str, error: str):
+        """Re-queue the job, or mark it failed once it has used max_attempts."""
+        with self._get_conn() as conn:
+            conn.execute("""
+            UPDATE hunt_jobs
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END,
+                finished_at = ?, error = ?
+            WHERE file_hash = ?
+            """, (self.max_attempts, time.time(), error[:500], job_hash))
+
+    def mark_done(self, path: Path, report_path: Optional[str] = None):
+        """Record a hunt file as processed (outside the queue, e.g. --file runs)."""
+        path, now = Path(path), time.time()
+        with self._get_conn() as conn:
+            conn.execute("""
+            INSERT INTO hunt_jobs (file_hash, path, status, attempts, enqueued_at, finished_at, report_path)
+            VALUES (?, ?, 'done', 1, ?, ?, ?)
+            ON CONFLICT(file_hash) DO UPDATE SET
+                path = excluded.path, status = 'done', finished_at = excluded.finished_at,
+                report_path = excluded.report_path, error = NULL
+            """, (file_hash(path), str(path), now, now, report_path))
+
+    def is_processed(self, path: Path) -> bool:
+        with self._get_conn() as conn:
+            row = conn.execute("SELECT status FROM hunt_jobs WHERE file_hash = ?", (file_hash(path),)).fetchone()
+        return bool(row) and row[0] == 'done'
+
+    # ========================================
+    # MAINTENANCE
+    # ========================================
+
+    def recover(self) -> int:
+        """Re-queue jobs left running by a process that died mid-file."""
+        with self._get_conn() as conn:
+            return conn.execute("UPDATE hunt_jobs SET status = 'queued' WHERE status = 'running'").rowcount
+
+    def retry_failed(self) -> int:
+        with self._get_conn() as conn:
+            return conn.execute("UPDATE hunt_jobs SET status = 'queued', attempts = 0 WHERE status = 'failed'").rowcount
+
+    def reset(self) -> int:
+        """Forget every job, so all hunt files are processed again."""
+        with self._get_conn() as conn:
+            return conn.execute("DELETE FROM hunt_jobs").rowcount
+
+    def import_processed_log(self, log_path: Path) -> int:
+        """Mark the files listed in a legacy .processed log as done, then retire the log."""
+        log_path = Path(log_path)
+        if not log_path.exists():
+            return 0
+        imported = 0
+        for line in log_path.read_text(encoding='utf-8').splitlines():
+            path = Path(line.strip())
+            if line.strip() and path.exists():
+                self.mark_done(path)
+                imported += 1
+        log_path.rename(log_path.with_name(log_path.name + ".imported"))
+        logger.info(f"Imported {imported} processed hunt files from {log_path.name}")
+        return imported
+
+    def summary(self) -> Dict:
+        with self._get_conn() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM hunt_jobs GROUP BY status").fetchall())
+            recent = conn.execute("""
+            SELECT path, status, attempts, error FROM hunt_jobs ORDER BY enqueued_at DESC LIMIT 10
+            """).fetchall()
+        return {"counts": counts,
+                "recent": [{"path": p, "status": s, "attempts": a, "error": e} for p, s, a, e in recent]}
+
+
+_shared: Dict[Path, HuntQueue] = {}
+_shared_lock = threading.Lock()
+
+
+def get_hunt_queue(db_path: Path = DB_PATH) -> HuntQueue:
+    """Process-wide queue per database file."""
+    with _shared_lock:
+        if db_path not in _shared:
+            _shared[db_path] = HuntQueue(db_path)
+        return _shared[db_path]
+
+
+# ========================================
+# WATCHER
+# ========================================
+
+class HuntWatcher:
+    """
+    Enqueues hunt files as they land in `directory` and runs handler(path) on
+    them, `workers` at a time. handler returns the report path (or None) and
+    raises on failure. Uses watchdog (inotify/FSEvents) when it is installed and
+    stat polling every poll_interval seconds otherwise; either way the directory
+    is rescanned once at start, so files that landed while nothing was watching
+    are picked up.
+    """
+
+    def __init__(self, queue: HuntQueue, handler: Callable[[str], Optional[str]], directory: Path = LEADS_DIR,
+                 pattern: str = HUNT_PATTERN, workers: int = 1, poll_interval: float = POLL_INTERVAL,
+                 use_watchdog: bool = True):
+        self.queue = queue
+        self.handler = handler
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.use_watchdog = use_watchdog
+        self.mode = None
+        self._seen: Dict[str, Tuple[int, int]] = {}
+        self._seen_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._observer = None
+
+    def scan(self) -> int:
+        """Enqueue new or changed hunt files in the directory (stat-filtered, then content-hashed)."""
+        queued = 0
+        for path in sorted(self.directory.glob(self.pattern)):
+            queued += self.offer(path)
+        return queued
+
+    def offer(self, path: Path) -> bool:
+        """Enqueue one file if it is a complete, unseen hunt file; wakes a worker."""
+        path = Path(path)
+        if not path.match(self.pattern):
+            return False
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._seen_lock:
+            if self._seen.get(str(path)) == signature or not is_complete_json(path):
+                return False
+            self._seen[str(path)] = signature
+        if not self.queue.enqueue(path):
+            return False
+        logger.info(f"Queued {path.name}")
+        self._wake.set()
+        return True
+
+    def start(self):
+        self.queue.recover()
+        self.scan()
+        self.mode = "poll"
+        if self.use_watchdog:
+            self._observer = self._start_observer()
+            if self._observer is not None:
+                self.mode = "watchdog"
+        if self.mode == "poll":
+            self._spawn(self._poll_loop, "hunt-poll")
+        for i in range(self.workers):
+            self._spawn(self._work_loop, f"hunt-worker-{i}")
+        logger.info(f"Watching {self.directory} ({self.mode}, {self.workers} workers)")
+
+    def _spawn(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _start_observer(self):
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.info("watchdog not installed; polling for hunt files")
+            return None
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            # Writers may create, then fill, then rename; offer() ignores incomplete JSON
+            def on_created(self, event):
+                watcher.offer(Path(event.src_path))
+
+            def on_modified(self, event):
+                watcher.offer(Path(event.src_path))
+
+            def on_closed(self, event):
+                watcher.offer(Path(event.src_path))
+
+            def on_moved(self, event):
+                watcher.offer(Path(event.dest_path))
+
+        observer = Observer()
+        observer.schedule(Handler(), str(self.directory), recursive=False)
+        observer.start()
+        return observer
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            self.scan()
+
+    def _work_loop(self):
+        while not self._stop.is_set():
+            job = self.queue.claim()
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            job_hash, path = job
+            try:
+                report_path = self.handler(path)
+            except Exception as e:
+                logger.error(f"Hunt file {Path(path).name} failed: {e}")
+                self.queue.fail(job_hash, str(e))
+            else:
+                self.queue.complete(job_hash, str(report_path) if report_path else None)
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_forever(self):
+        self.start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            logger.info("Stopping watcher...")
+        finally:
+            self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hunt file job queue")
+    parser.add_argument("--db", default=str(DB_PATH), help="Queue database path")
+    parser.add_argument("--retry-failed", action="store_true", help="Re-queue failed jobs")
+    args = parser.parse_args()
+
+    queue = HuntQueue(Path(args.db))
+    if args.retry_failed:
+        logger.info(f"Re-queued {queue.retry_failed()} failed jobs")
+    summary = queue.summary()
+    print("Jobs: " + (", ".join(f"{status} {n}" for status, n in sorted(summary["counts"].items())) or "none"))
+    for job in summary["recent"]:
+        error = f" ({job['error']})" if job["error"] else ""
+        print(f"  [{job['status']}] {Path(job['path']).name} x{job['attempts']}{error}")
+
+
+if __name__ == "__main__":
+    main()
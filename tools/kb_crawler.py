@@ -0,0 +1,590 @@
+"""
+KB Crawler - Concurrent breadth-first site crawler for the KB Library Builder
+Harvests evidence pages from a client site before KB synthesis.
+
+- seeded from robots.txt / sitemap.xml (incl. sitemap indexes); guessed
+  standard paths are only tried when a site has no sitemap
+- robots.txt Disallow rules and Crawl-delay are honored
+- priority frontier: URLs mentioning KB topics not yet covered go first,
+  then shallower pages, then discovery order
+- worker pool with a per-host concurrency cap
+- URL normalization (fragments, tracking params, trailing slashes, default ports)
+  so every page is fetched once
+- each page is parsed once with lxml; the same tree yields links and text
+- incremental recrawls: pages from a previous build are revalidated with
+  ETag / Last-Modified, and a body whose SHA-256 is unchanged is not re-parsed
+- near-duplicate pages (tag archives, paginated listings, locale variants) are
+  flagged with duplicate_of via MinHash LSH over word shingles
+"""
+import re
+import time
+import heapq
+import hashlib
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+from urllib.robotparser import RobotFileParser
+
+import lxml.html
+import requests
+import trafilatura
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "X-Agent-Factory/1.0"
+
+# Guessed pages, tried only when the site publishes no sitemap
+STANDARD_PATHS = [
+    "pricing", "services", "solutions", "faq", "docs",
+    "about", "contact", "privacy", "terms"
+]
+
+# Query parameters that never change page content
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "_ga", "_gl", "hsctatracking"}
+TRACKING_PREFIXES = ("utm_",)
+
+SKIP_PATTERNS = ["login", "signup", "javascript:", "mailto:"]
+ASSET_EXTENSIONS = [".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".zip", ".mp4"]
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Sitemap limits (indexes can fan out to thousands of child sitemaps)
+MAX_SITEMAPS = 10
+MAX_SITEMAP_URLS = 5000
+# Longest Crawl-delay honored per request; builds should not stall for minutes
+MAX_CRAWL_DELAY = 10.0
+
+# Near-duplicate detection: MinHash over word 3-shingles, with LSH banding
+# (16 bands x 4 rows puts pages with Jaccard similarity around 0.5+ in a
+# shared bucket); candidates at or above NEAR_DUPLICATE_JACCARD are duplicates
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+NEAR_DUPLICATE_JACCARD = 0.8
+SHINGLE_SIZE = 3
+# Too few shingles make signatures of unrelated short pages collide
+MIN_SHINGLES = 16
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    Canonical form used for dedupe: lowercased scheme/host, no default port,
+    no fragment, no tracking params (remaining params sorted), no trailing slash.
+    Returns None for non-HTTP(S) URLs.
+    """
+    try:
+        parsed = urlparse(urljoin(base, url) if base else url)
+        port = parsed.port
+    except ValueError:
+        return None
+    scheme = parsed.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parsed.hostname:
+        return None
+
+    netloc = parsed.hostname.lower()
+    if port and port != DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{port}"
+
+    path = parsed.path.rstrip("/")
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ))
+    return urlunparse((scheme, netloc, path, "", query, ""))
+
+
+def site_key(url: str) -> str:
+    """Host used for same-site checks (www. and bare domain are one site)."""
+    host = urlparse(url).netloc
+    return host[4:] if host.startswith("www.") else host
+
+
+def parse_crawl_delay(robots_txt: str, user_agent: str = USER_AGENT) -> Optional[float]:
+    """Crawl-delay for user_agent (falling back to *). Unlike RobotFileParser, accepts fractions."""
+    delays: Dict[str, float] = {}
+    agents: List[str] = []
+    in_rules = False
+    for raw in robots_txt.splitlines():
+        line = raw.split("#", 1)[0]
+        if ":" not in line:
+            continue
+        key, value = (part.strip() for part in line.split(":", 1))
+        key = key.lower()
+        if key == "user-agent":
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+            continue
+        in_rules = True
+        if key == "crawl-delay":
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for agent in agents:
+                delays.setdefault(agent, delay)
+    name = user_agent.split("/")[0].lower()
+    for agent, delay in delays.items():
+        if agent != "*" and agent in name:
+            return delay
+    return delays.get("*")
+
+
+def parse_page(html: str, url: str) -> Tuple[Optional[str], List[str]]:
+    """Parse HTML once; return (main text, absolute link hrefs)."""
+    try:
+        tree = lxml.html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None, []
+    # Collect links before trafilatura prunes the tree
+    links = [urljoin(url, href) for href in tree.xpath("//a/@href")]
+    return trafilatura.extract(tree), links
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def _stem(word: str) -> str:
+    return word[:-1] if len(word) > 3 and word.endswith("s") else word
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+# Fixed (a, b) pairs for h(x) = (a*x + b) mod p; derived from hashes, not a
+# seeded RNG, so signatures stored in kb_build_state.json stay comparable
+_PERMUTATIONS = [
+    (_hash64(f"minhash-a-{i}") % (_MERSENNE_PRIME - 1) + 1, _hash64(f"minhash-b-{i}") % _MERSENNE_PRIME)
+    for i in range(MINHASH_PERMUTATIONS)
+]
+
+
+def minhash(text: str) -> Optional[List[int]]:
+    """MinHash signature of the text's word shingles, or None for very short text."""
+    words = _words(text)
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    hashes = [_hash64(shingle) for shingle in shingles]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+class MinHashLSH:
+    """
+    Finds a stored signature whose estimated Jaccard similarity to a query is
+    at least threshold. Signatures are split into bands; only signatures that
+    share a whole band with the query are compared.
+    """
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_JACCARD, bands: int = MINHASH_BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = MINHASH_PERMUTATIONS // bands
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self._entries: List[Tuple[List[int], str]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _keys(self, signature: List[int]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [(band, tuple(signature[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+
+    @staticmethod
+    def similarity(a: List[int], b: List[int]) -> float:
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+    def find(self, signature: List[int]) -> Optional[str]:
+        """Key of the most similar stored near-duplicate, if any."""
+        candidates = {i for key in self._keys(signature) for i in self._buckets.get(key, ())}
+        best, best_score = None, self.threshold
+        for i in sorted(candidates):
+            other, key = self._entries[i]
+            score = self.similarity(signature, other)
+            if score >= best_score and (best is None or score > best_score):
+                best, best_score = key, score
+        return best
+
+    def add(self, signature: List[int], key: str):
+        self._entries.append((signature, key))
+        for bucket in self._keys(signature):
+            self._buckets.setdefault(bucket, []).append(len(self._entries) - 1)
+
+
+class TopicScorer:
+    """
+    Scores URLs by the KB topics their path mentions. A topic counts in full
+    until a page for it has been fetched, then drops to COVERED_WEIGHT.
+
+    topics maps a topic name to terms ("Pricing", "Case Studies", "next_steps").
+    A term matches when each of its words prefixes a word of the URL path.
+    """
+
+    COVERED_WEIGHT = 0.25
+
+    def __init__(self, topics: Dict[str, List[str]]):
+        self.terms: Dict[str, List[Tuple[str, ...]]] = {}
+        for name, terms in topics.items():
+            stems = {tuple(_stem(w) for w in _words(t) if len(w) > 1) for t in terms}
+            self.terms[name] = [t for t in stems if t]
+        self.covered: Set[str] = set()
+        self._memo: Dict[str, Set[str]] = {}
+
+    def topics_for(self, url: str) -> Set[str]:
+        if url not in self._memo:
+            words = _words(urlparse(url).path)
+            self._memo[url] = {
+                name for name, terms in self.terms.items()
+                if any(all(any(w.startswith(s) for w in words) for s in term) for term in terms)
+            }
+        return self._memo[url]
+
+    def score(self, url: str) -> float:
+        return sum(1.0 if t not in self.covered else self.COVERED_WEIGHT for t in self.topics_for(url))
+
+    def mark_fetched(self, url: str):
+        self.covered |= self.topics_for(url)
+
+
+class Frontier:
+    """
+    Priority queue of (url, depth): homepage first, then highest topic score,
+    then shallowest, then discovery order. Scores are re-checked on pop,
+    since fetched pages lower the value of URLs for the topics they covered.
+    """
+
+    def __init__(self, scorer: Optional[TopicScorer] = None):
+        self.scorer = scorer
+        self._heap: List[Tuple[bool, float, int, int, str]] = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _score(self, url: str) -> float:
+        return self.scorer.score(url) if self.scorer else 0.0
+
+    def push(self, url: str, depth: int):
+        self._seq += 1
+        heapq.heappush(self._heap, (depth > 0, -self._score(url), depth, self._seq, url))
+
+    def pop(self) -> Tuple[str, int]:
+        while True:
+            not_root, neg_score, depth, seq, url = heapq.heappop(self._heap)
+            current = -self._score(url)
+            if current > neg_score and self._heap and (not_root, current, depth, seq) > self._heap[0][:4]:
+                heapq.heappush(self._heap, (not_root, current, depth, seq, url))
+                continue
+            return url, depth
+
+
+class SiteCrawler:
+    """Concurrent, topic-prioritized crawler restricted to one site."""
+
+    def __init__(self, base_url: str, max_depth: int = 2, workers: int = 8,
+                 per_host: int = 4, timeout: float = 10, seed_paths: Optional[List[str]] = None,
+                 scorer: Optional[TopicScorer] = None, respect_robots: bool = True,
+                 known_pages: Optional[Dict[str, Dict]] = None):
+        self.base_url = normalize_url(base_url) or base_url.rstrip("/")
+        self.site = site_key(self.base_url)
+        self.max_depth = max_depth
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.timeout = timeout
+        self.seed_paths = STANDARD_PATHS if seed_paths is None else seed_paths
+        self.scorer = scorer
+        self.respect_robots = respect_robots
+        # url -> {etag, last_modified, content_sha256, links, minhash} from a previous crawl
+        self.known_pages = known_pages or {}
+        self.robots: Optional[RobotFileParser] = None
+        self.crawl_delay = 0.0
+
+        self.stats = {
+            "pages_fetched": 0,
+            "pages_unchanged": 0,
+            "urls": [],
+            "blocked_urls": [],
+            "robots_disallowed": [],
+            "assets": [],
+            "status_codes": {},
+            "crawl_depth": 0,
+            "sitemap_urls": 0,
+            "crawl_delay": 0.0,
+            "near_duplicates": 0,
+            "duplicate_urls": {},
+        }
+
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_request_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    # ========================================
+    # WORKER SIDE
+    # ========================================
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({"User-Agent": USER_AGENT})
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                # A Crawl-delay means one request at a time, spaced by the delay
+                slots = 1 if self.crawl_delay else self.per_host
+                self._host_slots[host] = threading.BoundedSemaphore(slots)
+            return self._host_slots[host]
+
+    def _wait_turn(self, url: str):
+        if not self.crawl_delay:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_request_at.get(host, now))
+            self._next_request_at[host] = start + self.crawl_delay
+        if start > now:
+            time.sleep(start - now)
+
+    def _validators(self, known: Dict) -> Dict[str, str]:
+        headers = {}
+        if known.get("etag"):
+            headers["If-None-Match"] = known["etag"]
+        if known.get("last_modified"):
+            headers["If-Modified-Since"] = known["last_modified"]
+        return headers
+
+    def _fetch(self, url: str, depth: int, conditional: bool = True) -> Dict:
+        """Fetch and parse one page (runs in a worker thread). conditional=False ignores known validators."""
+        page = {"url": url, "depth": depth, "status": None, "html": False, "unchanged": False,
+                "final_url": url, "text": None, "links": [],
+                "etag": None, "last_modified": None, "content_sha256": None,
+                "minhash": None, "duplicate_of": None}
+        known = self.known_pages.get(url, {}) if conditional else {}
+        try:
+            with self._host_slot(url):
+                self._wait_turn(url)
+                resp = self._session().get(url, timeout=self.timeout, headers=self._validators(known))
+        except Exception as e:
+            logger.warning(f"Request failed for {url}: {e}")
+            return page
+
+        page["status"] = resp.status_code
+        page["final_url"] = normalize_url(resp.url) or url
+        if resp.status_code == 304 and known:
+            page.update(html=True, unchanged=True, links=known.get("links", []), etag=known.get("etag"),
+                        last_modified=known.get("last_modified"), content_sha256=known.get("content_sha256"),
+                        minhash=known.get("minhash"))
+            return page
+        if resp.status_code != 200:
+            return page
+        if "text/html" not in resp.headers.get("Content-Type", "").lower():
+            return page
+
+        page["html"] = True
+        page["etag"] = resp.headers.get("ETag")
+        page["last_modified"] = resp.headers.get("Last-Modified")
+        page["content_sha256"] = hashlib.sha256(resp.content).hexdigest()
+        if known and page["content_sha256"] == known.get("content_sha256"):
+            page["unchanged"] = True
+            page["links"] = known.get("links", [])
+            page["minhash"] = known.get("minhash")
+            return page
+
+        try:
+            page["text"], page["links"] = parse_page(resp.text, page["final_url"])
+        except Exception as e:
+            logger.warning(f"Failed to parse {url}: {e}")
+        if page["text"]:
+            page["minhash"] = minhash(page["text"])
+        return page
+
+    def refetch(self, url: str, depth: int) -> Dict:
+        """
+        Fetch a page unconditionally and parse it, for a page that was reported
+        unchanged but whose previous output can no longer be reused.
+        """
+        page = self._fetch(url, depth, conditional=False)
+        if page["status"] == 200 and page["html"]:
+            self.stats["pages_unchanged"] -= 1
+        return page
+
+    # ========================================
+    # ROBOTS & SITEMAPS
+    # ========================================
+
+    def _get_text(self, url: str) -> Optional[str]:
+        try:
+            resp = self._session().get(url, timeout=self.timeout)
+        except Exception as e:
+            logger.debug(f"Fetch failed for {url}: {e}")
+            return None
+        return resp.text if resp.status_code == 200 else None
+
+    def _load_robots(self):
+        robots_url = f"{urlparse(self.base_url)._replace(path='', query='').geturl()}/robots.txt"
+        text = self._get_text(robots_url)
+        if text is None:
+            return
+        self.robots = RobotFileParser(robots_url)
+        self.robots.parse(text.splitlines())
+        delay = parse_crawl_delay(text)
+        if delay:
+            self.crawl_delay = min(float(delay), MAX_CRAWL_DELAY)
+            self.stats["crawl_delay"] = self.crawl_delay
+            logger.info(f"Honoring Crawl-delay of {self.crawl_delay}s")
+
+    def _allowed(self, url: str) -> bool:
+        return self.robots is None or self.robots.can_fetch(USER_AGENT, url)
+
+    def _sitemap_urls(self) -> List[str]:
+        """Page URLs listed in the site's sitemaps (following sitemap indexes)."""
+        root = urlparse(self.base_url)._replace(path="", query="").geturl()
+        queue = list((self.robots.site_maps() if self.robots else None) or [f"{root}/sitemap.xml"])
+        fetched, pages = set(), []
+        while queue and len(fetched) < MAX_SITEMAPS and len(pages) < MAX_SITEMAP_URLS:
+            sitemap_url = queue.pop(0)
+            if sitemap_url in fetched:
+                continue
+            fetched.add(sitemap_url)
+            text = self._get_text(sitemap_url)
+            if not text:
+                continue
+            try:
+                tree = etree.fromstring(text.encode("utf-8"))
+            except etree.XMLSyntaxError:
+                logger.warning(f"Unreadable sitemap: {sitemap_url}")
+                continue
+            locs = [loc.text.strip() for loc in tree.iter("{*}loc") if loc.text]
+            if etree.QName(tree).localname == "sitemapindex":
+                queue.extend(locs)
+            else:
+                pages.extend(locs)
+        return pages[:MAX_SITEMAP_URLS]
+
+    # ========================================
+    # FRONTIER
+    # ========================================
+
+    def _enqueue(self, url: str, depth: int, seen: set, frontier: Frontier):
+        if url in seen:
+            return
+        seen.add(url)
+        if not self._allowed(url):
+            self.stats["robots_disallowed"].append(url)
+            return
+        frontier.push(url, depth)
+
+    def _seed(self, seen: set) -> Frontier:
+        frontier = Frontier(self.scorer)
+        if self.respect_robots:
+            self._load_robots()
+        self._enqueue(self.base_url, 0, seen, frontier)
+
+        sitemap_urls = [u for u in map(normalize_url, self._sitemap_urls()) if u and site_key(u) == self.site]
+        self.stats["sitemap_urls"] = len(sitemap_urls)
+        if sitemap_urls:
+            logger.info(f"Seeding crawl with {len(sitemap_urls)} sitemap URLs")
+        else:
+            sitemap_urls = [normalize_url(f"{self.base_url}/{path}") for path in self.seed_paths]
+        for url in sitemap_urls:
+            if url:
+                self._enqueue(url, 1, seen, frontier)
+        return frontier
+
+    def _expand(self, page: Dict, seen: set, frontier: Frontier):
+        """Queue unseen same-site links of a fetched page."""
+        if page["depth"] >= self.max_depth:
+            return
+        for link in page["links"]:
+            url = normalize_url(link)
+            if not url or url in seen or site_key(url) != self.site:
+                continue
+            lowered = link.lower()
+            if any(x in lowered for x in SKIP_PATTERNS):
+                continue
+            if urlparse(url).path.lower().endswith(tuple(ASSET_EXTENSIONS)):
+                seen.add(url)
+                self.stats["assets"].append(url)
+                continue
+            self._enqueue(url, page["depth"] + 1, seen, frontier)
+
+    def _record(self, page: Dict):
+        url = page["url"]
+        if page["status"] is not None:
+            self.stats["status_codes"][url] = page["status"]
+        if page["unchanged"]:
+            self.stats["pages_unchanged"] += 1
+        if page["status"] not in (200, 304):
+            self.stats["blocked_urls"].append(url)
+        elif not page["html"]:
+            self.stats["assets"].append(url)
+        else:
+            self.stats["pages_fetched"] += 1
+            self.stats["urls"].append(url)
+            self.stats["crawl_depth"] = max(self.stats["crawl_depth"], page["depth"])
+
+    def _mark_duplicate(self, page: Dict, signatures: MinHashLSH):
+        """Flag a page whose text nearly matches an earlier page's; index it otherwise."""
+        if not page["minhash"]:
+            return
+        original = signatures.find(page["minhash"])
+        if original is None:
+            signatures.add(page["minhash"], page["url"])
+            return
+        page["duplicate_of"] = original
+        self.stats["near_duplicates"] += 1
+        self.stats["duplicate_urls"][page["url"]] = original
+        logger.info(f"Near-duplicate: {page['url']} ~ {original}")
+
+    def crawl(self) -> Iterator[Dict]:
+        """
+        Yield fetched HTML pages ({url, depth, text, links, unchanged, ...}) as
+        they complete. Unchanged pages carry the previous crawl's links and no text.
+        Pages nearly identical to an earlier page have duplicate_of set to its URL;
+        their links are still followed.
+        Closing the generator early (e.g. once enough KB files were written)
+        cancels queued fetches.
+        """
+        seen: Set[str] = set()
+        signatures = MinHashLSH()
+        frontier = self._seed(seen)
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="kb-crawl")
+        pending = {}
+        try:
+            while frontier or pending:
+                while frontier and len(pending) < self.workers:
+                    url, depth = frontier.pop()
+                    logger.info(f"Crawling: {url} (Depth {depth})")
+                    pending[pool.submit(self._fetch, url, depth)] = url
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del pending[future]
+                    page = future.result()
+                    seen.add(page["final_url"])
+                    self._record(page)
+                    if page["html"]:
+                        if self.scorer:
+                            self.scorer.mark_fetched(page["url"])
+                        self._mark_duplicate(page, signatures)
+                        self._expand(page, seen, frontier)
+                        yield page
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=True)
+            for session in self._sessions:
+                session.close()
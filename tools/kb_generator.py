@@ -2,14 +2,12 @@ import sys
 # Force UTF-8 output
 sys.stdout.reconfigure(encoding='utf-8')
 
-import os
-import requests
 import json
 from utils import load_env, load_json, save_json, ensure_directory
+from llm_gateway import generate_with_gemini
 
 # Load Environment
 load_env()
-API_KEY = os.getenv("GOOGLE_API_KEY")
 
 def generate_kb_content(template_data):
     """Uses Gemini Pro to generate a Knowledge Base from the template."""
@@ -32,19 +30,10 @@ def generate_kb_content(template_data):
     - clear instructions on when to escalate to human.
     """
     
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={API_KEY}"
-    payload = {
-        "contents": [{"parts": [{"text": prompt}]}]
-    }
-    
-    try:
-        response = requests.post(url, json=payload)
-        response.raise_for_status()
-        result = response.json()
-        return result['candidates'][0]['content']['parts'][0]['text']
-    except Exception as e:
-        print(f"❌ Error generating content: {e}")
-        return None
+    content = generate_with_gemini("", prompt, model="gemini-2.5-flash")
+    if not content:
+        print("❌ Error generating content")
+    return content
 
 def build_system_prompt(template_data, content_summary):
     """Interpolates the master system prompt."""
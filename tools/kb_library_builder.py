@@ -5,18 +5,21 @@ import logging
 import argparse
 import hashlib
 import re
-import requests
 import datetime
 import shutil
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse
+from typing import List, Dict, Any, Optional, Tuple
 
-# External libs (assumed available in env)
-import trafilatura
-from bs4 import BeautifulSoup
-import tiktoken
+# External libs (assumed available in env); the crawler (requests, lxml,
+# trafilatura) is imported in run_crawler so builds without a site skip it
 from llm_client import LLMClient
+from kb_retriever import BM25Index, format_context
+from tokenizer import get_tokenizer
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -25,7 +28,10 @@ logger = logging.getLogger(__name__)
 class KBLibraryBuilder:
     def __init__(self, slug: str, agents_dir: str = "agents", ingested_dir: str = "ingested_clients", 
                  min_files: int = 25, max_files: int = 60, chunk_tokens: int = 650, overlap: int = 80,
-                 dossier_path: str = None):
+                 dossier_path: str = None, crawl_workers: int = 8, crawl_per_host: int = 4,
+                 incremental: bool = False, llm_concurrency: int = 4, llm_retries: int = 2,
+                 llm_backoff: float = 2.0, context_tokens: int = 4000, context_top_k: int = 12,
+                 llm_cache=None):
         self.slug = slug
         self.agents_dir = Path(agents_dir)
         self.ingested_dir = Path(ingested_dir)
@@ -41,13 +47,32 @@ class KBLibraryBuilder:
         self.max_files = max_files
         self.chunk_tokens = chunk_tokens
         self.overlap = overlap
+        # Per-topic evidence: top-k BM25 chunks within a token budget
+        self.context_tokens = context_tokens
+        self.context_top_k = context_top_k
+        self.chunk_index: Optional[BM25Index] = None
+        self.crawl_workers = crawl_workers
+        self.crawl_per_host = crawl_per_host
         
-        self.enc = tiktoken.get_encoding("cl100k_base")
-        self.enc = tiktoken.get_encoding("cl100k_base")
+        # Incremental rebuilds: reuse files whose inputs are unchanged
+        self.incremental = incremental
+        self.state_path = self.agent_path / "kb_build_state.json"
+        self.previous_files: Dict[str, Dict] = {}  # "kb/<file>" -> previous index.json entry
+        self.previous_state: Dict[str, Dict] = {"pages": {}, "topics": {}}
+        self.build_state: Dict[str, Dict] = {"pages": {}, "topics": {}}
+        self.build_stats = {"pages_reused": 0, "topics_reused": 0, "llm_calls": 0, "context_tokens": 0}
+        
+        # Shared encoder and token-count memo (one per process)
+        self.tokenizer = get_tokenizer()
         self.generated_files: List[Dict] = [] # Track file metadata
 
-        # Initialize LLM Client
-        self.llm = LLMClient()
+        # Initialize LLM Client (topics are synthesized concurrently, bounded by llm_concurrency;
+        # with an LLMCache, a rebuild with unchanged prompts costs no tokens)
+        self.llm_concurrency = max(1, llm_concurrency)
+        self.llm = LLMClient(max_concurrency=self.llm_concurrency, cache=llm_cache)
+        self.llm_retries = llm_retries
+        self.llm_backoff = llm_backoff
+        self._stats_lock = threading.Lock()
         
         # Crawler Stats
         self.crawl_stats = {
@@ -172,7 +197,7 @@ class KBLibraryBuilder:
         return text.strip()
 
     def _token_count(self, text: str) -> int:
-        return len(self.enc.encode(text))
+        return self.tokenizer.count(text)
 
     def _load_dossier(self) -> Dict:
         if not self.dossier_path.exists():
@@ -182,38 +207,18 @@ class KBLibraryBuilder:
 
     def _chunk_text(self, text: str, source_url: str, title: str) -> List[Dict]:
         """Splits text into semantic chunks."""
-        tokens = self.enc.encode(text)
-        total_tokens = len(tokens)
-        
-        if total_tokens <= self.chunk_tokens:
-            return [{
-                "text": text,
-                "token_count": total_tokens,
-                "source": source_url,
-                "title": title
-            }]
-            
-        chunks = []
-        start = 0
-        while start < total_tokens:
-            end = min(start + self.chunk_tokens, total_tokens)
-            
-            chunk_tokens_ids = tokens[start:end]
-            chunk_text = self.enc.decode(chunk_tokens_ids)
-            
-            # Sanitization Check
-            chunk_text = self._sanitize_text(chunk_text)
-
-            chunks.append({
-                "text": chunk_text,
-                "token_count": len(chunk_tokens_ids),
-                "source": source_url,
-                "title": title
-            })
-            
-            start += (self.chunk_tokens - self.overlap)
-            
-        return chunks
+        return self._to_chunks(self.tokenizer.split(text, self.chunk_tokens, self.overlap), source_url, title)
+
+    def _to_chunks(self, windows: List[Tuple[str, int]], source_url: str, title: str) -> List[Dict]:
+        """Chunk dicts from tokenizer windows; text split across windows is re-sanitized."""
+        if len(windows) > 1:
+            windows = [(self._sanitize_text(text), count) for text, count in windows]
+        return [{
+            "text": text,
+            "token_count": count,
+            "source": source_url,
+            "title": title
+        } for text, count in windows]
 
     def _write_kb_file(self, filename: str, content: str, meta: Dict):
         """Writes a KB file and tracks metadata."""
@@ -236,6 +241,69 @@ class KBLibraryBuilder:
         })
         logger.info(f"Generated KB file: {filename}")
 
+    # ==========================
+    # Incremental Rebuild
+    # ==========================
+
+    def _load_previous_build(self):
+        """Loads the previous index.json entries and build state (input hashes)."""
+        index_path = self.kb_dir / "index.json"
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                self.previous_files = {e["path"]: e for e in json.load(f).get("files", [])}
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.previous_state = {"pages": state.get("pages", {}), "topics": state.get("topics", {})}
+        except (OSError, ValueError, KeyError) as e:
+            logger.info(f"No usable previous build ({e}); rebuilding everything.")
+            self.previous_files, self.previous_state = {}, {"pages": {}, "topics": {}}
+
+    def _can_reuse(self, filename: str) -> bool:
+        """True if a previously generated file is still on disk and untouched."""
+        entry = self.previous_files.get(f"kb/{filename}")
+        file_path = self.kb_dir / filename
+        if not entry or not file_path.exists():
+            return False
+        return hashlib.sha256(file_path.read_bytes()).hexdigest() == entry.get("file_hash")
+
+    def _reuse_kb_file(self, filename: str) -> bool:
+        """Keeps a previously generated file (and its index entry) if it is untouched."""
+        entry = self.previous_files.get(f"kb/{filename}")
+        if entry and any(f["path"] == entry["path"] for f in self.generated_files):
+            return True
+        if not self._can_reuse(filename):
+            return False
+        self.generated_files.append(dict(entry))
+        return True
+
+    def _reusable_pages(self) -> Dict[str, Dict]:
+        """Previous crawl validators, limited to pages whose KB file can be reused."""
+        pages = {}
+        for url, page in self.previous_state["pages"].items():
+            filename = page.get("file")
+            entry = self.previous_files.get(f"kb/{filename}") if filename else None
+            if filename is None or (entry and (self.kb_dir / filename).exists()):
+                pages[url] = page
+        return pages
+
+    def _topic_input_hash(self, filename: str, content_parts: List[str], llm_context: Optional[str]) -> str:
+        """Hash of everything a core topic is built from (dossier fields, LLM evidence, model)."""
+        payload = json.dumps({
+            "topic": filename,
+            "dossier": content_parts,
+            "llm_context": llm_context,
+            "llm": [self.llm.provider, self.llm.model] if llm_context else None
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _remove_stale_files(self):
+        """Deletes files from the previous build that this build no longer produces."""
+        current = {f["path"] for f in self.generated_files}
+        for path in self.previous_files:
+            if path not in current:
+                (self.agent_path / path).unlink(missing_ok=True)
+                logger.info(f"Removed stale KB file: {path}")
+
     def _generate_with_llm(self, topic: str, context: str, dossier: Dict) -> str:
         """Uses LLM to synthesize a missing KB file from raw context."""
         company_name = dossier['client_profile']['name']
@@ -255,7 +323,7 @@ CRITICAL EVIDENCE RULE:
         
         user_prompt = f"""
 [RAW CONTEXT FROM WEBSITE]
-{context[:25000]}  # Increased context limit for better evidence finding
+{context}
 
 [DOSSIER SUMMARY]
 Name: {company_name}
@@ -268,36 +336,92 @@ Make it detailed (at least 300 words if possible) unless data is missing.
 Remember: "Unknown" is better than a lie.
 """
         logger.info(f"✨ Invoking LLM for topic: {topic}")
+        with self._stats_lock:
+            self.build_stats["llm_calls"] += 1
         return self.llm.generate(system_prompt, user_prompt)
 
+    def _generate_with_retry(self, topic: str, context: str, dossier: Dict) -> Optional[str]:
+        """_generate_with_llm with exponential backoff. Returns None if every attempt failed."""
+        for attempt in range(self.llm_retries + 1):
+            try:
+                text = self._generate_with_llm(topic, context, dossier)
+            except Exception as e:
+                text = f"[Error generating content: {e}]"
+            if text and not text.startswith("[Error"):
+                return text
+            # A missing key will not fix itself; don't wait on it
+            if attempt == self.llm_retries or text.startswith("[Error: Missing"):
+                logger.warning(f"LLM generation failed for {topic}: {text[:120]}")
+                return None
+            delay = self.llm_backoff * (2 ** attempt) * random.uniform(0.75, 1.25)
+            logger.warning(f"LLM attempt {attempt + 1} failed for {topic}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+        return None
+
+    def _generate_topics(self, topics: Dict[str, Tuple[str, str]], dossier: Dict) -> Dict[str, Optional[str]]:
+        """Synthesizes {filename: (topic, context)} concurrently; the build waits only for the slowest topic."""
+        if not topics:
+            return {}
+        workers = min(self.llm_concurrency, len(topics))
+        logger.info(f"Synthesizing {len(topics)} topics with {workers} concurrent LLM requests")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kb-llm") as pool:
+            futures = {name: pool.submit(self._generate_with_retry, topic, context, dossier)
+                       for name, (topic, context) in topics.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def _build_chunk_index(self, dossier: Dict) -> BM25Index:
+        """Chunks the source bundle and every crawled page into one BM25 index."""
+        docs = []  # (text, source, title)
+        bundle = self._try_load_source_bundle()
+        if bundle:
+            bundle_source = dossier.get("target_url") or dossier.get("client_profile", {}).get("url") or "source_bundle"
+            docs.append((bundle, bundle_source, "Source Bundle"))
+        
+        # Sorted by path so chunk order (and topic context hashes) do not depend on crawl completion order
+        for f in sorted(self.generated_files, key=lambda f: f["path"]):
+            if "raw_crawl" not in f.get("tags", []):
+                continue
+            p = self.agent_path / f["path"]
+            try:
+                text = p.read_text(encoding='utf-8')
+            except OSError:
+                continue
+            docs.append((text, (f.get("source_urls") or [f["path"]])[0], f.get("title", "")))
+        
+        # Crawled pages were counted when written, so only long documents are encoded (in one batch)
+        windows = self.tokenizer.split_batch([text for text, _, _ in docs], self.chunk_tokens, self.overlap)
+        chunks = []
+        for (_, source, title), doc_windows in zip(docs, windows):
+            chunks.extend(self._to_chunks(doc_windows, source, title))
+        
+        logger.info(f"Chunk index: {len(chunks)} chunks, {sum(c['token_count'] for c in chunks)} tokens")
+        return BM25Index(chunks)
+
+    def _topic_context(self, filename: str, discovery_mode: bool) -> str:
+        """Evidence for one topic: best BM25 chunks for its keywords and tags, within the token budget."""
+        spec = self.file_map.get(filename) or self.optional_file_map[filename]
+        query = spec["keywords"] + [t.replace("_", " ") for t in spec["tags"]]
+        chunks = self.chunk_index.select(query, self.context_tokens, self.context_top_k)
+        with self._stats_lock:
+            self.build_stats["context_tokens"] += sum(c["token_count"] for c in chunks)
+        context = format_context(chunks)
+        if discovery_mode:
+            context += "\n\n[SYSTEM WARNING]: DATA IS SCARCE. DO NOT INVENT FACTS. IF INFORMATION IS MISSING, STATE 'Unknown / Discovery Required'."
+        return context
+
     def build_core_files(self, dossier: Dict):
         """Generates the required set 00-55 from Dossier with proper field mapping."""
         logger.info("Building Core KB Files from Dossier...")
         
-        # 1. Load the source bundle
-        context_text = self._try_load_source_bundle() or ""
-
-        # 2. Append Crawled Content (if any)
-        # We look at self.generated_files which now contains crawled pages
-        crawled_text = []
-        for f in self.generated_files:
-            if "raw_crawl" in f.get("tags", []):
-                try:
-                    p = self.agent_path / f["path"]
-                    if p.exists():
-                        crawled_text.append(p.read_text(encoding='utf-8'))
-                except:
-                    pass
-        
-        if crawled_text:
-            context_text += "\n\n[ADDITIONAL CRAWLED CONTEXT]\n" + "\n".join(crawled_text)
+        # 1-2. Chunk index over the source bundle and crawled pages
+        self.chunk_index = self._build_chunk_index(dossier)
+        has_evidence = len(self.chunk_index) > 0
         
         # Statistics Check & Discovery Mode
         # If we have very few pages, we flag "Discovery Mode" and warn the LLM.
         is_discovery_mode = self.crawl_stats["pages_fetched"] < 5
         if is_discovery_mode:
             logger.warning(f"⚠️ Low Evidence Warning: Only crawled {self.crawl_stats['pages_fetched']} pages. Enabling Discovery Mode.")
-            context_text += "\n\n[SYSTEM WARNING]: DATA IS SCARCE. DO NOT INVENT FACTS. IF INFORMATION IS MISSING, STATE 'Unknown / Discovery Required'."
 
         # Define explicit dossier field mappings to KB topics
         field_mappings = {
@@ -363,9 +487,10 @@ Remember: "Unknown" is better than a lie.
             }
         }
         
+        # Pass 1: gather dossier evidence per topic and decide which topics need the LLM
+        plans = []
         for filename, info in self.file_map.items():
             keywords = info["keywords"]
-            canonical_tags = info["tags"]
             mapping = field_mappings.get(filename, {})
             
             content_parts = []
@@ -387,13 +512,50 @@ Remember: "Unknown" is better than a lie.
             # 3. If nothing found OR content is very thin, attempting LLM Generation using COMBINED Context
             # Logic: If content length < 200 chars AND we have context, let the LLM write it.
             current_content_len = sum(len(c) for c in content_parts)
+            needs_llm = (not content_parts or current_content_len < 200) and has_evidence
+            topic_context = self._topic_context(filename, is_discovery_mode) if needs_llm else None
             
-            if (not content_parts or current_content_len < 200) and context_text:
-                 generated_text = self._generate_with_llm(keywords[0], context_text, dossier)
-                 if generated_text and not generated_text.startswith("[Error"):
-                     # Sanitize ONLY the generated text to strip markdown wrappers
-                     generated_text = self._sanitize_text(generated_text)
-                     content_parts.append(generated_text)
+            # Incremental: unchanged inputs -> keep the previous file, no LLM call
+            input_hash = self._topic_input_hash(filename, content_parts, topic_context)
+            previous = self.previous_state["topics"].get(filename, {})
+            reuse = self.incremental and previous.get("input_hash") == input_hash and self._can_reuse(f"{filename}.md")
+            
+            plans.append({
+                "filename": filename,
+                "content_parts": content_parts,
+                "context": topic_context,
+                "input_hash": input_hash,
+                "wants_llm": needs_llm,
+                "needs_llm": needs_llm and not reuse,
+                "reuse": reuse
+            })
+        
+        # Pass 2: LLM topics run concurrently
+        generated = self._generate_topics(
+            {p["filename"]: (self.file_map[p["filename"]]["keywords"][0], p["context"]) for p in plans if p["needs_llm"]},
+            dossier
+        )
+        
+        # Pass 3: assemble and write in file_map order, so index.json is stable
+        for plan in plans:
+            filename, content_parts = plan["filename"], plan["content_parts"]
+            keywords = self.file_map[filename]["keywords"]
+            canonical_tags = self.file_map[filename]["tags"]
+            mapping = field_mappings.get(filename, {})
+            
+            if plan["reuse"] and self._reuse_kb_file(f"{filename}.md"):
+                self.build_state["topics"][filename] = {"input_hash": plan["input_hash"]}
+                self.build_stats["topics_reused"] += 1
+                logger.info(f"Unchanged inputs, reusing: {filename}.md")
+                continue
+            
+            generated_text = generated.get(filename)
+            # A topic whose LLM call failed is not recorded, so the next incremental build retries it
+            if generated_text or not plan["wants_llm"]:
+                self.build_state["topics"][filename] = {"input_hash": plan["input_hash"]}
+            if generated_text:
+                # Sanitize ONLY the generated text to strip markdown wrappers
+                content_parts.append(self._sanitize_text(generated_text))
             
             # 4. Fallback (if LLM failed or no source bundle)
             if not content_parts:
@@ -401,7 +563,7 @@ Remember: "Unknown" is better than a lie.
                 provenance = "fallback"
             else:
                 final_content = f"# {keywords[0]}\n\n" + "\n\n".join(content_parts)
-                provenance = "llm_enhanced" if context_text else "dossier_extract"
+                provenance = "llm_enhanced" if has_evidence else "dossier_extract"
             
             # Build final content
             if content_parts:
@@ -463,79 +625,44 @@ Remember: "Unknown" is better than a lie.
         return None
 
     def run_crawler(self, base_url: str):
-        """Recursive crawler to find more evidence (Depth 2)."""
-        logger.info(f"Starting Recursive Crawler for {base_url}...")
-        start_time = datetime.datetime.now()
-        
-        # Initialize Stats (Enriched)
-        self.crawl_stats["assets"] = []
-        self.crawl_stats["status_codes"] = {}
+        """Concurrent, sitemap-seeded, topic-prioritized crawler to find more evidence (Depth 2)."""
+        from kb_crawler import SiteCrawler, TopicScorer
         
-        # Normalize base URL (strip trailing slash)
-        if base_url.endswith("/"): base_url = base_url[:-1]
-        domain = urlparse(base_url).netloc
-
-        # Initial Queue: (url, depth)
-        queue = [(base_url, 0)]
-        
-        # Add standard paths to queue (depth 1 equivalents)
-        standard_paths = [
-            "pricing", "services", "solutions", "faq", "docs", 
-            "about", "contact", "privacy", "terms"
-        ]
-        for p in standard_paths:
-            queue.append((f"{base_url}/{p}", 1))
-
-        visited = set()
-        
-        # Use a session for connection pooling
-        import requests
-        session = requests.Session()
-        session.headers.update({"User-Agent": "X-Agent-Factory/1.0"})
+        logger.info(f"Starting Crawler for {base_url}...")
+        start_time = datetime.datetime.now()
         
-        while queue and len(self.generated_files) < self.max_files:
-            url, depth = queue.pop(0)
-            
-            if url in visited: continue
-            visited.add(url)
-            
-            # Depth Gate
-            if depth > 2: continue
-
-            try:
-                logger.info(f"Crawling: {url} (Depth {depth})")
-                
-                # Fetch content and Code
-                try:
-                    resp = session.get(url, timeout=10)
-                    code = resp.status_code
-                    self.crawl_stats["status_codes"][url] = code
-                    
-                    if code != 200:
-                        self.crawl_stats["blocked_urls"].append(url)
-                        continue
-                        
-                    content_type = resp.headers.get('Content-Type', '').lower()
-                    
-                    # Asset Filter
-                    if 'text/html' not in content_type:
-                        self.crawl_stats["assets"].append(url)
-                        continue
-                        
-                    downloaded = resp.text
-                    
-                except Exception as req_err:
-                    logger.warning(f"Request failed for {url}: {req_err}")
-                    self.crawl_stats["blocked_urls"].append(url)
-                    continue
+        # Fetch pages for uncovered KB topics first
+        topics = {name: spec["keywords"] + spec["tags"]
+                  for name, spec in {**self.file_map, **self.optional_file_map}.items()}
+        known_pages = self._reusable_pages() if self.incremental else {}
+        crawler = SiteCrawler(base_url, max_depth=2, workers=self.crawl_workers,
+                              per_host=self.crawl_per_host, scorer=TopicScorer(topics),
+                              known_pages=known_pages)
+        pages = crawler.crawl()
+        crawled_entries = {}  # url -> index entry of the file written for it
+        try:
+            for page in pages:
+                if len(self.generated_files) >= self.max_files:
+                    break
                 
-                self.crawl_stats["pages_fetched"] += 1
-                self.crawl_stats["urls"].append(url)
-                self.crawl_stats["crawl_depth"] = max(self.crawl_stats["crawl_depth"], depth)
-
-                # Extract Text
-                text = trafilatura.extract(downloaded)
-                if text and len(text) > 200:
+                url, depth = page["url"], page["depth"]
+                known_file = known_pages.get(url, {}).get("file") if page["unchanged"] else None
+                if known_file and not self._reuse_kb_file(known_file):
+                    # File was edited or removed: fetch the page again without validators and rewrite it
+                    logger.info(f"KB file {known_file} changed since the last build, re-fetching {url}")
+                    page = crawler.refetch(url, depth)
+                text = page["text"]
+                filename = None
+                if page["duplicate_of"]:
+                    # Merge: the kept page's file also cites this URL
+                    entry = crawled_entries.get(page["duplicate_of"])
+                    if entry is not None and url not in entry["source_urls"]:
+                        entry["source_urls"].append(url)
+                elif page["unchanged"]:
+                    filename = known_file
+                    if filename:
+                        self.build_stats["pages_reused"] += 1
+                elif text and len(text) > 200:
                     path_slug = urlparse(url).path.strip('/').replace('/', '_') or "homepage"
                     filename = f"60_crawled_{path_slug[:50]}.md"
                     
@@ -547,32 +674,25 @@ Remember: "Unknown" is better than a lie.
                         "summary": f"Crawled content from {url}",
                         "provenance": "crawler"
                     })
-
-                # Extract Links for Depth < 2
-                if depth < 2:
-                    soup = BeautifulSoup(downloaded, 'html.parser')
-                    for link in soup.find_all('a', href=True):
-                        href = link['href']
-                        
-                        # Normalize Link
-                        full_url = urljoin(url, href)
-                        parsed = urlparse(full_url)
-                        
-                        # Internal Logic: Same Domain, HTTP/S
-                        if parsed.netloc == domain and parsed.scheme in ['http', 'https']:
-                            # Filter out typically useless paths
-                            if not any(x in full_url.lower() for x in ['login', 'signup', 'javascript:', 'mailto:']):
-                                # Asset extensions check
-                                if any(full_url.lower().endswith(ext) for ext in ['.pdf', '.jpg', '.png', '.svg']):
-                                     self.crawl_stats["assets"].append(full_url)
-                                     continue
-                                     
-                                if full_url not in visited:
-                                    queue.append((full_url, depth + 1))
-            
-            except Exception as e:
-                logger.warning(f"Failed to crawl {url}: {e}")
+                if filename:
+                    entry = next(f for f in self.generated_files if f["path"] == f"kb/{filename}")
+                    if page["unchanged"]:
+                        # Duplicates merged by the last build are re-merged as this crawl finds them
+                        entry["source_urls"] = [url]
+                    crawled_entries[url] = entry
+                
+                self.build_state["pages"][url] = {
+                    "etag": page["etag"],
+                    "last_modified": page["last_modified"],
+                    "content_sha256": page["content_sha256"],
+                    "links": page["links"],
+                    "minhash": page["minhash"],
+                    "file": filename
+                }
+        finally:
+            pages.close()
         
+        self.crawl_stats.update(crawler.stats)
         elapsed = (datetime.datetime.now() - start_time).total_seconds() * 1000
         self.crawl_stats["elapsed_ms"] = int(elapsed)
 
@@ -627,6 +747,10 @@ Remember: "Unknown" is better than a lie.
         with open(self.agent_path / "kb_pack_manifest.json", 'w', encoding='utf-8') as f:
             json.dump(manifest_data, f, indent=2)
 
+        # 3. Build state (input hashes for the next incremental build)
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(self.build_state, f, indent=2)
+
     def update_agent_manifest(self):
         """Updates the top-level agent manifest."""
         manifest_path = self.agent_path / "manifest.json"
@@ -647,10 +771,12 @@ Remember: "Unknown" is better than a lie.
         """Main execution flow."""
         logger.info(f"Starting KB Builder for {self.slug}")
         
-        # Ensure KB dir exists (clean it if it does)
-        if self.kb_dir.exists():
+        # Incremental builds keep the previous KB; full builds start clean
+        if self.incremental and self.kb_dir.exists():
+            self._load_previous_build()
+        elif self.kb_dir.exists():
             shutil.rmtree(self.kb_dir)
-        self.kb_dir.mkdir(parents=True)
+        self.kb_dir.mkdir(parents=True, exist_ok=True)
         
         dossier = self._load_dossier()
         base_url = dossier.get("target_url") or dossier.get("client_profile", {}).get("url")
@@ -665,10 +791,15 @@ Remember: "Unknown" is better than a lie.
         self.build_core_files(dossier)
 
         # 3. Indices & Manifests
+        if self.incremental:
+            self._remove_stale_files()
         self.generate_indices()
         self.update_agent_manifest()
         
         logger.info(f"KB Build Complete. {len(self.generated_files)} files created.")
+        if self.incremental:
+            logger.info(f"Incremental: reused {self.build_stats['pages_reused']} crawled pages, "
+                        f"{self.build_stats['topics_reused']} core topics; {self.build_stats['llm_calls']} LLM calls.")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="KB Library Builder")
@@ -676,9 +807,17 @@ if __name__ == "__main__":
     parser.add_argument("--dossier", help="Direct path to dossier.json (overrides default)")
     parser.add_argument("--min-files", type=int, default=25)
     parser.add_argument("--keys", help="API keys (unused, kept for compat)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse KB files whose crawled pages / topic inputs are unchanged")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="Concurrent LLM topic requests")
+    parser.add_argument("--no-llm-cache", action="store_true",
+                        help="Always call the LLM (LLM_CACHE=refresh regenerates and updates the cache)")
     
     args = parser.parse_args()
     
-    builder = KBLibraryBuilder(args.slug, min_files=args.min_files, dossier_path=args.dossier)
+    from llm_cache import get_llm_cache
+    builder = KBLibraryBuilder(args.slug, min_files=args.min_files, dossier_path=args.dossier,
+                               incremental=args.incremental, llm_concurrency=args.llm_concurrency,
+                               llm_cache=None if args.no_llm_cache else get_llm_cache())
     builder.run()
 
@@ -0,0 +1,94 @@
+"""
+KB Retriever - BM25 chunk retrieval for KB topic synthesis
+Selects the evidence chunks most relevant to a topic within a token budget,
+so each LLM prompt carries its own evidence instead of a truncated dump of
+every source.
+
+Chunks are the dicts produced by KBLibraryBuilder._chunk_text:
+    {"text", "token_count", "source", "title"}
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the "
+    "their this to was we were will with you your".split()
+)
+
+
+def _stem(word: str) -> str:
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word stems without stopwords."""
+    return [_stem(w) for w in re.findall(r"[a-z0-9]+", text.lower()) if w not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of chunks."""
+
+    def __init__(self, chunks: List[Dict], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self.term_freqs: List[Counter] = []
+        self.lengths: List[int] = []
+        doc_freq: Counter = Counter()
+        for chunk in chunks:
+            tf = Counter(tokenize(f"{chunk.get('title', '')} {chunk['text']}"))
+            self.term_freqs.append(tf)
+            self.lengths.append(sum(tf.values()))
+            doc_freq.update(tf.keys())
+        n = len(chunks)
+        self.avg_length = (sum(self.lengths) / n) if n else 0.0
+        self.idf: Dict[str, float] = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def scores(self, query: Iterable[str]) -> List[float]:
+        terms = set(tokenize(" ".join(query)))
+        scores = []
+        for tf, length in zip(self.term_freqs, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self.avg_length) if self.avg_length else self.k1
+            score = 0.0
+            for term in terms:
+                freq = tf.get(term)
+                if freq:
+                    score += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            scores.append(score)
+        return scores
+
+    def search(self, query: Iterable[str]) -> List[Tuple[float, int]]:
+        """(score, chunk index) for chunks matching the query, best first."""
+        ranked = [(s, i) for i, s in enumerate(self.scores(query)) if s > 0]
+        ranked.sort(key=lambda pair: (-pair[0], pair[1]))
+        return ranked
+
+    def select(self, query: Iterable[str], token_budget: int, top_k: int = 12) -> List[Dict]:
+        """
+        Best-matching chunks that fit the token budget. When nothing matches,
+        falls back to chunks in source order (e.g. the overview at the top of
+        the bundle) so the LLM still sees some evidence.
+        """
+        ranked = [i for _, i in self.search(query)] or list(range(len(self.chunks)))
+        selected, used = [], 0
+        for i in ranked:
+            tokens = self.chunks[i]["token_count"]
+            if used + tokens > token_budget:
+                continue
+            selected.append(self.chunks[i])
+            used += tokens
+            if len(selected) >= top_k:
+                break
+        return selected
+
+
+def format_context(chunks: List[Dict]) -> str:
+    """Render chunks with their sources so the LLM can cite [Source](url)."""
+    return "\n\n".join(f"[Source: {c['source']}] {c['title']}\n{c['text']}" for c in chunks)
@@ -12,10 +12,8 @@ import time
 import re
 from bs4 import BeautifulSoup
 from utils import load_env
+from llm_gateway import generate_with_ollama
 
-# Configuration
-OLLAMA_URL = "http://localhost:11434/api/generate"
-GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent"
 
 def load_specialist(name):
     path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'specialists', f'{name}.txt')
@@ -24,51 +22,6 @@ def load_specialist(name):
             return f.read()
     return ""
 
-def generate_with_ollama(persona_context, prompt, model="llama3"):
-    full_prompt = f"{persona_context}\n\n{prompt}"
-    try:
-        response = requests.post(OLLAMA_URL, json={
-            "model": model,
-            "prompt": full_prompt,
-            "stream": False,
-            "format": "json"
-        }, timeout=60)
-        response.raise_for_status()
-        data = response.json()
-        return json.loads(data['response'])
-    except Exception as e:
-        print(f"   ⚠️ Ollama Error: {e}")
-        return None
-
-def generate_with_gemini(persona_context, prompt):
-    api_key = os.environ.get("GOOGLE_API_KEY")
-    if not api_key:
-        return None
-
-    full_prompt = f"{persona_context}\n\n{prompt}"
-    payload = {"contents": [{"parts": [{"text": full_prompt}]}]}
-    
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            response = requests.post(
-                f"{GEMINI_URL}?key={api_key}",
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=30
-            )
-            if response.status_code == 429:
-                print(f"   ⚠️ Gemini Rate Limit. Waiting {2 * (attempt + 1)}s...")
-                time.sleep(2 * (attempt + 1))
-                continue
-            response.raise_for_status()
-            return response.json()['candidates'][0]['content']['parts'][0]['text']
-        except Exception as e:
-            print(f"   ⚠️ Gemini Attempt {attempt+1} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2)
-    return None
-
 # ============================================================
 # STAGE 1: WEBWORKER - Technical Spider
 # ============================================================
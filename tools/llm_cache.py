@@ -0,0 +1,223 @@
+"""
+LLM Cache - content-addressed response cache for LLM calls (SQLite)
+A response is keyed by the SHA-256 of everything that determines it:
+provider, model, system prompt, user prompt, temperature and response format.
+Re-running the factory on the same inputs therefore costs no tokens.
+
+- opt-in per call site: pass cache=get_llm_cache() (or an LLMCache) to the caller
+- TTL per entry and a size cap (least recently used entries are evicted)
+- error responses are never stored
+- bypass: LLM_CACHE=off disables every cache, LLM_CACHE=refresh regenerates and
+  overwrites; call sites also accept refresh=True
+- hit/miss counters per process, hit counts per entry in the table
+
+Usage:
+    python tools/llm_cache.py                  # entries and hits per model
+    python tools/llm_cache.py --purge          # drop expired entries
+    python tools/llm_cache.py --clear
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DB_PATH = Path(__file__).parent.parent / "intelligence" / "cache" / "llm_cache.db"
+DEFAULT_TTL_HOURS = 24 * 14
+MAX_ENTRIES = 20_000
+
+
+def cache_mode() -> str:
+    """"on" (default), "off" or "refresh", from the LLM_CACHE environment variable."""
+    mode = os.environ.get("LLM_CACHE", "on").strip().lower()
+    return mode if mode in ("off", "refresh") else "on"
+
+
+def cache_key(provider: str, model: str, system_prompt: str, user_prompt: str,
+              temperature: Optional[float] = None, response_format: Optional[str] = None) -> str:
+    """SHA-256 over the canonical JSON of every input that shapes the response."""
+    payload = json.dumps([provider, model, system_prompt, user_prompt, temperature, response_format],
+                         ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def is_error_response(response: Optional[str]) -> bool:
+    return not response or response.startswith("[Error")
+
+
+class LLMCache:
+    """TTL + LRU-capped response store; safe to share between threads."""
+
+    def __init__(self, db_path: Path = DB_PATH, ttl_hours: float = DEFAULT_TTL_HOURS,
+                 max_entries: int = MAX_ENTRIES):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "bypassed": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_schema()
+
+    @contextmanager
+    def _get_conn(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._get_conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                provider TEXT,
+                model TEXT,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used_at REAL NOT NULL,
+                hits INTEGER DEFAULT 0
+            )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used_at)")
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self.stats[name] += n
+
+    # ========================================
+    # LOOKUPS
+    # ========================================
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._get_conn() as conn:
+            row = conn.execute("SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row and row[1] > now:
+                conn.execute("UPDATE llm_cache SET hits = hits + 1, last_used_at = ? WHERE key = ?", (now, key))
+        if row and row[1] > now:
+            self._count("hits")
+            return row[0]
+        self._count("misses")
+        return None
+
+    def put(self, key: str, response: str, provider: str = "", model: str = "",
+            ttl_hours: Optional[float] = None):
+        if is_error_response(response):
+            return
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_hours is None else ttl_hours * 3600
+        with self._get_conn() as conn:
+            conn.execute("""
+            INSERT OR REPLACE INTO llm_cache (key, provider, model, response, created_at, expires_at, last_used_at, hits)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+            """, (key, provider, model, response, now, now + ttl, now))
+            evicted = self._evict(conn, now)
+        self._count("writes")
+        if evicted:
+            self._count("evicted", evicted)
+
+    def _evict(self, conn, now: float) -> int:
+        """Drop expired entries, then the least recently used beyond max_entries."""
+        evicted = conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+        excess = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            evicted += conn.execute("""
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY last_used_at ASC LIMIT ?
+            )""", (excess,)).rowcount
+        return evicted
+
+    def cached(self, provider: str, model: str, system_prompt: str, user_prompt: str,
+               generate: Callable[[], Optional[str]], temperature: Optional[float] = None,
+               response_format: Optional[str] = None, refresh: bool = False) -> Optional[str]:
+        """
+        Return the stored response for these inputs, or call generate() and store
+        its result (unless it is an error). Honors LLM_CACHE=off / refresh.
+        """
+        mode = cache_mode()
+        if mode == "off":
+            self._count("bypassed")
+            return generate()
+        key = cache_key(provider, model, system_prompt, user_prompt, temperature, response_format)
+        if not refresh and mode != "refresh":
+            response = self.get(key)
+            if response is not None:
+                return response
+        else:
+            self._count("bypassed")
+        response = generate()
+        self.put(key, response, provider, model)
+        return response
+
+    # ========================================
+    # MAINTENANCE
+    # ========================================
+
+    def purge_expired(self) -> int:
+        with self._get_conn() as conn:
+            return conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def clear(self) -> int:
+        with self._get_conn() as conn:
+            return conn.execute("DELETE FROM llm_cache").rowcount
+
+    def summary(self) -> Dict:
+        """Stored entries and lifetime hits per (provider, model), plus this process's counters."""
+        with self._get_conn() as conn:
+            rows = conn.execute("""
+            SELECT provider, model, COUNT(*), SUM(hits), SUM(LENGTH(response))
+            FROM llm_cache GROUP BY provider, model ORDER BY provider, model
+            """).fetchall()
+        models = [{"provider": p, "model": m, "entries": n, "hits": h or 0, "bytes": b or 0}
+                  for p, m, n, h, b in rows]
+        return {"entries": sum(m["entries"] for m in models), "models": models, "session": dict(self.stats)}
+
+
+_shared: Dict[Path, LLMCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_llm_cache(db_path: Path = DB_PATH) -> LLMCache:
+    """Process-wide cache per database file."""
+    with _shared_lock:
+        if db_path not in _shared:
+            _shared[db_path] = LLMCache(db_path)
+        return _shared[db_path]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM response cache maintenance")
+    parser.add_argument("--db", default=str(DB_PATH), help="Cache database path")
+    parser.add_argument("--purge", action="store_true", help="Delete expired entries")
+    parser.add_argument("--clear", action="store_true", help="Delete every entry")
+    args = parser.parse_args()
+
+    cache = LLMCache(Path(args.db))
+    if args.clear:
+        logger.info(f"Cleared {cache.clear()} entries")
+    elif args.purge:
+        logger.info(f"Purged {cache.purge_expired()} expired entries")
+    summary = cache.summary()
+    print(f"Entries: {summary['entries']}")
+    for m in summary["models"]:
+        print(f"  {m['provider']}/{m['model']}: {m['entries']} entries, {m['hits']} hits, {m['bytes'] / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,65 +1,305 @@
+"""
+LLM Client - chat completions over OpenAI, Gemini or a local Ollama server
+
+- one pooled HTTP session per client (keep-alive, pool sized to the concurrency limit)
+- at most max_concurrency requests in flight per client, from any thread or coroutine
+- retries on 429/5xx and connection errors with jittered exponential backoff
+  (Retry-After is honored when the server sends it)
+- generate_many() / agenerate() for concurrent calls
+- optional response cache (see llm_cache.py): identical calls are answered
+  from SQLite instead of the provider
+- response_format="json" asks the provider for JSON and rejects replies that
+  do not parse (so they are never cached)
+
+Tools should not build clients per call; llm_gateway.py keeps one per
+provider/model with shared sessions, limits, usage logging and latency metrics.
+
+Usage:
+    client = LLMClient()                                 # OpenAI, gpt-4o
+    client = LLMClient(provider="ollama", model="llama3")
+    client = LLMClient(cache=get_llm_cache())            # from llm_cache import get_llm_cache
+    client.generate(system_prompt, user_prompt)
+    client.generate_many([(system_prompt, prompt) for prompt in prompts])
+    await client.agenerate(system_prompt, user_prompt)
+"""
 import os
-import requests
 import json
-from dotenv import load_dotenv
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+DEFAULT_MODELS = {"openai": "gpt-4o", "ollama": "llama3", "gemini": "gemini-2.0-flash-exp"}
+API_KEY_ENV = {"openai": "OPENAI_API_KEY", "gemini": "GOOGLE_API_KEY"}
+OPENAI_URL = "https://api.openai.com/v1/chat/completions"
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+OLLAMA_URL = "http://localhost:11434"
+DEFAULT_TIMEOUT = 60
+DEFAULT_CONCURRENCY = 4
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@lru_cache(maxsize=None)
+def load_env():
+    """Load .env files once per process, when the first client is created (not on import)."""
+    from dotenv import load_dotenv
+    load_dotenv('.env')
+    load_dotenv('.env.local')
+
+
+class LLMError(Exception):
+    """A request failed after all retries (or with a non-retryable status)."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def new_session(pool_size: int):
+    """Keep-alive requests session whose connection pool holds pool_size connections per host."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
-# Load env immediately upon import to ensure keys are ready
-load_dotenv('.env')
-load_dotenv('.env.local')
 
 class LLMClient:
-    def __init__(self, provider="openai", model="gpt-4o"):
+    def __init__(self, provider="openai", model=None, api_url=None, timeout=DEFAULT_TIMEOUT,
+                 max_concurrency=DEFAULT_CONCURRENCY, max_retries=MAX_RETRIES, backoff=BACKOFF_BASE,
+                 cache=None, session=None, slots=None):
+        """
+        session / slots: share a pooled session and a concurrency semaphore between
+        clients (e.g. several models on one Ollama server); by default each client owns both.
+        """
+        load_env()
+        if provider not in DEFAULT_MODELS:
+            raise ValueError(f"Unknown provider: {provider}")
         self.provider = provider
-        self.model = model
-        self.api_key = os.getenv("OPENAI_API_KEY")
-        self.api_url = "https://api.openai.com/v1/chat/completions"
-        
-        if self.provider == "openai" and not self.api_key:
-            print("⚠️ [LLMClient] Warning: OPENAI_API_KEY not found in environment.")
-
-    def generate(self, system_prompt: str, user_prompt: str, temperature=0.7) -> str:
+        self.model = model or DEFAULT_MODELS[provider]
+        self.api_key = os.getenv(API_KEY_ENV[provider]) if provider in API_KEY_ENV else None
+        if provider == "ollama":
+            base = (api_url or os.getenv("OLLAMA_HOST") or OLLAMA_URL).rstrip("/")
+            self.api_url = base if base.endswith("/api/chat") else base + "/api/chat"
+        elif provider == "gemini":
+            self.api_url = api_url or f"{GEMINI_URL}/{self.model}:generateContent"
+        else:
+            self.api_url = api_url or OPENAI_URL
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache = cache  # LLMCache or None
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+
+        self._slots = slots or threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self._session = session
+        self._executor = None
+
+        if provider in API_KEY_ENV and not self.api_key:
+            print(f"⚠️ [LLMClient] Warning: {API_KEY_ENV[provider]} not found in environment.")
+
+    # ========================================
+    # POOLED TRANSPORT
+    # ========================================
+
+    @property
+    def session(self):
+        """Keep-alive session shared by every call on this client (created on first use)."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = new_session(self.max_concurrency)
+        return self._session
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff; a numeric Retry-After (seconds) wins when larger."""
+        delay = random.uniform(0, min(BACKOFF_MAX, self.backoff * (2 ** attempt)))
+        if retry_after:
+            try:
+                delay = max(delay, min(BACKOFF_MAX, float(retry_after)))
+            except ValueError:
+                pass
+        return delay
+
+    def _post(self, payload: dict, headers: Optional[dict] = None) -> dict:
+        """POST JSON with retries on 429/5xx and connection errors. Raises LLMError."""
+        import requests
+        last_error, status = None, None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            with self._slots:
+                with self._lock:
+                    self.stats["requests"] += 1
+                try:
+                    response = self.session.post(self.api_url, headers=headers, json=payload, timeout=self.timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    last_error, status = e, None
+                else:
+                    if response.status_code < 400:
+                        return response.json()
+                    last_error, status = f"HTTP {response.status_code}: {response.text[:200]}", response.status_code
+                    if status not in RETRY_STATUSES:
+                        break
+                    retry_after = response.headers.get("Retry-After")
+            # Back off outside the slot so waiting requests can use it
+            if attempt < self.max_retries:
+                with self._lock:
+                    self.stats["retries"] += 1
+                time.sleep(self._retry_delay(attempt, retry_after))
+        with self._lock:
+            self.stats["failures"] += 1
+        raise LLMError(str(last_error), status)
+
+    # ========================================
+    # GENERATION
+    # ========================================
+
+    def generate(self, system_prompt: str, user_prompt: str, temperature=0.7, refresh=False,
+                 response_format: Optional[str] = None) -> str:
         """
         Generates text using the configured LLM provider.
+        Errors are returned as "[Error...]" strings rather than raised (and never cached).
+        temperature=None leaves it to the provider; refresh=True skips the cache
+        lookup but stores the new response.
         """
-        if self.provider == "openai":
-            return self._generate_openai(system_prompt, user_prompt, temperature)
-        elif self.provider == "ollama":
-            return self._generate_ollama(system_prompt, user_prompt, temperature)
-        else:
-            raise ValueError(f"Unknown provider: {self.provider}")
+        if self.cache is None:
+            return self._generate(system_prompt, user_prompt, temperature, response_format)
+        return self.cache.cached(self.provider, self.model, system_prompt, user_prompt,
+                                 lambda: self._generate(system_prompt, user_prompt, temperature, response_format),
+                                 temperature=temperature, response_format=response_format, refresh=refresh)
+
+    def _generate(self, system_prompt, user_prompt, temperature, response_format=None) -> str:
+        """One provider call (with transport retries); text or an "[Error...]" string."""
+        if self.provider in API_KEY_ENV and not self.api_key:
+            return f"[Error: Missing {API_KEY_ENV[self.provider]}]"
+        build = {"openai": self._openai_request, "ollama": self._ollama_request,
+                 "gemini": self._gemini_request}[self.provider]
+        payload, headers = build(system_prompt, user_prompt, temperature, response_format)
+
+        start = time.perf_counter()
+        data = None
+        try:
+            data = self._post(payload, headers)
+            text = self._reply_text(data)
+            if response_format == "json":
+                json.loads(text)
+        except Exception as e:
+            self._observe(time.perf_counter() - start, data, ok=False)
+            print(f"❌ [LLMClient] {self.provider} Error: {e}")
+            return f"[Error generating content: {e}]"
+        self._observe(time.perf_counter() - start, data, ok=True)
+        return text
 
-    def _generate_openai(self, system_prompt, user_prompt, temperature):
-        if not self.api_key:
-            return "[Error: Missing OpenAI API Key]"
+    def _observe(self, seconds: float, data: Optional[dict], ok: bool):
+        """Called after every provider call (cache hits excluded); a hook for metrics."""
 
+    def _messages(self, system_prompt, user_prompt) -> List[dict]:
+        messages = [{"role": "user", "content": user_prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+        return messages
+
+    def _openai_request(self, system_prompt, user_prompt, temperature, response_format):
         headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
         }
-        
         payload = {
             "model": self.model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            "temperature": temperature,
+            "messages": self._messages(system_prompt, user_prompt),
             "max_tokens": 4096
         }
+        if temperature is not None:
+            payload["temperature"] = temperature
+        if response_format == "json":
+            payload["response_format"] = {"type": "json_object"}
+        return payload, headers
 
-        try:
-            response = requests.post(self.api_url, headers=headers, json=payload, timeout=60)
-            response.raise_for_status()
-            data = response.json()
+    def _ollama_request(self, system_prompt, user_prompt, temperature, response_format):
+        payload = {
+            "model": self.model,
+            "messages": self._messages(system_prompt, user_prompt),
+            "stream": False
+        }
+        if temperature is not None:
+            payload["options"] = {"temperature": temperature}
+        if response_format == "json":
+            payload["format"] = "json"
+        return payload, None
+
+    def _gemini_request(self, system_prompt, user_prompt, temperature, response_format):
+        # Persona and task in one user turn, as the factory's Gemini prompts were written for
+        text = "\n\n".join(part for part in (system_prompt, user_prompt) if part)
+        payload = {"contents": [{"role": "user", "parts": [{"text": text}]}]}
+        config = {}
+        if temperature is not None:
+            config["temperature"] = temperature
+        if response_format == "json":
+            config["responseMimeType"] = "application/json"
+        if config:
+            payload["generationConfig"] = config
+        # Key in a header, not the URL, so it never shows up in logged errors
+        return payload, {"Content-Type": "application/json", "x-goog-api-key": self.api_key}
+
+    def _reply_text(self, data: dict) -> str:
+        if self.provider == "openai":
             return data['choices'][0]['message']['content'].strip()
-        except Exception as e:
-            print(f"❌ [LLMClient] OpenAI Error: {e}")
-            return f"[Error generating content: {e}]"
+        if self.provider == "gemini":
+            return data['candidates'][0]['content']['parts'][0]['text'].strip()
+        return data['message']['content'].strip()
+
+    def usage(self, data: Optional[dict]) -> Tuple[int, int]:
+        """(input_tokens, output_tokens) reported in a provider reply, 0 when absent."""
+        data = data or {}
+        if self.provider == "openai":
+            usage = data.get("usage") or {}
+            return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+        if self.provider == "gemini":
+            usage = data.get("usageMetadata") or {}
+            return usage.get("promptTokenCount", 0), usage.get("candidatesTokenCount", 0)
+        return data.get("prompt_eval_count", 0), data.get("eval_count", 0)
+
+    # ========================================
+    # CONCURRENT CALLS
+    # ========================================
+
+    def _pool(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    from concurrent.futures import ThreadPoolExecutor
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                        thread_name_prefix="llm")
+        return self._executor
+
+    def generate_many(self, prompts: Sequence[Tuple[str, str]], temperature=0.7) -> List[str]:
+        """generate() for each (system_prompt, user_prompt), max_concurrency at a time; results in input order."""
+        futures = [self._pool().submit(self.generate, system_prompt, user_prompt, temperature)
+                   for system_prompt, user_prompt in prompts]
+        return [future.result() for future in futures]
+
+    async def agenerate(self, system_prompt: str, user_prompt: str, temperature=0.7) -> str:
+        """generate() without blocking the event loop; shares the client's concurrency limit."""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool(), self.generate, system_prompt, user_prompt, temperature)
 
-    def _generate_ollama(self, system_prompt, user_prompt, temperature):
-        # Placeholder for Phase 27
-        # Would POST to http://localhost:11434/api/chat
-        pass
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._session is not None:
+                self._session.close()
+                self._session = None
 
 # Simple test if run directly
 if __name__ == "__main__":
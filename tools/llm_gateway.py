@@ -0,0 +1,333 @@
+"""
+LLM Gateway - the one path from factory tools to LLM providers
+Replaces the generate_with_ollama / generate_with_gemini copies that each tool
+carried (each with its own requests.post, retry loop and timeout). Every call
+goes through a shared LLMClient per (provider, model), which gives one place for:
+
+- connection pooling: one keep-alive session per provider
+- concurrency limits per provider (a local Ollama box takes fewer parallel requests)
+- transport retries with jittered backoff (LLMClient)
+- the opt-in response cache (llm_cache.py)
+- usage logging: Gemini calls append to intelligence/usage/gemini_log.json,
+  which the dashboard reads; every provider is tallied in memory
+- per-model latency histograms
+- a circuit breaker per provider endpoint: after BREAKER_THRESHOLD consecutive
+  transport failures (connection refused, timeout, 429/5xx) the provider is
+  skipped for BREAKER_COOLDOWN seconds, then one half-open probe decides
+  whether it is back. A dead backend costs microseconds per call, not a timeout.
+- failover chains (FAILOVER_CHAINS): when a provider fails or its circuit is
+  open the next one is tried, e.g. local Ollama -> Gemini. When the whole chain
+  fails the helpers return None and the caller applies its deterministic
+  fallback (default ranking, template email, ...).
+
+Usage:
+    from llm_gateway import generate_with_gemini, generate_with_ollama
+    text = generate_with_gemini(persona, prompt)              # str or None
+    data = generate_with_ollama(persona, prompt, model="qwen2.5:32b", cache=cache)  # dict or None
+
+    from llm_gateway import get_gateway
+    get_gateway().report()      # usage and latency per provider/model
+    get_gateway().circuits()    # breaker state per provider
+"""
+import json
+import time
+import logging
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from llm_client import API_KEY_ENV, DEFAULT_MODELS, DEFAULT_TIMEOUT, RETRY_STATUSES, LLMClient, LLMError, new_session
+
+logger = logging.getLogger(__name__)
+
+# Parallel requests per provider endpoint, shared by all of its models
+PROVIDER_CONCURRENCY = {"ollama": 2, "gemini": 4, "openai": 4}
+PROVIDER_TIMEOUTS = {"ollama": 60, "gemini": 30, "openai": 60}
+# Transport retries per call; a stalled local box should fail over, not be waited on 4x
+PROVIDER_RETRIES = {"ollama": 1, "gemini": 3, "openai": 3}
+# Providers tried, in order, after the requested one fails
+FAILOVER_CHAINS = {"ollama": ("gemini",)}
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 30.0
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (thread-safe)."""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self.counts[bisect_left(self.bounds, seconds)] += 1
+            self.total += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile (None if empty or past the last bound)."""
+        with self._lock:
+            n = sum(self.counts)
+            if not n:
+                return None
+            rank, seen = q * n, 0
+            for i, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank:
+                    return self.bounds[i] if i < len(self.bounds) else None
+        return None
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            n = sum(self.counts)
+            buckets = {f"<={b}s": c for b, c in zip(self.bounds, self.counts)}
+            buckets[f">{self.bounds[-1]}s"] = self.counts[-1]
+            mean = self.total / n if n else 0.0
+        return {"count": n, "mean_s": round(mean, 3), "p50_s": self.quantile(0.5),
+                "p95_s": self.quantile(0.95), "buckets": buckets}
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker for one provider endpoint (thread-safe).
+    closed -> open after `threshold` failures in a row; open -> half-open once
+    `cooldown` seconds have passed, letting a single probe through; the probe's
+    outcome closes the circuit or re-opens it for another cooldown.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.stats = {"opened": 0, "rejected": 0}
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a call may go out now (counts a rejection otherwise)."""
+        with self._lock:
+            if self.state == self.OPEN and self.clock() - self._opened_at >= self.cooldown:
+                self.state, self._probing = self.HALF_OPEN, False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.stats["rejected"] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"[LLMGateway] {self.name} circuit closed")
+            self.state, self.failures, self._probing = self.CLOSED, 0, False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            # Late failures of calls sent before the circuit opened do not extend the cooldown
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.threshold):
+                self.state, self._opened_at = self.OPEN, self.clock()
+                self.stats["opened"] += 1
+                logger.warning(f"[LLMGateway] {self.name} circuit open after {self.failures} failures; "
+                               f"skipping it for {self.cooldown:g}s")
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, **self.stats}
+
+
+class GatewayClient(LLMClient):
+    """LLMClient that reports latency, token usage and endpoint health to its gateway."""
+
+    def __init__(self, gateway: "LLMGateway", *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gateway = gateway
+
+    def _post(self, payload: dict, headers: Optional[dict] = None) -> dict:
+        breaker = self.gateway.breaker(self.provider)
+        try:
+            data = super()._post(payload, headers)
+        except LLMError as e:
+            # Only an unreachable or overloaded endpoint trips the breaker; a 400 means it is up
+            if e.status is None or e.status in RETRY_STATUSES:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return data
+
+    def _observe(self, seconds: float, data: Optional[dict], ok: bool):
+        self.gateway.record(self, seconds, data, ok)
+
+
+class LLMGateway:
+    """Shared LLM clients keyed by (provider, model), their circuit breakers and metrics."""
+
+    def __init__(self, concurrency: Optional[Dict[str, int]] = None, timeouts: Optional[Dict[str, float]] = None,
+                 api_urls: Optional[Dict[str, str]] = None, log_usage: bool = True,
+                 retries: Optional[Dict[str, int]] = None, failover: Optional[Dict[str, Sequence[str]]] = None,
+                 breaker_threshold: int = BREAKER_THRESHOLD, breaker_cooldown: float = BREAKER_COOLDOWN):
+        """failover: {provider: providers to try next}; replaces FAILOVER_CHAINS ({} disables failover)."""
+        self.concurrency = {**PROVIDER_CONCURRENCY, **(concurrency or {})}
+        self.timeouts = {**PROVIDER_TIMEOUTS, **(timeouts or {})}
+        self.retries = {**PROVIDER_RETRIES, **(retries or {})}
+        self.failover = dict(FAILOVER_CHAINS if failover is None else failover)
+        self.api_urls = api_urls or {}
+        self.log_usage = log_usage
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self._clients: Dict[Tuple[str, str], GatewayClient] = {}
+        self._shared: Dict[str, Tuple[object, threading.BoundedSemaphore]] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._usage: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+
+    def client(self, provider: str, model: Optional[str] = None) -> GatewayClient:
+        """The shared client for provider/model (models of one provider share a session and limit)."""
+        model = model or DEFAULT_MODELS.get(provider)
+        with self._lock:
+            key = (provider, model)
+            if key not in self._clients:
+                limit = self.concurrency.get(provider, 4)
+                if provider not in self._shared:
+                    self._shared[provider] = (new_session(limit), threading.BoundedSemaphore(limit))
+                session, slots = self._shared[provider]
+                api_url = self.api_urls.get(provider)
+                if api_url and provider == "gemini":
+                    api_url = f"{api_url.rstrip('/')}/{model}:generateContent"
+                self._clients[key] = GatewayClient(
+                    self, provider, model, api_url=api_url, timeout=self.timeouts.get(provider, DEFAULT_TIMEOUT),
+                    max_concurrency=limit, max_retries=self.retries.get(provider, 3), session=session, slots=slots)
+            return self._clients[key]
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        """The circuit breaker of a provider endpoint (shared by all of its models)."""
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(provider, self.breaker_threshold, self.breaker_cooldown)
+            return self._breakers[provider]
+
+    # ========================================
+    # CALLS
+    # ========================================
+
+    def generate(self, provider: str, system_prompt: str, user_prompt: str, model: Optional[str] = None,
+                 temperature: Optional[float] = None, response_format: Optional[str] = None,
+                 cache=None, refresh: bool = False, failover: Optional[Sequence[str]] = None) -> Optional[str]:
+        """
+        Text reply from the first provider in the chain that answers, or None if
+        every one failed. model applies to `provider`; failover providers use
+        their default model. failover: overrides the configured chain (() for none).
+        cache: optional LLMCache for this call.
+        """
+        chain = [(provider, model)]
+        chain += [(p, None) for p in (self.failover.get(provider, ()) if failover is None else failover)]
+        for provider, model in chain:
+            text = self._generate_one(self.client(provider, model), system_prompt, user_prompt,
+                                      temperature, response_format, cache, refresh)
+            if text:
+                return text
+        return None
+
+    def _generate_one(self, client: GatewayClient, system_prompt, user_prompt, temperature, response_format,
+                      cache, refresh) -> Optional[str]:
+        def call():
+            # A missing API key fails without a request, so it must not take the half-open probe
+            if client.provider not in API_KEY_ENV or client.api_key:
+                if not self.breaker(client.provider).allow():
+                    return f"[Error: {client.provider} circuit open]"
+            return client._generate(system_prompt, user_prompt, temperature, response_format)
+
+        if cache is not None:
+            # Cache hits are served even while the provider's circuit is open
+            text = cache.cached(client.provider, client.model, system_prompt, user_prompt, call,
+                                temperature=temperature, response_format=response_format, refresh=refresh)
+        else:
+            text = call()
+        return None if not text or text.startswith("[Error") else text
+
+    def generate_json(self, provider: str, system_prompt: str, user_prompt: str, **kwargs) -> Optional[dict]:
+        """JSON-mode call; the parsed reply, or None on failure (invalid JSON is never cached)."""
+        text = self.generate(provider, system_prompt, user_prompt, response_format="json", **kwargs)
+        return json.loads(text) if text else None
+
+    # ========================================
+    # METRICS
+    # ========================================
+
+    def record(self, client: LLMClient, seconds: float, data: Optional[dict], ok: bool):
+        key = (client.provider, client.model)
+        input_tokens, output_tokens = client.usage(data) if ok else (0, 0)
+        with self._lock:
+            histogram = self._latency.setdefault(key, LatencyHistogram())
+            usage = self._usage.setdefault(key, {"calls": 0, "errors": 0, "input_tokens": 0, "output_tokens": 0})
+            usage["calls"] += 1
+            usage["errors"] += 0 if ok else 1
+            usage["input_tokens"] += input_tokens
+            usage["output_tokens"] += output_tokens
+        histogram.observe(seconds)
+        if self.log_usage and client.provider == "gemini":
+            from usage_logger import log_gemini_call
+            with self._log_lock:  # the log is a read-modify-write JSON file
+                log_gemini_call(model=client.model, input_tokens=input_tokens,
+                                output_tokens=output_tokens, success=ok)
+
+    def report(self) -> Dict[str, Dict]:
+        """{"provider/model": {calls, errors, tokens, latency histogram}}."""
+        with self._lock:
+            keys = sorted(self._usage)
+            usage = {k: dict(self._usage[k]) for k in keys}
+        return {f"{p}/{m}": {**usage[(p, m)], "latency": self._latency[(p, m)].snapshot()} for p, m in keys}
+
+    def circuits(self) -> Dict[str, Dict]:
+        """{provider: {state, failures, opened, rejected}}."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {provider: breaker.snapshot() for provider, breaker in sorted(breakers.items())}
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """Process-wide gateway (created on first use)."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
+
+
+# ========================================
+# DROP-IN HELPERS (former per-tool copies)
+# ========================================
+
+def generate_with_gemini(persona_context: str, prompt: str, model: Optional[str] = None,
+                         cache=None, temperature: Optional[float] = None) -> Optional[str]:
+    """Gemini text for persona + prompt, or None."""
+    return get_gateway().generate("gemini", persona_context, prompt, model=model, temperature=temperature,
+                                  cache=cache)
+
+
+def generate_with_ollama(persona_context: str, prompt: str, model: str = "llama3",
+                         cache=None) -> Optional[dict]:
+    """Ollama JSON-mode reply for persona + prompt, parsed, or None (fails over per FAILOVER_CHAINS)."""
+    return get_gateway().generate_json("ollama", persona_context, prompt, model=model, cache=cache)
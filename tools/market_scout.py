@@ -2,18 +2,16 @@ import sys
 # Force UTF-8 output for Windows console emoji support
 sys.stdout.reconfigure(encoding='utf-8')
 import argparse
-import json
 import random
 import os
-import requests
 import time
 from datetime import datetime
 from duckduckgo_search import DDGS
 from utils import save_json, get_timestamp
+from llm_gateway import generate_with_ollama
 
 # Configuration
 OUTPUT_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'intelligence', 'daily_opportunities.json')
-OLLAMA_URL = "http://localhost:11434/api/generate"
 
 def load_specialist(name):
     """Loads the persona context from the specialists directory."""
@@ -67,34 +65,24 @@ def scan_vertical_live(vertical):
     [/TASK]
     """
     
-    try:
-        response = requests.post(OLLAMA_URL, json={
-            "model": "llama3",
-            "prompt": prompt,
-            "stream": False,
-            "format": "json"
-        })
-        response.raise_for_status()
-        data = response.json()
-        result = json.loads(data['response'])
-        
+    result = generate_with_ollama("", prompt)
+    if result is not None:
         # Add metadata
         result['id'] = f"opp_{int(time.time())}"[-6:]
         result['vertical'] = vertical
         return result
-        
-    except Exception as e:
-        print(f"❌ Error scanning {vertical}: {e}")
-        # Fallback for stability if Ollama fails mid-scan
-        return {
-            "id": "err_001",
-            "vertical": vertical,
-            "pain_point": "Scan failed - defaulting to manual review",
-            "source": "System Error",
-            "tam_score": 0.0,
-            "competitors": [],
-            "recommendation": "WAIT"
-        }
+    
+    print(f"❌ Error scanning {vertical}: no JSON reply from Ollama")
+    # Fallback for stability if Ollama fails mid-scan
+    return {
+        "id": "err_001",
+        "vertical": vertical,
+        "pain_point": "Scan failed - defaulting to manual review",
+        "source": "System Error",
+        "tam_score": 0.0,
+        "competitors": [],
+        "recommendation": "WAIT"
+    }
 
 def run_scout():
     print("🔭 Market Scout: R&D Engine Starting (LIVE MODE)...")
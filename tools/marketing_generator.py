@@ -12,13 +12,9 @@ def load_specialist(name):
             return f.read()
     return f"You are {name}, an expert in your field."
 
-import requests
-
-import requests
 import json
-import time
 
-OLLAMA_URL = "http://localhost:11434/api/generate"
+from llm_gateway import generate_with_ollama
 
 def generate_marketing_copy(agent_name, vertical, tone="Persuasive"):
     # 1. Load Sparkle (V2.0)
@@ -45,17 +41,12 @@ def generate_marketing_copy(agent_name, vertical, tone="Persuasive"):
     [/TASK]
     """
     
+    result = generate_with_ollama("", prompt)
+    if result is None:
+        print("❌ Sparkle Error: no JSON reply from Ollama")
+        return None
+    
     try:
-        response = requests.post(OLLAMA_URL, json={
-            "model": "llama3",
-            "prompt": prompt,
-            "stream": False,
-            "format": "json"
-        })
-        response.raise_for_status()
-        data = response.json()
-        result = json.loads(data['response'])
-        
         # Output Results
         print("\nSPARKLE'S CAMPAIGN:")
         print(json.dumps(result, indent=2))
@@ -12,27 +12,13 @@ def load_specialist(name):
             return f.read()
     return f"You are {name}, an expert Systems Architect."
 
-import requests
 import json
 
+from llm_gateway import generate_with_gemini
+
 # Configuration
 load_env()
-API_KEY = os.getenv("GOOGLE_API_KEY")
-
-def generate_with_gemini(system_prompt, user_message):
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={API_KEY}"
-    payload = {
-        "contents": [
-            {"role": "user", "parts": [{"text": system_prompt + "\n\n" + user_message}]} 
-        ]
-    }
-    try:
-        response = requests.post(url, json=payload)
-        response.raise_for_status()
-        return response.json()['candidates'][0]['content']['parts'][0]['text']
-    except Exception as e:
-        print(f"❌ Gemini Error: {e}")
-        return None
+GEMINI_MODEL = "gemini-2.5-flash"
 
 def build_persona(vertical, agent_name):
     # 1. Load Troy
@@ -62,7 +48,7 @@ def build_persona(vertical, agent_name):
     Do not include fluff. Output raw text for the LLM.
     """
     
-    skeleton_content = generate_with_gemini(troy_context, prompt_request_skeleton)
+    skeleton_content = generate_with_gemini(troy_context, prompt_request_skeleton, model=GEMINI_MODEL)
     
     # 4. Architect Persona Context (The Soul)
     prompt_request_soul = f"""
@@ -78,7 +64,7 @@ def build_persona(vertical, agent_name):
     This is for a Tavus Video Replica to 'act' the part.
     """
     
-    soul_content = generate_with_gemini(troy_context, prompt_request_soul)
+    soul_content = generate_with_gemini(troy_context, prompt_request_soul, model=GEMINI_MODEL)
     
     # Clean Parse & Save Both
     agent_dir = f"agents/{agent_name.lower()}_{vertical.lower().replace(' ', '_')}"
@@ -19,10 +19,10 @@ from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
 import requests
-import yaml
 from dotenv import load_dotenv
 
 # Import G1.9 DB
+from growth_config import load_config
 from growth_db import GrowthDB
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -30,7 +30,6 @@ logger = logging.getLogger(__name__)
 
 # Paths
 BASE_DIR = Path(__file__).parent.parent / "growth"
-CONFIG_PATH = BASE_DIR / "config.yaml"
 ENV_PATH = BASE_DIR / ".env.growth"
 
 if ENV_PATH.exists():
@@ -49,7 +48,7 @@ class PlacesScout:
     
     def __init__(self):
         self.db = GrowthDB()
-        self.config = self._load_config()
+        self.config = load_config()
         self.places_config = self.config.get("sources", {}).get("google_places", {})
         self.enabled = self.places_config.get("enabled", False)
         
@@ -70,12 +69,6 @@ class PlacesScout:
             logger.warning("GMAPS_API_KEY not found. Places Scout disabled.")
             self.enabled = False
 
-    def _load_config(self) -> dict:
-        if CONFIG_PATH.exists():
-            with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        return {}
-
     # ========================================
     # STAGE 1: BATCH DISCOVERY
     # ========================================
@@ -18,27 +18,15 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Set
 from urllib.parse import urlparse
 
-import requests
-import yaml
+from growth_config import get_config
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # Paths
-CONFIG_PATH = Path(__file__).parent.parent / "growth" / "config.yaml"
 CACHE_DIR = Path(__file__).parent.parent / "growth" / "cache" / "enrichment"
 CACHE_TTL_HOURS = 24
 
-
-def load_config() -> dict:
-    if CONFIG_PATH.exists():
-        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    return {}
-
-
-CONFIG = load_config()
-
 # Industry keywords for detection
 INDUSTRY_KEYWORDS = {
     "HVAC": ["hvac", "heating", "cooling", "air conditioning", "furnace"],
@@ -76,6 +64,7 @@ class ProspectEnricher:
     """Phase G1.6: Enrich prospects with buyer classification and ICP matching."""
     
     def __init__(self):
+        import requests
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
         self.session = requests.Session()
         self.session.headers.update({
@@ -83,10 +72,11 @@ class ProspectEnricher:
         })
         
         # Load config
-        self.icp_lanes = CONFIG.get("icp_lanes", {})
-        self.persona_markers = CONFIG.get("persona_markers", {})
-        self.domain_denylist = set(CONFIG.get("domain_denylist", []))
-        self.buyer_scoring = CONFIG.get("buyer_scoring", {})
+        config = get_config()
+        self.icp_lanes = config.icp_lanes
+        self.persona_markers = config.persona_markers
+        self.denylist = config.denylist
+        self.buyer_scoring = config.get("buyer_scoring", {})
     
     def canonicalize_domain(self, domain: str) -> str:
         """Normalize domain: strip www, lowercase, remove tracking."""
@@ -100,18 +90,10 @@ class ProspectEnricher:
         return domain
     
     def is_denylist_domain(self, domain: str) -> bool:
-        """Check if domain is in denylist."""
+        """Check if domain, or a parent domain of it (e.g. *.blogspot.com), is in the denylist."""
         if not domain:
             return False
-        canonical = self.canonicalize_domain(domain)
-        # Check exact match
-        if canonical in self.domain_denylist:
-            return True
-        # Check suffix match (e.g., blogspot.com)
-        for denylist in self.domain_denylist:
-            if canonical.endswith(denylist):
-                return True
-        return False
+        return self.denylist.match(self.canonicalize_domain(domain)) is not None
     
     def _get_cache_path(self, domain: str) -> Path:
         domain_hash = hashlib.md5(domain.encode()).hexdigest()
@@ -153,21 +135,21 @@ class ProspectEnricher:
         
         # Check AGENCY markers
         agency_markers = self.persona_markers.get("agency", [])
-        agency_matches = [m for m in agency_markers if m.lower() in text]
+        agency_matches = [m for m in agency_markers if m in text]
         if len(agency_matches) >= 2:
             reasons = [f"agency:{m}" for m in agency_matches[:3]]
             return "AGENCY", reasons
         
         # Check VENDOR markers
         vendor_markers = self.persona_markers.get("vendor", [])
-        vendor_matches = [m for m in vendor_markers if m.lower() in text]
+        vendor_matches = [m for m in vendor_markers if m in text]
         if len(vendor_matches) >= 2:
             reasons = [f"vendor:{m}" for m in vendor_matches[:3]]
             return "VENDOR", reasons
         
         # Check CREATOR markers
         creator_markers = self.persona_markers.get("creator", [])
-        creator_matches = [m for m in creator_markers if m.lower() in text]
+        creator_matches = [m for m in creator_markers if m in text]
         if len(creator_matches) >= 2:
             reasons = [f"creator:{m}" for m in creator_matches[:3]]
             return "CREATOR", reasons
@@ -215,10 +197,10 @@ class ProspectEnricher:
             score_boost = lane_config.get("score_boost", 0)
             
             # Count positive matches
-            positive_matches = sum(1 for kw in positive_kw if kw.lower() in text)
+            positive_matches = sum(1 for kw in positive_kw if kw in text)
             
             # Check for negative matches (disqualifies)
-            has_negative = any(kw.lower() in text for kw in negative_kw)
+            has_negative = any(kw in text for kw in negative_kw)
             
             if positive_matches >= 2 and not has_negative:
                 if positive_matches > best_matches:
@@ -270,6 +252,7 @@ class ProspectEnricher:
     
     def _fetch_and_analyze(self, domain: str, bio: str = "") -> Dict:
         """Fetch domain homepage and analyze."""
+        import requests
         url = f"https://{domain}/"
         
         try:
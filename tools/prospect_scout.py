@@ -8,10 +8,8 @@ import time
 from ddgs import DDGS
 from bs4 import BeautifulSoup
 from utils import load_env
+from llm_gateway import generate_with_gemini, generate_with_ollama
 
-# Configuration
-OLLAMA_URL = "http://localhost:11434/api/generate"
-GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent"
 
 def load_specialist(name):
     path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'specialists', f'{name}.txt')
@@ -20,66 +18,6 @@ def load_specialist(name):
             return f.read()
     return ""
 
-def generate_with_gemini(persona_context, prompt):
-    api_key = os.environ.get("GOOGLE_API_KEY")
-    if not api_key:
-        print("❌ Error: GOOGLE_API_KEY not found.")
-        return None
-
-    full_prompt = f"{persona_context}\n\n{prompt}"
-    
-    payload = {
-        "contents": [{"parts": [{"text": full_prompt}]}]
-    }
-    
-    # Retry Loop (3 attempts)
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            response = requests.post(
-                GEMINI_URL,
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "x-goog-api-key": api_key
-                },
-                timeout=30
-            )
-            
-            # If 429 (Too Many Requests), raise status to trigger except block
-            if response.status_code == 429:
-                print(f"   ⚠️ Gemini Rate Limit (429). Waiting {2 * (attempt + 1)}s...")
-                time.sleep(2 * (attempt + 1))
-                continue
-                
-            response.raise_for_status()
-            return response.json()['candidates'][0]['content']['parts'][0]['text']
-            
-        except Exception as e:
-            print(f"   ⚠️ Gemini Attempt {attempt+1}/{max_retries} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2)
-            else:
-                print("❌ Gemini failed after max retries.")
-                return None
-    return None
-
-def generate_with_ollama(persona_context, prompt, model="llama3"):
-    full_prompt = f"{persona_context}\n\n{prompt}"
-    try:
-        response = requests.post(OLLAMA_URL, json={
-            "model": model,
-            "prompt": full_prompt,
-            "stream": False,
-            "format": "json"
-        })
-        response.raise_for_status()
-        data = response.json()
-        return json.loads(data['response'])
-    except Exception as e:
-        print(f"❌ Ollama Error: {e}")
-        return None
-
 # --- Step 1: The Brain (Troy) ---
 def generate_criteria(vertical):
     print(f"   > 🏗️  Troy: Designing search criteria for '{vertical}'...")
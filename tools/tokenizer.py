@@ -0,0 +1,191 @@
+"""
+Tokenizer - shared tiktoken service for KB builds
+
+- one encoder per encoding name per process (tiktoken.get_encoding is slow to load)
+- encode_batch for many documents (tiktoken encodes them on its thread pool)
+- ordinary encoding: special-token strings in crawled text (e.g. <|endoftext|>)
+  count as plain text instead of raising, and the text is not scanned for them
+- token counts memoized by content hash, and recent encodings kept within a
+  token budget, so a file counted when written is not re-encoded when it is
+  chunked for the index
+- chunking by token offsets: windows are sliced out of the document's UTF-8
+  bytes at window-boundary byte offsets instead of decoding every window
+
+Usage:
+    from tokenizer import get_tokenizer
+    tok = get_tokenizer()
+    tok.count(text)
+    tok.split(text, max_tokens=650, overlap=80)   # [(window_text, token_count), ...]
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import tiktoken
+
+DEFAULT_ENCODING = "cl100k_base"
+# Distinct texts whose token count is remembered (KB builds write ~60 files)
+COUNT_MEMO_SIZE = 4096
+# Tokens kept from recent encodings (about a build's worth of crawled pages)
+TOKEN_MEMO_SIZE = 250_000
+
+
+class Tokenizer:
+    """Token counting and chunking over one tiktoken encoding."""
+
+    def __init__(self, encoding: "tiktoken.Encoding", memo_size: int = COUNT_MEMO_SIZE,
+                 token_memo_size: int = TOKEN_MEMO_SIZE):
+        self.enc = encoding
+        self.memo_size = memo_size
+        self.token_memo_size = token_memo_size
+        self._counts: "OrderedDict[bytes, int]" = OrderedDict()
+        self._tokens: "OrderedDict[bytes, List[int]]" = OrderedDict()
+        self._memo_tokens = 0
+        self._lock = threading.Lock()
+        self.stats = {"count_hits": 0, "count_misses": 0, "encodes_reused": 0}
+
+    # ========================================
+    # ENCODING
+    # ========================================
+
+    def encode(self, text: str) -> List[int]:
+        """Tokens for text, reusing a recent encoding of the same content."""
+        key = self._key(text)
+        tokens = self._recall_tokens(key)
+        if tokens is None:
+            tokens = self.enc.encode_ordinary(text)
+            self._remember(key, tokens)
+        return tokens
+
+    def encode_batch(self, texts: Sequence[str], num_threads: int = 8) -> List[List[int]]:
+        """Encode many documents (in parallel when there are several); also seeds the memos."""
+        keys = [self._key(t) for t in texts]
+        tokens = [self._recall_tokens(k) for k in keys]
+        missing = [i for i, t in enumerate(tokens) if t is None]
+        if len(missing) == 1:
+            encoded = [self.enc.encode_ordinary(texts[missing[0]])]
+        else:
+            encoded = self.enc.encode_ordinary_batch([texts[i] for i in missing], num_threads=num_threads)
+        for i, ids in zip(missing, encoded):
+            tokens[i] = ids
+            self._remember(keys[i], ids)
+        return tokens
+
+    # ========================================
+    # COUNTS
+    # ========================================
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def _remember(self, key: bytes, tokens: List[int]):
+        with self._lock:
+            self._counts[key] = len(tokens)
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.memo_size:
+                self._counts.popitem(last=False)
+            if len(tokens) <= self.token_memo_size // 4 and key not in self._tokens:
+                self._tokens[key] = tokens
+                self._memo_tokens += len(tokens)
+                while self._memo_tokens > self.token_memo_size:
+                    self._memo_tokens -= len(self._tokens.popitem(last=False)[1])
+
+    def _recall(self, key: bytes) -> Optional[int]:
+        with self._lock:
+            count = self._counts.get(key)
+            if count is None:
+                self.stats["count_misses"] += 1
+            else:
+                self.stats["count_hits"] += 1
+                self._counts.move_to_end(key)
+            return count
+
+    def _recall_tokens(self, key: bytes) -> Optional[List[int]]:
+        with self._lock:
+            tokens = self._tokens.get(key)
+            if tokens is not None:
+                self.stats["encodes_reused"] += 1
+                self._tokens.move_to_end(key)
+            return tokens
+
+    def count(self, text: str) -> int:
+        key = self._key(text)
+        count = self._recall(key)
+        if count is None:
+            tokens = self.enc.encode_ordinary(text)
+            self._remember(key, tokens)
+            count = len(tokens)
+        return count
+
+    def count_batch(self, texts: Sequence[str]) -> List[int]:
+        counts = [self._recall(self._key(t)) for t in texts]
+        missing = [i for i, c in enumerate(counts) if c is None]
+        if missing:
+            for i, ids in zip(missing, self.encode_batch([texts[i] for i in missing])):
+                counts[i] = len(ids)
+        return counts
+
+    # ========================================
+    # CHUNKING
+    # ========================================
+
+    @staticmethod
+    def windows(total: int, max_tokens: int, overlap: int) -> List[Tuple[int, int]]:
+        """(start, end) token windows; the stride is at least one token even if overlap >= max_tokens."""
+        if total <= max_tokens:
+            return [(0, total)]
+        stride = max(1, max_tokens - overlap)
+        spans = []
+        for start in range(0, total, stride):
+            end = min(start + max_tokens, total)
+            spans.append((start, end))
+            if end == total:
+                break
+        return spans
+
+    def split(self, text: str, max_tokens: int, overlap: int = 0,
+              tokens: Optional[List[int]] = None) -> List[Tuple[str, int]]:
+        """
+        Split text into overlapping windows of at most max_tokens tokens.
+        Returns [(window_text, token_count)]. A window boundary inside a
+        multi-byte character yields U+FFFD, exactly as decoding the window would.
+        """
+        if tokens is None:
+            count = self.count(text)
+            if count <= max_tokens:
+                return [(text, count)]
+            tokens = self.encode(text)
+        if len(tokens) <= max_tokens:
+            return [(text, len(tokens))]
+
+        spans = self.windows(len(tokens), max_tokens, overlap)
+        # Byte offset of every window edge: one decode_bytes per segment between edges
+        edges = sorted({edge for span in spans for edge in span})
+        offsets = {edges[0]: 0}
+        for start, end in zip(edges, edges[1:]):
+            offsets[end] = offsets[start] + len(self.enc.decode_bytes(tokens[start:end]))
+        try:
+            data = text.encode("utf-8")
+        except UnicodeEncodeError:
+            # Lone surrogates: the encoder replaced them, so decode the windows instead
+            return [(self.enc.decode(tokens[s:e]), e - s) for s, e in spans]
+        return [(data[offsets[s]:offsets[e]].decode("utf-8", "replace"), e - s) for s, e in spans]
+
+    def split_batch(self, texts: Sequence[str], max_tokens: int, overlap: int = 0) -> List[List[Tuple[str, int]]]:
+        """split() for many documents; documents not known to fit are encoded in one batch."""
+        counts = [self._recall(self._key(t)) for t in texts]
+        to_encode = [i for i, c in enumerate(counts) if c is None or c > max_tokens]
+        tokens = dict(zip(to_encode, self.encode_batch([texts[i] for i in to_encode]))) if to_encode else {}
+        return [self.split(text, max_tokens, overlap, tokens=tokens[i]) if i in tokens else [(text, counts[i])]
+                for i, text in enumerate(texts)]
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(encoding_name: str = DEFAULT_ENCODING) -> Tokenizer:
+    """Process-wide Tokenizer (and count memo) for an encoding."""
+    import tiktoken  # deferred: only builds that count tokens pay for loading it
+    return Tokenizer(tiktoken.get_encoding(encoding_name))
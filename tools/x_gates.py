@@ -0,0 +1,168 @@
+"""
+X Gates - Compiled keyword gate engine for X Scout (Phase G1.4)
+Evaluates every keyword set from growth/config.yaml in one pass per field.
+
+Matching keeps the exact semantics of the old `kw.lower() in text` checks.
+A keyword without whitespace can only occur inside a single whitespace-
+delimited token, so each field is split once and every token is looked up in
+a memo of the keywords it contains (tweets reuse a small working vocabulary).
+Multi-word phrases are verified against the full text only when all of their
+words were found inside some token.
+"""
+from itertools import compress
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+# Pain language used by the candidate filter, moment score and lead summary
+PAIN_PHRASES = [
+    "missed calls", "calls going to voicemail", "no one answered",
+    "lost a lead", "lost a customer", "front desk overwhelmed",
+    "can't keep up with calls", "need someone to answer",
+    "after hours calls", "customer", "client", "appointment"
+]
+
+# Org markers for B2B detection
+ORG_MARKERS = ["inc", "llc", "corp", "company", "solutions", "services", "official", "group"]
+
+# Operator roles
+OPERATOR_ROLES = ["owner", "co-owner", "operator", "manager", "office", "dispatcher", "practice manager", "director"]
+
+# Fixed tweet-text tags (tag -> phrases)
+TAG_PHRASES = {
+    "missed_calls": ["missed call"],
+    "after_hours": ["after hours"],
+    "customer_focused": ["customer", "client"],
+    "scheduling": ["appointment", "booking"],
+}
+
+TweetFeatures = Dict[str, FrozenSet[str]]
+
+
+class _FieldScanner:
+    """Single-pass substring matcher for one vocabulary, memoized per token."""
+
+    def __init__(self, vocabulary: Iterable[str], max_memo: int = 200_000):
+        words = sorted({w for w in vocabulary if w})
+        singles = {w for w in words if len(w.split()) == 1}
+        # Multi-word phrases, indexed by their longest (most selective) word
+        self.phrases: Dict[str, List[Tuple[str, FrozenSet[str]]]] = {}
+        for phrase in words:
+            parts = phrase.split()
+            if len(parts) > 1:
+                key = max(parts, key=len)
+                self.phrases.setdefault(key, []).append((phrase, frozenset(parts)))
+                singles.update(parts)
+        self.token_vocab = tuple(sorted(singles))
+        self.keywords = frozenset(words)
+        self.phrase_keys = frozenset(self.phrases)
+        self.max_memo = max_memo
+        self._memo: Dict[str, FrozenSet[str]] = {}
+
+    def _token_hits(self, token: str) -> FrozenSet[str]:
+        hits = frozenset(compress(self.token_vocab, map(token.__contains__, self.token_vocab)))
+        if len(self._memo) >= self.max_memo:
+            self._memo.clear()
+        self._memo[token] = hits
+        return hits
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        if not text:
+            return frozenset()
+        tokens = set(text.split())
+        per_token = list(map(self._memo.get, tokens))
+        if None in per_token:
+            per_token = [h if h is not None else self._token_hits(t) for t, h in zip(tokens, per_token)]
+        found = frozenset().union(*per_token)
+        hits = found & self.keywords
+        for key in found & self.phrase_keys:
+            for phrase, parts in self.phrases[key]:
+                if parts <= found and phrase in text:
+                    hits |= {phrase}
+        return hits
+
+
+class GateEngine:
+    """
+    Precompiled keyword gates.
+
+    groups maps a gate name to (fields, keywords). A keyword in a group matches
+    if it occurs in any of the group's fields. Keywords are lowercased once at
+    compile time; evaluate() expects already-lowercased field text.
+    """
+
+    def __init__(self, groups: Dict[str, Tuple[Sequence[str], Sequence[str]]]):
+        self.groups: Dict[str, Tuple[str, ...]] = {}
+        # field -> keyword -> gates fed by that keyword
+        routes: Dict[str, Dict[str, List[str]]] = {}
+        for name, (fields, keywords) in groups.items():
+            ordered = tuple(dict.fromkeys(k.lower() for k in keywords if k))
+            self.groups[name] = ordered
+            for field in fields:
+                for keyword in ordered:
+                    routes.setdefault(field, {}).setdefault(keyword, []).append(name)
+        self.routes = {field: {k: tuple(names) for k, names in r.items()} for field, r in routes.items()}
+        self.scanners = {field: _FieldScanner(r) for field, r in self.routes.items()}
+        self._empty: TweetFeatures = {name: frozenset() for name in self.groups}
+
+    @classmethod
+    def from_config(cls, config: dict) -> "GateEngine":
+        gates = config.get("context_gates", {})
+        filters = config.get("filters", {})
+        groups = {
+            "sports": (("text",), gates.get("sports_keywords", [])),
+            "meme": (("text",), gates.get("meme_keywords", [])),
+            "business_marker": (("text",), gates.get("business_markers", [])),
+            "vendor_pitch": (("text",), gates.get("vendor_pitch_markers", [])),
+            "missed_call": (("text",), ["missed calls", "missed call"]),
+            "pain": (("text",), PAIN_PHRASES),
+            "hard_negative": (("bio", "name"), filters.get("hard_negatives", [])),
+            "vendor_pattern": (("bio",), filters.get("vendor_patterns", [])),
+            "operator_keyword": (("bio",), filters.get("operator_keywords", [])),
+            "operator_role": (("bio",), OPERATOR_ROLES),
+            "org_marker": (("bio", "name"), ORG_MARKERS),
+            "business_keyword": (("bio", "text"), filters.get("business_keywords", [])),
+        }
+        for tag, phrases in TAG_PHRASES.items():
+            groups[f"tag:{tag}"] = (("text",), phrases)
+        return cls(groups)
+
+    def evaluate(self, fields: Dict[str, str]) -> TweetFeatures:
+        """Scan each field once and return matched keywords per gate."""
+        matched: Dict[str, List[str]] = {}
+        for field, scanner in self.scanners.items():
+            hits = scanner.scan(fields.get(field, ""))
+            if not hits:
+                continue
+            routes = self.routes[field]
+            for keyword in hits:
+                for name in routes[keyword]:
+                    if name in matched:
+                        matched[name].append(keyword)
+                    else:
+                        matched[name] = [keyword]
+        features = self._empty.copy()
+        for name, keywords in matched.items():
+            features[name] = frozenset(keywords)
+        return features
+
+    def evaluate_tweet(self, tweet: Dict) -> TweetFeatures:
+        author = tweet.get("author", {})
+        return self.evaluate({
+            "text": (tweet.get("text") or "").lower(),
+            "bio": (author.get("description") or "").lower(),
+            "name": (author.get("name") or "").lower(),
+        })
+
+    def first(self, name: str, features: TweetFeatures) -> Optional[str]:
+        """First matching keyword of a gate, in config order."""
+        matched = features.get(name)
+        if not matched:
+            return None
+        for keyword in self.groups[name]:
+            if keyword in matched:
+                return keyword
+        return None
+
+    def ordered(self, name: str, features: TweetFeatures) -> List[str]:
+        """All matching keywords of a gate, in config order."""
+        matched = features.get(name) or frozenset()
+        return [k for k in self.groups[name] if k in matched]
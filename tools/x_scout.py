@@ -10,43 +10,32 @@ NOVA SPEC G1.4 COMPLIANCE:
 """
 import os
 import re
-import json
 import hashlib
 import logging
 import random
 import urllib.parse
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
-import requests
-import yaml
+from file_cache import FileCache
+from growth_config import get_config
+from growth_db import GrowthDB
+from x_gates import GateEngine, TweetFeatures
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-CONFIG_PATH = Path(__file__).parent.parent / "growth" / "config.yaml"
 CACHE_DIR = Path(__file__).parent.parent / "growth" / "cache"
 CACHE_TTL_HOURS = 24
 
 # Default ignored domains (extended in config)
 IGNORED_DOMAINS = {"t.co", "twitter.com", "x.com", "bit.ly", "ow.ly", "tinyurl.com"}
 
-# Org markers for B2B detection
-ORG_MARKERS = ["inc", "llc", "corp", "company", "solutions", "services", "official", "group"]
-
-# Operator roles
-OPERATOR_ROLES = ["owner", "co-owner", "operator", "manager", "office", "dispatcher", "practice manager", "director"]
-
-
-def load_config() -> dict:
-    if CONFIG_PATH.exists():
-        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    return {}
-
 
+@lru_cache(maxsize=None)
 def load_env_growth():
     env_path = Path(__file__).parent.parent / "growth" / ".env.growth"
     if env_path.exists():
@@ -62,24 +51,26 @@ def load_env_growth():
                     logger.info(f"Loaded {key.strip()} from .env.growth")
 
 
-load_env_growth()
-CONFIG = load_config()
-
 
 class XScout:
     """Phase G1.4: Business-context X Scout with context gates."""
     
-    def __init__(self):
+    def __init__(self, db: Optional[GrowthDB] = None):
+        load_env_growth()
+        config = get_config()
         self.bearer_token = os.environ.get("X_GROWTH_RADAR_BEARER_TOKEN")
         self.api_mode = bool(self.bearer_token)
-        self.config = CONFIG.get("x_scout", {})
-        self.filters = CONFIG.get("filters", {})
-        self.scoring = CONFIG.get("moment_scoring", {})
-        self.context_gates = CONFIG.get("context_gates", {})
-        self.domain_denylist = set(CONFIG.get("domain_denylist", []))
+        self.config = config.get("x_scout", {})
+        self.filters = config.filters
+        self.scoring = config.get("moment_scoring", {})
+        self.context_gates = config.context_gates
+        self.denylist = config.denylist
+        self.gates = config.derive("x_gates", GateEngine.from_config)
         
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self.cache = FileCache(CACHE_DIR, "x_search", self.config.get("cache_ttl_hours", CACHE_TTL_HOURS))
         
+        import requests
         self.session = requests.Session()
         if self.bearer_token:
             self.session.headers.update({
@@ -87,7 +78,11 @@ class XScout:
                 "User-Agent": "X-Agent-Factory-Growth/1.4"
             })
         
+        # Cross-run dedupe: keys persist in GrowthDB (shared with Places Scout)
+        self._db = db
+        self.seen_ttl_days = self.config.get("seen_ttl_days", 30)
         self.seen_prospect_keys: Set[str] = set()
+        self._new_prospect_keys: List[str] = []
         
         if not self.api_mode:
             logger.info("X_GROWTH_RADAR_BEARER_TOKEN not set - Inbox Mode")
@@ -96,57 +91,54 @@ class XScout:
     # PHASE G1.4: CONTEXT GATE
     # ========================================
     
-    def context_gate(self, tweet_text: str) -> Tuple[str, str]:
+    def features(self, tweet: Dict) -> TweetFeatures:
+        """Evaluate every keyword gate for a tweet in one pass (text, bio, name)."""
+        return self.gates.evaluate_tweet(tweet)
+    
+    def _text_features(self, tweet_text: str) -> TweetFeatures:
+        return self.gates.evaluate({"text": (tweet_text or "").lower()})
+    
+    def context_gate(self, tweet_text: str, features: Optional[TweetFeatures] = None) -> Tuple[str, str]:
         """
         Phase G1.4: Check if tweet is in business context.
         Returns (PASS|FAIL, reason).
         """
-        text = tweet_text.lower()
+        if features is None:
+            features = self._text_features(tweet_text)
         
         # Sports context - HARD DROP
-        sports_kw = self.context_gates.get("sports_keywords", [])
-        for kw in sports_kw:
-            if kw.lower() in text:
-                return "FAIL", f"sports_context:{kw}"
+        kw = self.gates.first("sports", features)
+        if kw:
+            return "FAIL", f"sports_context:{kw}"
         
         # Meme context - HARD DROP
-        meme_kw = self.context_gates.get("meme_keywords", [])
-        for kw in meme_kw:
-            if kw.lower() in text:
-                return "FAIL", f"meme_context:{kw}"
+        kw = self.gates.first("meme", features)
+        if kw:
+            return "FAIL", f"meme_context:{kw}"
         
         # Business marker check - SOFT DROP if "missed calls" present but no marker
-        business_markers = self.context_gates.get("business_markers", [])
-        if "missed calls" in text or "missed call" in text:
-            has_business_marker = any(bm.lower() in text for bm in business_markers)
-            if not has_business_marker:
-                return "FAIL", "no_business_marker"
+        if features["missed_call"] and not features["business_marker"]:
+            return "FAIL", "no_business_marker"
         
         return "PASS", ""
     
-    def vendor_pitch_gate(self, tweet_text: str) -> Tuple[str, str]:
+    def vendor_pitch_gate(self, tweet_text: str, features: Optional[TweetFeatures] = None) -> Tuple[str, str]:
         """
         Phase G1.4: Check if tweet is vendor marketing pitch.
         Returns (PASS|FAIL, reason).
         """
-        text = tweet_text.lower()
-        vendor_markers = self.context_gates.get("vendor_pitch_markers", [])
-        
-        matches = []
-        for marker in vendor_markers:
-            if marker.lower() in text:
-                matches.append(marker)
+        if features is None:
+            features = self._text_features(tweet_text)
         
-        if len(matches) >= 2:
-            return "FAIL", f"vendor_pitch:{len(matches)}_matches"
+        matches = len(features["vendor_pitch"])
+        if matches >= 2:
+            return "FAIL", f"vendor_pitch:{matches}_matches"
         
         return "PASS", ""
     
     def is_denylist_domain(self, domain: Optional[str]) -> bool:
-        """Check if domain is in denylist."""
-        if not domain:
-            return False
-        return domain.lower() in self.domain_denylist
+        """Check if domain, or a parent domain of it, is in the denylist (same trie as ProspectEnricher)."""
+        return self.denylist.match(domain) is not None
     
     # ========================================
     # URL EXPANSION (G1.3)
@@ -155,6 +147,7 @@ class XScout:
     def expand_url(self, url: str, timeout: int = 5) -> str:
         if not url:
             return url
+        import requests  # not self.session: it carries the X bearer token
         try:
             resp = requests.head(url, allow_redirects=True, timeout=timeout,
                                 headers={"User-Agent": "Mozilla/5.0"})
@@ -193,10 +186,12 @@ class XScout:
     # B2B CONFIDENCE (G1.3 + G1.4)
     # ========================================
     
-    def calculate_b2b_confidence(self, author: Dict, resolved_domain: Optional[str]) -> int:
+    def calculate_b2b_confidence(self, author: Dict, resolved_domain: Optional[str],
+                                 features: Optional[TweetFeatures] = None) -> int:
         score = 0
-        bio = (author.get("description") or "").lower()
         name = (author.get("name") or "").lower()
+        if features is None:
+            features = self.features({"author": author})
         followers = author.get("public_metrics", {}).get("followers_count", 0)
         
         # +4 if resolved_domain exists (non-denylist)
@@ -207,11 +202,11 @@ class XScout:
             score += self.scoring.get("denylist_domain_penalty", -2)
         
         # +2 if org markers in name/bio
-        if any(m in bio or m in name for m in ORG_MARKERS):
+        if features["org_marker"]:
             score += 2
         
         # +2 if operator roles in bio
-        if any(r in bio for r in OPERATOR_ROLES):
+        if features["operator_role"]:
             score += 2
         
         # +1 if followers >= 500
@@ -219,7 +214,7 @@ class XScout:
             score += 1
         
         # -4 if personal-only
-        if not resolved_domain and not any(m in bio or m in name for m in ORG_MARKERS):
+        if not resolved_domain and not features["org_marker"]:
             words = name.split()
             if len(words) <= 2 and len(words) > 0 and words[0].isalpha():
                 score -= 4
@@ -239,43 +234,64 @@ class XScout:
     # ========================================
     
     def _get_cache_path(self, query: str) -> Path:
-        query_hash = hashlib.md5(query.encode()).hexdigest()
-        return CACHE_DIR / f"x_search_{query_hash}.json"
-    
-    def _is_cache_valid(self, cache_path: Path) -> bool:
-        if not cache_path.exists():
-            return False
-        mtime = datetime.fromtimestamp(cache_path.stat().st_mtime)
-        return datetime.now() - mtime < timedelta(hours=CACHE_TTL_HOURS)
+        return self.cache.path_for(query)
     
     def _load_cache(self, cache_path: Path) -> Optional[List[Dict]]:
-        if self._is_cache_valid(cache_path):
-            try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    logger.info(f"Cache hit: {cache_path.name}")
-                    return json.load(f)
-            except:
-                pass
-        return None
+        cached = self.cache.load(cache_path)
+        if cached is not None:
+            logger.info(f"Cache hit: {cache_path.name}")
+        return cached
     
     def _save_cache(self, cache_path: Path, results: List[Dict]):
         try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2)
+            self.cache.save(cache_path, results)
         except Exception as e:
             logger.warning(f"Cache write failed: {e}")
     
     def _log_query(self, query: str, result_count: int, status: str, query_type: str = "unknown"):
-        log_path = CACHE_DIR / "query_log.jsonl"
-        entry = {
-            "timestamp": datetime.now().isoformat(),
-            "query": query[:100],
-            "query_type": query_type,
-            "result_count": result_count,
-            "status": status
-        }
-        with open(log_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(entry) + "\n")
+        try:
+            self.db.log_scout_query("X", query, status, result_count, query_type)
+        except Exception as e:
+            logger.warning(f"Query log write failed: {e}")
+    
+    def _log_cache_stats(self):
+        try:
+            self.db.log_cache_stats(self.cache.prefix, self.cache.stats)
+        except Exception as e:
+            logger.warning(f"Cache stats write failed: {e}")
+    
+    # ========================================
+    # CROSS-RUN DEDUPE
+    # ========================================
+    
+    @property
+    def db(self) -> GrowthDB:
+        if self._db is None:
+            self._db = GrowthDB()
+        return self._db
+    
+    def _load_seen_keys(self):
+        """Seed the seen-set with keys from previous runs and the Places pipeline."""
+        try:
+            self.seen_prospect_keys |= self.db.get_seen_prospect_keys()
+            logger.info(f"Loaded {len(self.seen_prospect_keys)} seen prospect keys")
+        except Exception as e:
+            logger.warning(f"Seen-key load failed, deduping in-memory only: {e}")
+    
+    def _mark_seen(self, *keys: str):
+        for key in keys:
+            if key and key not in self.seen_prospect_keys:
+                self.seen_prospect_keys.add(key)
+                self._new_prospect_keys.append(key)
+    
+    def _flush_seen_keys(self):
+        if not self._new_prospect_keys:
+            return
+        try:
+            self.db.mark_prospects_seen(self._new_prospect_keys, source="X", ttl_days=self.seen_ttl_days)
+            self._new_prospect_keys = []
+        except Exception as e:
+            logger.warning(f"Seen-key flush failed: {e}")
     
     # ========================================
     # QUERY SELECTION
@@ -284,7 +300,7 @@ class XScout:
     def _select_queries(self) -> List[Tuple[str, str]]:
         queries = self.config.get("queries", {})
         selection = self.config.get("query_selection", {"business_pain": 4})
-        max_queries = CONFIG.get("max_queries_per_run", 4)
+        max_queries = get_config().get("max_queries_per_run", 4)
         
         selected = []
         
@@ -368,49 +384,36 @@ class XScout:
     # FILTERING (G1.2)
     # ========================================
     
-    def candidate_filter(self, tweet: Dict) -> Tuple[bool, str]:
-        author = tweet.get("author", {})
-        bio = (author.get("description") or "").lower()
-        name = (author.get("name") or "").lower()
-        url = author.get("url", "")
-        followers = author.get("public_metrics", {}).get("followers_count", 0)
-        tweet_text = (tweet.get("text") or "").lower()
+    def candidate_filter(self, tweet: Dict, features: Optional[TweetFeatures] = None) -> Tuple[bool, str]:
+        if features is None:
+            features = self.features(tweet)
         
-        hard_negatives = self.filters.get("hard_negatives", [])
-        for neg in hard_negatives:
-            if neg.lower() in bio or neg.lower() in name:
-                return False, f"hard_negative:{neg}"
+        neg = self.gates.first("hard_negative", features)
+        if neg:
+            return False, f"hard_negative:{neg}"
         
-        vendor_patterns = self.filters.get("vendor_patterns", [])
-        has_pain = self._has_pain_language(tweet_text)
-        for vp in vendor_patterns:
-            if vp.lower() in bio and not has_pain:
-                return False, f"vendor_no_pain:{vp}"
+        vp = self.gates.first("vendor_pattern", features)
+        if vp and not features["pain"]:
+            return False, f"vendor_no_pain:{vp}"
         
         return True, "passed"
     
     def _has_pain_language(self, text: str) -> bool:
-        pain_phrases = [
-            "missed calls", "calls going to voicemail", "no one answered",
-            "lost a lead", "lost a customer", "front desk overwhelmed",
-            "can't keep up with calls", "need someone to answer",
-            "after hours calls", "customer", "client", "appointment"
-        ]
-        text_lower = text.lower()
-        return any(phrase in text_lower for phrase in pain_phrases)
+        return bool(self._text_features(text)["pain"])
     
     # ========================================
     # SCORING
     # ========================================
     
-    def calculate_moment_score(self, tweet: Dict) -> int:
+    def calculate_moment_score(self, tweet: Dict, features: Optional[TweetFeatures] = None) -> int:
         score = 0
         author = tweet.get("author", {})
-        bio = (author.get("description") or "").lower()
         tweet_text = tweet.get("text", "")
         url = author.get("url", "")
+        if features is None:
+            features = self.features(tweet)
         
-        if self._has_pain_language(tweet_text):
+        if features["pain"]:
             score += self.scoring.get("pain_phrase_weight", 4)
         
         created_at = tweet.get("created_at", "")
@@ -428,12 +431,10 @@ class XScout:
         if url:
             score += self.scoring.get("website_present_weight", 2)
         
-        operator_kw = self.filters.get("operator_keywords", [])
-        if any(kw.lower() in bio for kw in operator_kw):
+        if features["operator_keyword"]:
             score += self.scoring.get("operator_keyword_weight", 1)
         
-        vendor_patterns = self.filters.get("vendor_patterns", [])
-        if any(vp.lower() in bio for vp in vendor_patterns):
+        if features["vendor_pattern"]:
             score += self.scoring.get("vendor_penalty", -4)
         
         hashtag_count = tweet_text.count("#")
@@ -448,14 +449,14 @@ class XScout:
     
     def generate_why_this_lead(self, tweet: Dict, moment_score: int, b2b_confidence: int,
                                resolved_domain: Optional[str], bucket: str,
-                               context_gate_status: str, vendor_gate_status: str) -> str:
-        author = tweet.get("author", {})
-        bio = (author.get("description") or "").lower()
-        tweet_text = (tweet.get("text") or "").lower()
+                               context_gate_status: str, vendor_gate_status: str,
+                               features: Optional[TweetFeatures] = None) -> str:
+        if features is None:
+            features = self.features(tweet)
         
         reasons = []
         
-        if self._has_pain_language(tweet_text):
+        if features["pain"]:
             reasons.append("Business pain signal detected")
         
         created_at = tweet.get("created_at", "")
@@ -471,33 +472,24 @@ class XScout:
         if resolved_domain and not self.is_denylist_domain(resolved_domain):
             reasons.append(f"Website: {resolved_domain}")
         
-        if any(r in bio for r in OPERATOR_ROLES):
+        if features["operator_role"]:
             reasons.append("Business operator")
         
         reasons.append(f"B2B: {b2b_confidence}/10, Moment: {moment_score}/10")
         
         return ". ".join(reasons) + "."
     
-    def generate_tags(self, tweet: Dict, resolved_domain: Optional[str]) -> List[str]:
-        tags = []
-        tweet_text = (tweet.get("text") or "").lower()
-        author = tweet.get("author", {})
-        bio = (author.get("description") or "").lower()
-        
-        if "missed call" in tweet_text:
-            tags.append("missed_calls")
-        if "after hours" in tweet_text:
-            tags.append("after_hours")
-        if "customer" in tweet_text or "client" in tweet_text:
-            tags.append("customer_focused")
-        if "appointment" in tweet_text or "booking" in tweet_text:
-            tags.append("scheduling")
-        
-        business_kw = self.filters.get("business_keywords", [])
-        for kw in business_kw:
-            if kw.lower() in bio or kw.lower() in tweet_text:
-                tags.append(kw.lower().replace(" ", "_"))
-                break
+    def generate_tags(self, tweet: Dict, resolved_domain: Optional[str],
+                      features: Optional[TweetFeatures] = None) -> List[str]:
+        if features is None:
+            features = self.features(tweet)
+        
+        tags = [tag for tag in ("missed_calls", "after_hours", "customer_focused", "scheduling")
+                if features[f"tag:{tag}"]]
+        
+        kw = self.gates.first("business_keyword", features)
+        if kw:
+            tags.append(kw.replace(" ", "_"))
         
         if resolved_domain and not self.is_denylist_domain(resolved_domain):
             tags.append("has_website")
@@ -514,6 +506,9 @@ class XScout:
             logger.info("X Scout running in Inbox Mode")
             return []
         
+        self._load_seen_keys()
+        self.cache.sweep_if_due()
+        
         selected_queries = self._select_queries()
         logger.info(f"Selected {len(selected_queries)} queries")
         
@@ -525,11 +520,13 @@ class XScout:
         logger.info(f"Collected {len(all_tweets)} raw tweets")
         
         # Stage 1: Candidate filter (hard negatives)
+        # Keyword gates are evaluated once per tweet and reused by every stage
         filtered_tweets = []
         for tweet in all_tweets:
-            should_keep, reason = self.candidate_filter(tweet)
+            features = self.features(tweet)
+            should_keep, reason = self.candidate_filter(tweet, features)
             if should_keep:
-                filtered_tweets.append(tweet)
+                filtered_tweets.append((tweet, features))
             else:
                 logger.debug(f"Candidate filter dropped: {reason}")
         
@@ -537,21 +534,21 @@ class XScout:
         
         # Stage 2: Context gates (G1.4)
         context_passed = []
-        for tweet in filtered_tweets:
+        for tweet, features in filtered_tweets:
             tweet_text = tweet.get("text", "")
             
             # Context gate
-            ctx_status, ctx_reason = self.context_gate(tweet_text)
+            ctx_status, ctx_reason = self.context_gate(tweet_text, features)
             tweet["context_gate"] = ctx_status
             tweet["context_reason"] = ctx_reason
             
             # Vendor pitch gate
-            vendor_status, vendor_reason = self.vendor_pitch_gate(tweet_text)
+            vendor_status, vendor_reason = self.vendor_pitch_gate(tweet_text, features)
             tweet["vendor_pitch_gate"] = vendor_status
             tweet["vendor_reason"] = vendor_reason
             
             if ctx_status == "PASS" and vendor_status == "PASS":
-                context_passed.append(tweet)
+                context_passed.append((tweet, features))
             else:
                 logger.debug(f"Gate dropped: ctx={ctx_reason}, vendor={vendor_reason}")
         
@@ -559,10 +556,18 @@ class XScout:
         
         # Stage 3: Score and normalize
         prospects = {}
-        for tweet in context_passed:
+        skipped_seen = 0
+        for tweet, features in context_passed:
             author = tweet.get("author", {})
             tweet_text = tweet.get("text", "")
             
+            # Seen account: skip before the network-bound URL expansion
+            # (authors without a username have no handle key; the prospect key alone dedupes them)
+            handle_key = f"x:{author['username']}" if author.get("username") else None
+            if handle_key and handle_key in self.seen_prospect_keys:
+                skipped_seen += 1
+                continue
+            
             urls_to_expand = self.extract_urls_from_text(tweet_text)
             if author.get("url"):
                 urls_to_expand.append(author["url"])
@@ -573,16 +578,21 @@ class XScout:
             domain_quality = "good" if (resolved_domain and not self.is_denylist_domain(resolved_domain)) else "low"
             
             if resolved_domain and not self.is_denylist_domain(resolved_domain):
-                prospect_key = resolved_domain
+                seen_key = resolved_domain
             else:
-                prospect_key = f"x:{author.get('username', 'unknown')}"
+                seen_key = handle_key or (f"x:id:{author['id']}" if author.get("id") else None)
             
-            if prospect_key in self.seen_prospect_keys:
+            if seen_key in self.seen_prospect_keys:
+                skipped_seen += 1
+                if handle_key:
+                    self._mark_seen(handle_key)
                 continue
-            self.seen_prospect_keys.add(prospect_key)
+            self._mark_seen(handle_key, seen_key)
+            # No domain, handle or account id: nothing stable to remember, so key on the tweet
+            prospect_key = seen_key or f"x:tweet:{tweet.get('tweet_id')}"
             
-            moment_score = self.calculate_moment_score(tweet)
-            b2b_confidence = self.calculate_b2b_confidence(author, resolved_domain)
+            moment_score = self.calculate_moment_score(tweet, features)
+            b2b_confidence = self.calculate_b2b_confidence(author, resolved_domain, features)
             total_score = max(0, min(10, moment_score + (b2b_confidence // 2)))
             
             bucket = self.determine_bucket(moment_score, b2b_confidence)
@@ -613,15 +623,20 @@ class XScout:
                 }],
                 "why_this_lead": self.generate_why_this_lead(
                     tweet, moment_score, b2b_confidence, resolved_domain, bucket,
-                    tweet.get("context_gate", ""), tweet.get("vendor_pitch_gate", "")
+                    tweet.get("context_gate", ""), tweet.get("vendor_pitch_gate", ""),
+                    features
                 ),
                 "recommended_action": bucket,
-                "tags": self.generate_tags(tweet, resolved_domain),
+                "tags": self.generate_tags(tweet, resolved_domain, features),
                 "discovered_at": datetime.now().isoformat()
             }
             
             prospects[prospect_key] = prospect
         
+        self._flush_seen_keys()
+        logger.info(f"Skipped {skipped_seen} previously seen prospects")
+        self._log_cache_stats()
+        
         sorted_prospects = sorted(
             prospects.values(),
             key=lambda p: (